@@ -1,12 +1,15 @@
 from .research_agent import ResearchAgent, MultiStepResearchAgent
-from .tools import WebSearchTool, ArxivSearchTool, CalculatorTool
+from .tools import WebSearchTool, ArxivSearchTool, CorpusSearchTool, CalculatorTool
 from .fallback_agent import FallbackResearchAgent
+from .plan_execute_agent import PlanExecuteAgent
 
 __all__ = [
     "ResearchAgent", 
     "MultiStepResearchAgent",
     "WebSearchTool", 
     "ArxivSearchTool", 
+    "CorpusSearchTool",
     "CalculatorTool",
-    "FallbackResearchAgent"
+    "FallbackResearchAgent",
+    "PlanExecuteAgent"
 ]
\ No newline at end of file
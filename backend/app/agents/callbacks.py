@@ -0,0 +1,39 @@
+from typing import Any, Callable, Dict
+
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.schema import AgentAction, AgentFinish
+
+# emit(event_type, payload)
+EventSink = Callable[[str, Dict[str, Any]], None]
+
+
+class ResearchEventHandler(BaseCallbackHandler):
+    """Forward agent thoughts, tool calls and observations to an event sink.
+
+    The sink is called from whichever thread runs the agent, so it must be
+    thread-safe (e.g. ``loop.call_soon_threadsafe(queue.put_nowait, ...)``).
+    """
+
+    def __init__(self, emit: EventSink, stream_tokens: bool = True):
+        self.emit = emit
+        self.stream_tokens = stream_tokens
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if self.stream_tokens and token:
+            self.emit("token", {"text": token})
+
+    def on_agent_action(self, action: AgentAction, **kwargs: Any) -> None:
+        # The log holds the model's reasoning followed by the action blob
+        thought = action.log.split("Action:")[0].strip()
+        if thought:
+            self.emit("thought", {"text": thought})
+        self.emit("tool_call", {"tool": action.tool, "input": action.tool_input})
+
+    def on_tool_end(self, output: str, **kwargs: Any) -> None:
+        self.emit("observation", {"tool": kwargs.get("name"), "output": output})
+
+    def on_tool_error(self, error: BaseException, **kwargs: Any) -> None:
+        self.emit("observation", {"tool": kwargs.get("name"), "error": str(error)})
+
+    def on_agent_finish(self, finish: AgentFinish, **kwargs: Any) -> None:
+        self.emit("agent_finish", {"output": finish.return_values.get("output", "")})
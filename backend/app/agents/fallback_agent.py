@@ -1,30 +1,49 @@
 import os
-from typing import Dict, Any, List
-from langchain.chat_models import ChatOpenAI
+from typing import Dict, Any, List, Optional
+from langchain.callbacks.base import BaseCallbackHandler
+
+from app.cache.llm_cache import llm_cache_caller
+from app.llm import create_chat_model
+from app.prompts import StablePrompt
+
+FALLBACK_PROMPT = StablePrompt(
+    "fallback",
+    prefix="""Conduct comprehensive research on the topic below and answer its research questions.
+Provide detailed information with key findings, trends, and insights.
+Include specific examples and mention important developments in this field.
+
+""",
+    suffix="""Topic: {topic}
+
+Research questions:
+{questions}
+"""
+)
 
 class FallbackResearchAgent:
     def __init__(self):
         api_key = os.getenv('OPENAI_API_KEY')
-        self.llm = ChatOpenAI(
+        self.llm = create_chat_model(
             model="gpt-3.5-turbo",
             temperature=0.7,
             openai_api_key=api_key
         )
     
-    def research_topic(self, topic: str, research_questions: List[str]) -> Dict[str, Any]:
+    def research_topic(
+        self,
+        topic: str,
+        research_questions: List[str],
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> Dict[str, Any]:
         """Fallback research using direct LLM when tools fail."""
         try:
-            prompt = f"""
-            Conduct comprehensive research on: {topic}
-            
-            Answer these research questions:
-            {chr(10).join(f'- {q}' for q in research_questions)}
-            
-            Provide detailed information with key findings, trends, and insights.
-            Include specific examples and mention important developments in this field.
-            """
+            prompt = FALLBACK_PROMPT.render(
+                topic=topic,
+                questions="\n".join(f"- {q}" for q in research_questions)
+            )
             
-            result = self.llm.predict(prompt)
+            with llm_cache_caller("fallback"):
+                result = self.llm.predict(prompt, callbacks=callbacks)
             
             return {
                 "success": True,
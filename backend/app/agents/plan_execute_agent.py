@@ -0,0 +1,184 @@
+import json
+import operator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Any, Dict, List, Optional, Sequence, TypedDict
+
+from langchain.callbacks.base import BaseCallbackHandler
+from langchain.callbacks.manager import CallbackManager
+from langchain.chat_models.base import BaseChatModel
+from langchain.schema import AgentAction
+from langchain.schema.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain.tools import BaseTool
+from langchain.tools.render import format_tool_to_openai_tool
+
+from app import context_budget
+from app.context_budget import fit_observations, model_of, truncate_tokens
+
+PLANNER_INSTRUCTIONS = """You are a research agent that plans tool calls in batches.
+
+Each turn, request EVERY tool call you need for the next step at once, as parallel
+tool calls: several web_search and arxiv_search queries covering different questions
+and angles. They run concurrently and you receive all results together.
+Only ask for another batch if the results leave a question unanswered.
+When you have enough information, reply with the final answer instead of calling tools."""
+
+FINAL_INSTRUCTIONS = "Tool budget exhausted. Write the final answer now from the results above."
+
+
+class PlanExecuteState(TypedDict):
+    messages: Annotated[List[BaseMessage], operator.add]
+    rounds: int
+    tool_calls: int
+
+
+def _tool_input(arguments: str) -> Any:
+    """Tool input from an OpenAI ``arguments`` string.
+
+    The parsed object is passed on as is: tools validate dicts against
+    their own schema, so ``{"queries": [...]}`` reaches ``queries`` rather
+    than being unwrapped into the first positional argument.
+    """
+    return json.loads(arguments or "{}")
+
+
+def _action_input(call: Dict[str, Any]) -> Any:
+    """A call's arguments for event handlers, raw when they are not valid JSON."""
+    arguments = call["function"].get("arguments")
+    try:
+        return _tool_input(arguments)
+    except ValueError:
+        return arguments
+
+
+class PlanExecuteAgent:
+    """Plan-and-execute research loop on LangGraph.
+
+    The ``plan`` node asks the model for a batch of tool calls (OpenAI
+    parallel tool calling); the ``execute`` node runs the whole batch
+    concurrently and feeds every observation back in one step. Compared
+    with a ReAct loop, which pays one LLM round trip per tool call, a run
+    needs one planning call per batch, and at most ``max_rounds`` batches
+    before the model must answer.
+
+    Each observation is cut to ``observation_tokens`` and, before every
+    planning call, older ones are shrunk so all of them fit
+    ``scratchpad_tokens`` (both default to the CONTEXT_* settings).
+
+    Callback handlers see every planned call as an agent action, but no
+    answer tokens: the planner must return whole tool calls, so it does
+    not stream.
+    """
+
+    def __init__(
+        self,
+        llm: BaseChatModel,
+        tools: Sequence[BaseTool],
+        max_rounds: int = 2,
+        max_parallel: int = 8,
+        observation_tokens: Optional[int] = None,
+        scratchpad_tokens: Optional[int] = None
+    ):
+        from langgraph.graph import END, StateGraph
+
+        self.llm = llm
+        self.tools = {tool.name: tool for tool in tools}
+        self.planner = llm.bind(tools=[format_tool_to_openai_tool(tool) for tool in tools])
+        self.max_rounds = max_rounds
+        self.max_parallel = max_parallel
+        self.model = model_of(llm)
+        self.observation_tokens = observation_tokens or context_budget.observation_tokens()
+        self.scratchpad_tokens = scratchpad_tokens or context_budget.scratchpad_tokens()
+
+        graph = StateGraph(PlanExecuteState)
+        graph.add_node("plan", self._plan)
+        graph.add_node("execute", self._execute)
+        graph.set_entry_point("plan")
+        graph.add_conditional_edges(
+            "plan", self._route, {"execute": "execute", "finish": END}
+        )
+        graph.add_edge("execute", "plan")
+        self.graph = graph.compile()
+
+    def _fit(self, messages: List[BaseMessage]) -> List[BaseMessage]:
+        """``messages`` with the tool observations shrunk to the scratchpad budget."""
+        positions = [i for i, message in enumerate(messages) if isinstance(message, ToolMessage)]
+        fitted = fit_observations([messages[i].content for i in positions], self.scratchpad_tokens, self.model)
+        messages = list(messages)
+        for i, content in zip(positions, fitted):
+            if content != messages[i].content:
+                messages[i] = ToolMessage(content=content, tool_call_id=messages[i].tool_call_id)
+        return messages
+
+    def _plan(self, state: PlanExecuteState, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        messages = self._fit(state["messages"])
+        if state["rounds"] >= self.max_rounds:
+            response = self.llm.invoke(messages + [HumanMessage(content=FINAL_INSTRUCTIONS)], config)
+        else:
+            response = self.planner.invoke(messages, config)
+        return {"messages": [response]}
+
+    @staticmethod
+    def _route(state: PlanExecuteState) -> str:
+        last = state["messages"][-1]
+        return "execute" if last.additional_kwargs.get("tool_calls") else "finish"
+
+    def _call_tool(self, call: Dict[str, Any], callbacks: Optional[list]) -> ToolMessage:
+        name = call["function"]["name"]
+        try:
+            tool = self.tools[name]
+            output = tool.run(_tool_input(call["function"].get("arguments")), callbacks=callbacks)
+        except KeyError:
+            output = f"Error: unknown tool {name}"
+        except Exception as e:
+            output = f"Error running {name}: {e}"
+        return ToolMessage(
+            content=truncate_tokens(str(output), self.observation_tokens, self.model),
+            tool_call_id=call["id"]
+        )
+
+    def _execute(self, state: PlanExecuteState, config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        planned = state["messages"][-1]
+        calls = planned.additional_kwargs["tool_calls"]
+        # Report the batch the way AgentExecutor reports its actions, so event
+        # handlers still see the plan's reasoning and every tool call
+        run_manager = CallbackManager.configure((config or {}).get("callbacks")).on_chain_start(
+            {"name": "execute"}, {"tool_calls": len(calls)}
+        )
+        for i, call in enumerate(calls):
+            run_manager.on_agent_action(AgentAction(
+                tool=call["function"]["name"],
+                tool_input=_action_input(call),
+                log=planned.content if i == 0 else ""
+            ))
+        callbacks = run_manager.get_child()
+        with ThreadPoolExecutor(max_workers=min(len(calls), self.max_parallel)) as pool:
+            # map keeps the tool messages in the order the model asked for them
+            observations = list(pool.map(lambda call: self._call_tool(call, callbacks), calls))
+        run_manager.on_chain_end({"tool_calls": len(calls)})
+        return {
+            "messages": observations,
+            "rounds": state["rounds"] + 1,
+            "tool_calls": state["tool_calls"] + len(calls),
+        }
+
+    def run(
+        self,
+        prompt: str,
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> Dict[str, Any]:
+        """Research ``prompt``; returns ``{output, rounds, tool_calls, llm_calls}``."""
+        state = self.graph.invoke(
+            {
+                "messages": [SystemMessage(content=PLANNER_INSTRUCTIONS), HumanMessage(content=prompt)],
+                "rounds": 0,
+                "tool_calls": 0,
+            },
+            config={"callbacks": callbacks} if callbacks else None
+        )
+        answer = state["messages"][-1]
+        return {
+            "output": answer.content,
+            "rounds": state["rounds"],
+            "tool_calls": state["tool_calls"],
+            "llm_calls": sum(isinstance(m, AIMessage) for m in state["messages"]),
+        }
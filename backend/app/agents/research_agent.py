@@ -1,12 +1,136 @@
+import json
 import os
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
 from langchain.agents import initialize_agent, AgentType
-from langchain.chat_models import ChatOpenAI
+from langchain.callbacks.base import BaseCallbackHandler
+
+from app.cache.llm_cache import llm_cache_caller
+from app.context_budget import (
+    model_of, observation_tokens, report_context_tokens, scratchpad_tokens, scratchpad_trimmer, truncate_tokens
+)
+from app.llm import create_chat_model
+from app.prompts import StablePrompt
+from app.agents.tools import (
+    WebSearchTool, ArxivSearchTool, CorpusSearchTool, CalculatorTool, corpus_search_enabled, search_queries
+)
+from app.agents.fallback_agent import FallbackResearchAgent
+
+AGENT_STRATEGIES = ("react", "plan_execute")
+
+STANDARD_TOOLS = {
+    "web_search": "Search the web for current information; pass several queries at once to cover several questions in one call",
+    "arxiv_search": "Search for academic papers",
+    "corpus_search": "Search documents collected in earlier research",
+    "calculator": "Perform calculations if needed",
+}
+
+ADVANCED_TOOLS = {
+    "web_search": "Search for current news, articles, and information",
+    "arxiv_search": "Search for academic papers and scientific research",
+    "corpus_search": "Search full-text documents and papers collected in earlier research",
+    "calculator": "Perform any necessary calculations",
+}
+
+
+def _tool_lines(descriptions: Dict[str, str], corpus: bool) -> str:
+    """Bullet list of the tools an agent has; corpus_search only when it can find anything."""
+    return "\n".join(
+        f"- {name}: {text}" for name, text in descriptions.items()
+        if corpus or name != "corpus_search"
+    )
+
+
+# Static instructions come first and the request last, so every research
+# run shares one stable prompt prefix (``prompt_stats`` shows whether it is
+# long enough for providers to cache). There is one variant with and one
+# without corpus_search, keyed by whether the tool is offered.
+STANDARD_PROMPTS = {
+    corpus: StablePrompt(
+        "research_standard_corpus" if corpus else "research_standard",
+        prefix=f"""You are a research assistant. Research the topic below and answer its specific questions.
+
+Use the available tools to gather information:
+{_tool_lines(STANDARD_TOOLS, corpus)}
+
+Provide a comprehensive answer with sources when possible.
+
+""",
+        suffix="""Topic: {topic}
+
+Research Questions:
+{questions}
+
+Suggested web_search queries: {queries}
+"""
+    )
+    for corpus in (False, True)
+}
+
+ADVANCED_PROMPTS = {
+    corpus: StablePrompt(
+        "research_advanced_corpus" if corpus else "research_advanced",
+        prefix=f"""You are an expert research analyst conducting in-depth research on the topic below.
+
+RESEARCH METHODOLOGY:
+1. First, use web_search to find current information and recent developments, covering every question in one call with several queries
+2. Then, use arxiv_search to find academic research and scientific papers
+3. Analyze the information from both sources
+4. Identify key trends, patterns, and insights
+5. Provide detailed analysis with specific examples and data
+
+REQUIREMENTS:
+- Conduct thorough multi-source research
+- Compare and contrast information from different sources
+- Provide specific examples and evidence
+- Include statistical data if available
+- Identify any controversies or differing viewpoints
+- Suggest areas for further research
+
+TOOLS AVAILABLE:
+{_tool_lines(ADVANCED_TOOLS, corpus)}
+
+Provide a comprehensive, well-structured analysis.
+
+""",
+        suffix="""TOPIC: {topic}
+
+RESEARCH QUESTIONS:
+{questions}
+
+SUGGESTED WEB_SEARCH QUERIES: {queries}
+"""
+    )
+    for corpus in (False, True)
+}
+
+SYNTHESIS_PROMPT = StablePrompt(
+    "synthesis",
+    prefix="""You are an expert research analyst. Separate researchers investigated one question each about the topic below.
+
+Combine their findings into one comprehensive, well-structured analysis of the topic:
+- Answer every question, keeping the specific examples, data and sources they found
+- Connect related findings and point out agreements, contradictions and open questions
+- Do not invent facts that are not in the findings
+
+""",
+    suffix="""TOPIC: {topic}
+
+{findings}
+"""
+)
+
+
+def _request_values(topic: str, research_questions: List[str]) -> Dict[str, str]:
+    return {
+        "topic": topic,
+        "questions": "\n".join(f"- {q}" for q in research_questions),
+        "queries": json.dumps(search_queries(topic, research_questions)),
+    }
 
-from app.agents.tools import WebSearchTool, ArxivSearchTool, CalculatorTool
 
 class ResearchAgent:
-    def __init__(self, advanced_mode=False):
+    def __init__(self, advanced_mode=False, strategy: Optional[str] = None):
         # Get API key from environment
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
@@ -14,36 +138,78 @@ class ResearchAgent:
         
         print(f"🤖 ResearchAgent initialized ({'Advanced' if advanced_mode else 'Standard'} mode)")
         
-        self.llm = ChatOpenAI(
-            model="gpt-3.5-turbo",
-            temperature=0,
-            openai_api_key=api_key,
-            streaming=False
-        )
-        
+        # An empty corpus would only cost the agent iterations
+        self.use_corpus = corpus_search_enabled()
         self.tools = [
             WebSearchTool(),
             ArxivSearchTool(), 
+            *([CorpusSearchTool()] if self.use_corpus else []),
             CalculatorTool(),
         ]
         
-        # Use different agent types for standard vs advanced
-        agent_type = AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION
+        self.fallback_agent = FallbackResearchAgent()
+        self.advanced_mode = advanced_mode
+        self.prompt = (ADVANCED_PROMPTS if advanced_mode else STANDARD_PROMPTS)[self.use_corpus]
         
-        self.agent_executor = initialize_agent(
+        # "react" runs one tool per LLM round trip and streams its tokens;
+        # "plan_execute" batches tool calls and runs them concurrently
+        self.strategy = strategy or os.getenv("AGENT_STRATEGY", "react")
+        if self.strategy not in AGENT_STRATEGIES:
+            raise ValueError(f"Unknown AGENT_STRATEGY {self.strategy!r}; expected one of {AGENT_STRATEGIES}")
+        # Only the agent the strategy selects is built
+        self.agent_executor = None
+        self.plan_execute_agent = None
+        if self.strategy == "plan_execute":
+            try:
+                self.plan_execute_agent = self._build_plan_execute(api_key)
+            except ImportError as e:
+                print(f"⚠️ Plan-and-execute agent unavailable ({e}); using ReAct")
+                self.strategy = "react"
+        if self.strategy == "react":
+            self.agent_executor = self._build_react(api_key)
+    
+    def _build_react(self, api_key: str):
+        llm = create_chat_model(
+            model="gpt-3.5-turbo",
+            temperature=0,
+            openai_api_key=api_key,
+            # Tokens only reach callback handlers that ask for them
+            streaming=True
+        )
+        return initialize_agent(
             tools=self.tools,
-            llm=self.llm,
-            agent=agent_type,
+            llm=llm,
+            agent=AgentType.STRUCTURED_CHAT_ZERO_SHOT_REACT_DESCRIPTION,
             verbose=True,
             handle_parsing_errors=True,
-            max_iterations=5 if advanced_mode else 3,
-            early_stopping_method="generate"
+            max_iterations=5 if self.advanced_mode else 3,
+            early_stopping_method="generate",
+            # Keep the scratchpad of long runs within a token budget
+            trim_intermediate_steps=scratchpad_trimmer(
+                scratchpad_tokens(), model_of(llm), observation_budget=observation_tokens()
+            )
         )
+    
+    def _build_plan_execute(self, api_key: str):
+        from app.agents.plan_execute_agent import PlanExecuteAgent
         
-        self.advanced_mode = advanced_mode
+        return PlanExecuteAgent(
+            # Tool calls come back whole only from a non-streaming model
+            create_chat_model(model="gpt-3.5-turbo", temperature=0, openai_api_key=api_key),
+            self.tools,
+            max_rounds=3 if self.advanced_mode else 2
+        )
     
-    def research_topic(self, topic: str, research_questions: List[str]) -> Dict[str, Any]:
-        """Research a topic with fallback mechanism."""
+    def research_topic(
+        self,
+        topic: str,
+        research_questions: List[str],
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> Dict[str, Any]:
+        """Research a topic with fallback mechanism.
+
+        ``callbacks`` receive the agent's intermediate steps as they happen.
+        """
         
         if self.advanced_mode:
             research_prompt = self._create_advanced_prompt(topic, research_questions)
@@ -52,7 +218,13 @@ class ResearchAgent:
         
         try:
             print(f"🔍 Starting {'advanced' if self.advanced_mode else 'standard'} research: {topic}")
-            result = self.agent_executor.run(research_prompt)
+            with llm_cache_caller("agent"):
+                if self.plan_execute_agent is not None:
+                    run = self.plan_execute_agent.run(research_prompt, callbacks=callbacks)
+                    result = run["output"]
+                    print(f"   {run['tool_calls']} tool calls in {run['rounds']} parallel rounds")
+                else:
+                    result = self.agent_executor.run(research_prompt, callbacks=callbacks)
             print("✅ Research completed successfully")
             
             return {
@@ -68,9 +240,9 @@ class ResearchAgent:
             
             # Try fallback
             try:
-                from .fallback_agent import FallbackResearchAgent
-                fallback_agent = FallbackResearchAgent()
-                fallback_result = fallback_agent.research_topic(topic, research_questions)
+                fallback_result = self.fallback_agent.research_topic(
+                    topic, research_questions, callbacks=callbacks
+                )
                 return fallback_result
             except Exception as fallback_error:
                 error_msg = f"Both agent and fallback research failed: {str(e)}"
@@ -84,52 +256,11 @@ class ResearchAgent:
     
     def _create_standard_prompt(self, topic: str, research_questions: List[str]) -> str:
         """Create prompt for standard research."""
-        return f"""You are a research assistant. Research the following topic and answer the specific questions.
-
-Topic: {topic}
-
-Research Questions:
-{chr(10).join(f"- {q}" for q in research_questions)}
-
-Use the available tools to gather information:
-- web_search: Search the web for current information
-- arxiv_search: Search for academic papers
-- calculator: Perform calculations if needed
-
-Provide a comprehensive answer with sources when possible.
-"""
+        return self.prompt.render(**_request_values(topic, research_questions))
     
     def _create_advanced_prompt(self, topic: str, research_questions: List[str]) -> str:
         """Create prompt for advanced research."""
-        return f"""You are an expert research analyst conducting in-depth research.
-
-TOPIC: {topic}
-
-RESEARCH QUESTIONS:
-{chr(10).join(f'- {q}' for q in research_questions)}
-
-RESEARCH METHODOLOGY:
-1. First, use web_search to find current information and recent developments
-2. Then, use arxiv_search to find academic research and scientific papers
-3. Analyze the information from both sources
-4. Identify key trends, patterns, and insights
-5. Provide detailed analysis with specific examples and data
-
-REQUIREMENTS:
-- Conduct thorough multi-source research
-- Compare and contrast information from different sources
-- Provide specific examples and evidence
-- Include statistical data if available
-- Identify any controversies or differing viewpoints
-- Suggest areas for further research
-
-TOOLS AVAILABLE:
-- web_search: Search for current news, articles, and information
-- arxiv_search: Search for academic papers and scientific research
-- calculator: Perform any necessary calculations
-
-Provide a comprehensive, well-structured analysis.
-"""
+        return self.prompt.render(**_request_values(topic, research_questions))
     
     def _extract_sources(self, output: str) -> List[str]:
         """Extract sources from the agent's output."""
@@ -142,11 +273,88 @@ Provide a comprehensive, well-structured analysis.
         return sources[:5]
 
 class MultiStepResearchAgent:
-    def __init__(self):
+    """Research each question with its own sub-agent, then synthesize.
+
+    Sub-agent runs are independent, so they execute concurrently (at most
+    ``max_concurrency`` at a time) and wall-clock time follows the slowest
+    question rather than the number of questions. A final LLM call merges
+    the per-question findings into one answer.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
         # Use advanced mode for multi-step research
         self.research_agent = ResearchAgent(advanced_mode=True)
+        self.max_concurrency = max_concurrency or int(os.getenv("MULTI_STEP_CONCURRENCY", "4"))
+        self.llm = create_chat_model(model="gpt-3.5-turbo", temperature=0)
     
-    def conduct_research(self, topic: str, research_questions: List[str]) -> Dict[str, Any]:
+    def conduct_research(
+        self,
+        topic: str,
+        research_questions: List[str],
+        callbacks: Optional[List[BaseCallbackHandler]] = None
+    ) -> Dict[str, Any]:
         """Conduct multi-step advanced research."""
-        print("🚀 Starting multi-step advanced research...")
-        return self.research_agent.research_topic(topic, research_questions)
\ No newline at end of file
+        if len(research_questions) < 2:
+            return self.research_agent.research_topic(topic, research_questions, callbacks=callbacks)
+        
+        print(f"🚀 Starting multi-step advanced research: {len(research_questions)} questions")
+        workers = min(self.max_concurrency, len(research_questions))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="multi-step") as pool:
+            sub_results = list(pool.map(
+                lambda question: self.research_agent.research_topic(topic, [question], callbacks=callbacks),
+                research_questions
+            ))
+        
+        answered = [
+            (question, result["research_output"])
+            for question, result in zip(research_questions, sub_results)
+            if result.get("success")
+        ]
+        if not answered:
+            return {
+                "success": False,
+                "error": "Research failed for every question",
+                "research_output": None,
+                "mode": "multi_step"
+            }
+        
+        sources = []
+        for result in sub_results:
+            for source in result.get("sources_used") or []:
+                if source not in sources:
+                    sources.append(source)
+        
+        try:
+            with llm_cache_caller("synthesis"):
+                output = self.llm.predict(self._synthesis_prompt(topic, answered), callbacks=callbacks)
+        except Exception as e:
+            # The per-question answers are still worth returning
+            print(f"⚠️ Synthesis failed, returning per-question findings: {e}")
+            output = "\n\n".join(f"## {question}\n{answer}" for question, answer in answered)
+        
+        fallback_only = all(
+            result.get("mode") == "fallback" for result in sub_results if result.get("success")
+        )
+        return {
+            "success": True,
+            "research_output": output,
+            "sources_used": sources,
+            "mode": "fallback" if fallback_only else "multi_step",
+            "questions": [
+                {
+                    "question": question,
+                    "success": bool(result.get("success")),
+                    "research_output": result.get("research_output"),
+                }
+                for question, result in zip(research_questions, sub_results)
+            ]
+        }
+    
+    def _synthesis_prompt(self, topic: str, answered: List[Tuple[str, str]]) -> str:
+        # Every question gets an equal share of the findings budget
+        share = report_context_tokens() // max(len(answered), 1)
+        findings = "\n\n".join(
+            f"QUESTION: {question}\nFINDINGS:\n{truncate_tokens(answer, share, model_of(self.llm))}"
+            for question, answer in answered
+        )
+        return SYNTHESIS_PROMPT.render(topic=topic, findings=findings)
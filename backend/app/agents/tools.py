@@ -1,79 +1,512 @@
 from langchain.tools import BaseTool
-from langchain.pydantic_v1 import BaseModel, Field
-from duckduckgo_search import DDGS
-import arxiv
-import json
+from langchain.pydantic_v1 import BaseModel, Field, root_validator
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Type
+import ast
+import asyncio
+import feedparser
+import math
+import operator
+import os
+
+from app.cache.arxiv_store import get_arxiv_store
+from app.cache.search_cache import get_search_cache, normalize_query
+from app.context_budget import compact_json
+from app.ingestion.dedup import arxiv_base_id, arxiv_version, canonical_url, collapse_duplicates
+from app.ingestion.service import get_ingestion_service
+from app.retrieval.arxiv_index import get_arxiv_index
+from app.retrieval.hybrid import corpus_available, get_corpus_retriever, reciprocal_rank_fusion
+from app.singleflight import get_async_tool_flights, get_tool_flights
+from app.transport import get_arxiv_limiter, get_transport
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+
+def _capture(texts: list, metadatas: list, ids: list):
+    """Queue tool results for indexing into the research corpus (CORPUS_CAPTURE=true).
+
+    Off by default: indexing embeds every result, which costs embedding calls.
+    """
+    if texts and os.getenv("CORPUS_CAPTURE", "false").lower() == "true":
+        get_corpus_retriever().submit(texts, metadatas, ids)
+
+def corpus_search_enabled() -> bool:
+    """Whether corpus_search can find anything: results are being collected or a corpus exists.
+
+    With CORPUS_CAPTURE and INGEST_TOOL_URLS off and no saved corpus, the
+    corpus stays empty, so agents are built without the tool.
+    """
+    collecting = any(
+        os.getenv(flag, "false").lower() == "true" for flag in ("CORPUS_CAPTURE", "INGEST_TOOL_URLS")
+    )
+    return collecting or corpus_available()
+
+def _result_dedup_threshold() -> float:
+    return float(os.getenv("RESULT_DEDUP_THRESHOLD", "0.7"))
+
+def _collapse_web_results(raw: list) -> list:
+    """Fold syndicated copies (same or near-same snippet) into the first hit."""
+    groups = collapse_duplicates(
+        raw,
+        text=lambda r: f"{r.get('title', '')} {r.get('body', '')}",
+        key=lambda r: r.get('href', ''),
+        threshold=_result_dedup_threshold()
+    )
+    collapsed = []
+    for result, duplicates in groups:
+        if duplicates:
+            result = dict(result, also_at=duplicates)
+        collapsed.append(result)
+    return collapsed
+
+def _collapse_papers(papers: list) -> list:
+    """Keep the newest version of each arXiv paper, then drop near-duplicate abstracts."""
+    latest = {}
+    for paper in papers:
+        base = arxiv_base_id(paper["paper_id"])
+        if base not in latest or arxiv_version(paper["paper_id"]) > arxiv_version(latest[base]["paper_id"]):
+            latest[base] = paper
+    # Keep the original ranking order
+    unique = [paper for paper in papers if latest.get(arxiv_base_id(paper["paper_id"])) is paper]
+    groups = collapse_duplicates(
+        unique,
+        text=lambda p: f"{p['title']} {p['summary']}",
+        key=lambda p: p["paper_id"],
+        threshold=_result_dedup_threshold()
+    )
+    return [paper for paper, _ in groups]
+
+def _ingest(items: list):
+    """Queue result URLs for full-text ingestion into the corpus (INGEST_TOOL_URLS=true).
+
+    Off by default: each URL means a page or PDF download plus embedding calls.
+    """
+    items = [item for item in items if item["url"]]
+    if items and os.getenv("INGEST_TOOL_URLS", "false").lower() == "true":
+        get_ingestion_service().enqueue(items)
 
 class SearchInput(BaseModel):
     query: str = Field(description="Search query to look up")
 
+class WebSearchInput(BaseModel):
+    query: str = Field(default="", description="Search query to look up")
+    queries: Optional[List[str]] = Field(
+        default=None,
+        description="More phrasings or sub-questions searched at the same time; results are merged into one ranked list"
+    )
+
+    @root_validator(skip_on_failure=True)
+    def _some_query(cls, values):
+        if not values.get("query", "").strip() and not any(q.strip() for q in values.get("queries") or []):
+            raise ValueError("give a query or a list of queries")
+        return values
+
+def search_queries(topic: str, research_questions: List[str], limit: int = 4) -> List[str]:
+    """Web search variants for a research request: the topic, then the topic with each question."""
+    variants, seen = [], set()
+    for query in [topic, *(f"{topic} {question}" for question in research_questions)]:
+        key = normalize_query(query)
+        if key and key not in seen:
+            seen.add(key)
+            variants.append(query.strip())
+    return variants[:limit]
+
+def _merge_web_results(result_lists: List[list], limit: int) -> list:
+    """Fuse per-query result lists by canonical URL with RRF and keep the best ``limit``.
+
+    A page found by several queries ranks above one found by a single
+    query; syndicated copies under different URLs are folded together.
+    """
+    by_url, rankings = {}, []
+    for results in result_lists:
+        ranking = []
+        for result in results:
+            key = canonical_url(result["url"]) or result["title"]
+            if key not in by_url:
+                by_url[key] = result
+            if key not in ranking:
+                ranking.append(key)
+        rankings.append(ranking)
+    fused = [by_url[key] for key, _ in reciprocal_rank_fusion(rankings)]
+    groups = collapse_duplicates(
+        fused,
+        text=lambda r: f"{r['title']} {r['snippet']}",
+        key=lambda r: r["url"],
+        threshold=_result_dedup_threshold()
+    )
+    merged = []
+    for result, duplicates in groups[:limit]:
+        if duplicates:
+            result = dict(result, also_at=result.get("also_at", []) + duplicates)
+        merged.append(result)
+    return merged
+
+def _error_text(error: BaseException, timeout: float) -> str:
+    if isinstance(error, asyncio.TimeoutError):
+        return f"timed out after {timeout:g}s"
+    return str(error)
+
+def _tool_timeout() -> float:
+    return float(os.getenv("TOOL_TIMEOUT", "30"))
+
 class WebSearchTool(BaseTool):
     name = "web_search"
-    description = "Search the web for current information using DuckDuckGo"
-    args_schema = SearchInput
+    description = (
+        "Search the web for current information using DuckDuckGo. "
+        "Put several phrasings or questions in queries to search them all in one call"
+    )
+    args_schema: Type[BaseModel] = WebSearchInput
+    max_results: int = 3
+    # A multi-query call searches at most max_queries variants and returns
+    # at most max_merged_results pages
+    max_queries: int = 4
+    max_merged_results: int = 8
+    # Seconds before an async search is abandoned
+    timeout: float = Field(default_factory=_tool_timeout)
 
-    def _run(self, query: str) -> str:
+    def _run(self, query: str = "", queries: Optional[List[str]] = None) -> str:
         """Search the web for current information."""
+        variants = self._variants(query, queries)
+        if len(variants) > 1:
+            with ThreadPoolExecutor(max_workers=len(variants)) as pool:
+                futures = [pool.submit(self._results, variant) for variant in variants]
+                outcomes = [future.exception() or future.result() for future in futures]
+            return self._merged(variants, outcomes)
+
+        # A lone entry of ``queries`` stands in for a missing ``query``
+        query = variants[0]
+        try:
+            results = self._results(query)
+            return f"Web search results for '{query}':\n{compact_json(results)}"
+        except Exception as e:
+            return f"Error performing web search: {str(e)}"
+
+    async def _arun(self, query: str = "", queries: Optional[List[str]] = None) -> str:
+        """Search the web on the event loop, giving up after ``timeout`` seconds."""
+        variants = self._variants(query, queries)
+        if len(variants) > 1:
+            outcomes = await asyncio.gather(
+                *(self._aresults(variant) for variant in variants), return_exceptions=True
+            )
+            return self._merged(variants, outcomes)
+
+        # A lone entry of ``queries`` stands in for a missing ``query``
+        query = variants[0]
         try:
-            print(f"🔍 Web searching: {query}")
-            ddgs = DDGS()
-            results = []
-            for result in ddgs.text(query, max_results=3):
-                results.append({
-                    "title": result.get('title', ''),
-                    "url": result.get('href', ''),
-                    "snippet": result.get('body', '')[:150] + "..."
-                })
-            return f"Web search results for '{query}':\n{json.dumps(results, indent=2)}"
+            results = await self._aresults(query)
+            return f"Web search results for '{query}':\n{compact_json(results)}"
+        except asyncio.TimeoutError:
+            return f"Error performing web search: timed out after {self.timeout:g}s"
         except Exception as e:
             return f"Error performing web search: {str(e)}"
 
+    def _variants(self, query: str, queries: Optional[List[str]]) -> List[str]:
+        """Distinct queries to run, the main query first."""
+        variants, seen = [], set()
+        for variant in [query, *(queries or [])]:
+            key = normalize_query(variant)
+            if key and key not in seen:
+                seen.add(key)
+                variants.append(variant.strip())
+        return variants[:self.max_queries] or [query]
+
+    def _merged(self, variants: List[str], outcomes: list) -> str:
+        """One ranked result list from several queries' results or errors."""
+        found = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+        if not found:
+            return f"Error performing web search: {_error_text(outcomes[0], self.timeout)}"
+        results = _merge_web_results(found, self.max_merged_results)
+        header = f"Web search results for {len(variants)} queries ({'; '.join(variants)}):"
+        failed = [
+            f"'{variant}' ({_error_text(outcome, self.timeout)})"
+            for variant, outcome in zip(variants, outcomes) if isinstance(outcome, BaseException)
+        ]
+        if failed:
+            header += f"\nFailed queries: {', '.join(failed)}"
+        return f"{header}\n{compact_json(results)}"
+
+    def _results(self, query: str) -> list:
+        cache_key = f"web:{normalize_query(query)}"
+        results = get_search_cache().get(cache_key)
+        if results is not None:
+            print(f"⚡ Web search cache hit: {query}")
+            return results
+        # Identical searches already running in other threads share that result
+        return get_tool_flights().do(cache_key, lambda: self._search(query, cache_key))
+
+    async def _aresults(self, query: str) -> list:
+        cache_key = f"web:{normalize_query(query)}"
+        # The cache's SQLite tier and the result bookkeeping stay off the loop
+        results = await asyncio.to_thread(get_search_cache().get, cache_key)
+        if results is not None:
+            print(f"⚡ Web search cache hit: {query}")
+            return results
+        return await asyncio.wait_for(
+            get_async_tool_flights().do(cache_key, lambda: self._asearch(query, cache_key)),
+            self.timeout
+        )
+
+    def _search(self, query: str, cache_key: str) -> list:
+        print(f"🔍 Web searching: {query}")
+        raw = list(get_transport().ddgs().text(query, max_results=self.max_results))
+        return self._finish(raw, cache_key)
+
+    async def _asearch(self, query: str, cache_key: str) -> list:
+        print(f"🔍 Web searching: {query}")
+        ddgs = get_transport().async_ddgs()
+        raw = [result async for result in ddgs.text(query, max_results=self.max_results)]
+        return await asyncio.to_thread(self._finish, raw, cache_key)
+
+    def _finish(self, raw: list, cache_key: str) -> list:
+        """Collapse, format, cache and capture one query's raw results."""
+        raw = _collapse_web_results(raw)
+        results = []
+        for result in raw:
+            formatted = {
+                "title": result.get('title', ''),
+                "url": result.get('href', ''),
+                "snippet": result.get('body', '')[:150] + "..."
+            }
+            if result.get("also_at"):
+                formatted["also_at"] = result["also_at"]
+            results.append(formatted)
+        get_search_cache().set(cache_key, results)
+        _capture(
+            [f"{r.get('title', '')}\n{r.get('body', '')}" for r in raw],
+            [{"title": r.get('title', ''), "source": r.get('href', ''), "kind": "web"} for r in raw],
+            [f"web:{r.get('href', '')}" for r in raw]
+        )
+        _ingest([{"url": r.get('href', ''), "title": r.get('title', ''), "kind": "web"} for r in raw])
+        return results
+
+def _parse_arxiv_feed(content: bytes) -> list:
+    """Turn an arXiv API Atom feed into full paper metadata dicts."""
+    papers = []
+    for entry in feedparser.parse(content).entries:
+        pdf_url = next(
+            (link.href for link in entry.get("links", []) if link.get("title") == "pdf"),
+            None
+        )
+        papers.append({
+            "paper_id": entry.id.rsplit("/abs/", 1)[-1],
+            "title": " ".join(entry.title.split()),
+            "authors": [author.name for author in entry.get("authors", [])],
+            "summary": " ".join(entry.summary.split()),
+            "published": entry.published[:10],
+            "pdf_url": pdf_url,
+        })
+    return papers
+
+def _format_paper(paper: dict) -> dict:
+    return {
+        "title": paper["title"],
+        "authors": paper["authors"][:2],
+        "summary": paper["summary"][:200] + "...",
+        "published": paper["published"],
+        "pdf_url": paper["pdf_url"],
+    }
+
 class ArxivSearchTool(BaseTool):
     name = "arxiv_search"
     description = "Search arXiv for academic papers and research articles"
     args_schema = SearchInput
+    max_results: int = 3
+    # "api" queries arXiv live; "local" uses the offline index at ARXIV_INDEX_DIR
+    backend: str = Field(default_factory=lambda: os.getenv("ARXIV_BACKEND", "api"))
+
+    # Seconds before an async search is abandoned
+    timeout: float = Field(default_factory=_tool_timeout)
 
     def _run(self, query: str) -> str:
         """Search arXiv for academic papers."""
         try:
-            print(f"📚 ArXiv searching: {query}")
-            client = arxiv.Client()
-            search = arxiv.Search(
-                query=query,
-                max_results=3,
-                sort_by=arxiv.SortCriterion.Relevance
-            )
-            
-            results = []
-            for result in client.results(search):
-                results.append({
-                    "title": result.title,
-                    "authors": [author.name for author in result.authors][:2],
-                    "summary": result.summary[:200] + "...",
-                    "published": result.published.strftime("%Y-%m-%d"),
-                    "pdf_url": result.pdf_url,
-                })
-            return f"arXiv search results for '{query}':\n{json.dumps(results, indent=2)}"
+            if self.backend == "local":
+                papers = get_arxiv_index().search(query, self.max_results)
+            else:
+                papers = get_tool_flights().do(self._flight_key(query), lambda: self._search(query))
+            return self._finish(query, papers)
         except Exception as e:
             return f"Error searching arXiv: {str(e)}"
 
+    async def _arun(self, query: str) -> str:
+        """Search arXiv on the event loop, giving up after ``timeout`` seconds."""
+        try:
+            if self.backend == "local":
+                papers = await asyncio.to_thread(get_arxiv_index().search, query, self.max_results)
+            else:
+                papers = await asyncio.wait_for(
+                    get_async_tool_flights().do(self._flight_key(query), lambda: self._asearch(query)),
+                    self.timeout
+                )
+            return self._finish(query, papers)
+        except asyncio.TimeoutError:
+            return f"Error searching arXiv: timed out after {self.timeout:g}s"
+        except Exception as e:
+            return f"Error searching arXiv: {str(e)}"
+
+    def _query_key(self, query: str) -> str:
+        return f"{normalize_query(query)}|{self.max_results}"
+
+    def _flight_key(self, query: str) -> str:
+        return f"arxiv:{self._query_key(query)}"
+
+    def _search_params(self, query: str) -> dict:
+        return {
+            "search_query": query,
+            "start": 0,
+            "max_results": self.max_results,
+            "sortBy": "relevance",
+            "sortOrder": "descending",
+        }
+
+    def _finish(self, query: str, papers: list) -> str:
+        papers = _collapse_papers(papers)
+        _capture(
+            [f"{paper['title']}\n{paper['summary']}" for paper in papers],
+            [{"title": paper["title"], "source": paper["pdf_url"] or "", "kind": "arxiv"}
+             for paper in papers],
+            [f"arxiv:{arxiv_base_id(paper['paper_id'])}" for paper in papers]
+        )
+        _ingest([{"url": paper["pdf_url"], "title": paper["title"], "kind": "arxiv"}
+                 for paper in papers])
+        results = [_format_paper(paper) for paper in papers]
+        return f"arXiv search results for '{query}':\n{compact_json(results)}"
+
+    @staticmethod
+    def _store_query(store, query_key: str, papers: list):
+        store.put_papers(papers)
+        store.put_query(query_key, [paper["paper_id"] for paper in papers])
+
+    def _search(self, query: str) -> list:
+        """Serve a query from the local store, fetching only what is missing."""
+        store = get_arxiv_store()
+        query_key = self._query_key(query)
+        paper_ids = store.get_query(query_key)
+        
+        if paper_ids is None:
+            print(f"📚 ArXiv searching: {query}")
+            papers = self._fetch(self._search_params(query))
+            self._store_query(store, query_key, papers)
+            return papers
+        
+        print(f"⚡ ArXiv cache hit: {query}")
+        known = store.get_papers(paper_ids)
+        missing = [paper_id for paper_id in paper_ids if paper_id not in known]
+        if missing:
+            fetched = self._fetch({"id_list": ",".join(missing), "max_results": len(missing)})
+            store.put_papers(fetched)
+            known.update({paper["paper_id"]: paper for paper in fetched})
+        return [known[paper_id] for paper_id in paper_ids if paper_id in known]
+
+    async def _asearch(self, query: str) -> list:
+        """``_search`` with API calls on the shared async client and store access in a thread."""
+        store = get_arxiv_store()
+        query_key = self._query_key(query)
+        paper_ids = await asyncio.to_thread(store.get_query, query_key)
+        
+        if paper_ids is None:
+            print(f"📚 ArXiv searching: {query}")
+            papers = await self._afetch(self._search_params(query))
+            await asyncio.to_thread(self._store_query, store, query_key, papers)
+            return papers
+        
+        print(f"⚡ ArXiv cache hit: {query}")
+        known = await asyncio.to_thread(store.get_papers, paper_ids)
+        missing = [paper_id for paper_id in paper_ids if paper_id not in known]
+        if missing:
+            fetched = await self._afetch({"id_list": ",".join(missing), "max_results": len(missing)})
+            await asyncio.to_thread(store.put_papers, fetched)
+            known.update({paper["paper_id"]: paper for paper in fetched})
+        return [known[paper_id] for paper_id in paper_ids if paper_id in known]
+
+    def _fetch(self, params: dict) -> list:
+        get_arxiv_limiter().wait()
+        response = get_transport().sync_client().get(ARXIV_API_URL, params=params)
+        response.raise_for_status()
+        return _parse_arxiv_feed(response.content)
+
+    async def _afetch(self, params: dict) -> list:
+        await get_arxiv_limiter().wait_async()
+        response = await get_transport().async_client().get(ARXIV_API_URL, params=params)
+        response.raise_for_status()
+        return _parse_arxiv_feed(response.content)
+
+class CorpusSearchTool(BaseTool):
+    name = "corpus_search"
+    description = "Search the local corpus of previously collected web pages and papers by keywords and meaning"
+    args_schema = SearchInput
+    max_results: int = 4
+
+    def _run(self, query: str) -> str:
+        """Retrieve the best chunks from the research corpus (BM25 + dense, RRF-fused)."""
+        try:
+            print(f"🗂️ Corpus searching: {query}")
+            hits = get_corpus_retriever().search(query, k=self.max_results)
+            if not hits:
+                return f"No indexed documents match '{query}' yet."
+            results = [{
+                "title": hit["metadata"].get("title", ""),
+                "source": hit["metadata"].get("source", ""),
+                "text": hit["text"][:300] + "...",
+                "score": round(hit["score"], 4),
+            } for hit in hits]
+            return f"Corpus search results for '{query}':\n{compact_json(results)}"
+        except Exception as e:
+            return f"Error searching corpus: {str(e)}"
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+}
+_UNARY_OPS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+# Largest power the calculator computes, in decimal digits; stays under
+# Python's 4300-digit limit for printing integers
+MAX_POWER_DIGITS = 4000
+
+def _power(base, exponent):
+    # Huge integer powers hold the GIL for seconds, so refuse them up front
+    if abs(base) > 1 and abs(exponent) * math.log10(abs(base)) > MAX_POWER_DIGITS:
+        raise ValueError(f"result would exceed {MAX_POWER_DIGITS} digits")
+    return operator.pow(base, exponent)
+
+def _evaluate(node):
+    """Arithmetic over number literals only, with bounded powers."""
+    if isinstance(node, ast.Expression):
+        return _evaluate(node.body)
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_evaluate(node.operand))
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+        return _power(_evaluate(node.left), _evaluate(node.right))
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        return _BINARY_OPS[type(node.op)](_evaluate(node.left), _evaluate(node.right))
+    raise ValueError("unsupported expression")
+
 class CalculatorTool(BaseTool):
     name = "calculator"
     description = "Evaluate mathematical expressions. Input should be a mathematical expression like '2 + 2' or '3 * 5'."
 
+    # Seconds before an async evaluation is abandoned
+    timeout: float = Field(default_factory=_tool_timeout)
+
     def _run(self, expression: str) -> str:
         """Evaluate a mathematical expression."""
         try:
-            # Safe evaluation
             allowed_chars = set('0123456789+-*/.() ')
             if not all(c in allowed_chars for c in expression):
                 return "Error: Invalid characters in expression"
             
-            result = eval(expression, {"__builtins__": {}}, {})
+            result = _evaluate(ast.parse(expression, mode="eval"))
             return f"{expression} = {result}"
         except Exception as e:
             return f"Error evaluating expression: {str(e)}"
 
-    def _arun(self, expression: str):
-        """Async not implemented."""
-        raise NotImplementedError("Calculator does not support async")
\ No newline at end of file
+    async def _arun(self, expression: str) -> str:
+        """Evaluate in a thread, giving up after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(asyncio.to_thread(self._run, expression), self.timeout)
+        except asyncio.TimeoutError:
+            return f"Error evaluating expression: timed out after {self.timeout:g}s"
\ No newline at end of file
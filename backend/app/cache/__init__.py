@@ -0,0 +1,20 @@
+from .ttl_cache import TTLCache, SQLiteTTLCache, TieredCache
+from .search_cache import normalize_query, get_search_cache
+from .arxiv_store import ArxivStore, get_arxiv_store
+from .llm_cache import LLMResponseCache, get_llm_cache_store, llm_cache_caller
+from .answer_cache import SemanticAnswerCache, get_answer_cache
+
+__all__ = [
+    "TTLCache",
+    "SQLiteTTLCache",
+    "TieredCache",
+    "normalize_query",
+    "get_search_cache",
+    "ArxivStore",
+    "get_arxiv_store",
+    "LLMResponseCache",
+    "get_llm_cache_store",
+    "llm_cache_caller",
+    "SemanticAnswerCache",
+    "get_answer_cache"
+]
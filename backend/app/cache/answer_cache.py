@@ -0,0 +1,202 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+from langchain.schema.embeddings import Embeddings
+
+from app.retrieval.embeddings import embed_array, get_embeddings
+from app.retrieval.index_base import normalize
+
+DEFAULT_ANSWER_DB = Path(__file__).resolve().parents[2] / "data" / "answers.db"
+
+
+def request_text(topic: str, research_questions: List[str]) -> str:
+    """Text embedded for a research request; question order does not matter."""
+    questions = sorted(q.strip() for q in research_questions if q.strip())
+    return "\n".join([topic.strip(), *questions])
+
+
+class AnswerHit(NamedTuple):
+    result: Dict[str, Any]
+    similarity: float
+    topic: str  # topic of the request that produced the result
+    answer_id: int
+
+
+class SemanticAnswerCache:
+    """Completed research results looked up by meaning rather than exact text.
+
+    Each request's (topic, questions) text is embedded; a new request reuses
+    the stored result of the most similar earlier one when cosine similarity
+    reaches ``threshold`` and the result is younger than ``ttl`` seconds.
+    Results live in SQLite, while their unit-length embeddings are kept in
+    one in-memory matrix so a lookup is a single matrix-vector product.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        embeddings: Embeddings,
+        threshold: float = 0.92,
+        ttl: float = 86400,
+        maxsize: int = 5000
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS answers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    topic TEXT NOT NULL,
+                    variant TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    result TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )"""
+            )
+            self._conn.commit()
+            self._load()
+
+    def _load(self):
+        """Rebuild the in-memory matrix from the live rows (caller holds the lock)."""
+        self._conn.execute("DELETE FROM answers WHERE created_at <= ?", (time.time() - self.ttl,))
+        self._conn.commit()
+        rows = self._conn.execute(
+            "SELECT id, variant, embedding, created_at FROM answers ORDER BY id"
+        ).fetchall()
+        vectors = [np.frombuffer(blob, dtype=np.float32) for _, _, blob, _ in rows]
+        # Rows embedded by an earlier model (another dimension) can never match
+        keep = [i for i, v in enumerate(vectors) if len(v) == len(vectors[-1])]
+        self._ids = [rows[i][0] for i in keep]
+        self._variants = [rows[i][1] for i in keep]
+        self._created = np.array([rows[i][3] for i in keep], dtype=np.float64)
+        self._matrix = np.vstack([vectors[i] for i in keep]) if keep else np.zeros((0, 0), np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def embed(self, topic: str, research_questions: List[str]) -> np.ndarray:
+        return normalize(embed_array(self.embeddings, [request_text(topic, research_questions)]))[0]
+
+    def lookup(
+        self,
+        vector: np.ndarray,
+        variant: str = ""
+    ) -> Optional[AnswerHit]:
+        """The best fresh match for ``vector``, if any.
+
+        ``variant`` separates results that are not interchangeable even for
+        the same topic, such as standard and advanced research.
+        """
+        with self._lock:
+            if not self._ids or self._matrix.shape[1] != len(vector):
+                self.misses += 1
+                return None
+            scores = self._matrix @ vector
+            fresh = self._created > time.time() - self.ttl
+            usable = fresh & (np.array(self._variants) == variant) & (scores >= self.threshold)
+            if not usable.any():
+                self.misses += 1
+                return None
+            best = int(np.argmax(np.where(usable, scores, -np.inf)))
+            row = self._conn.execute(
+                "SELECT topic, result FROM answers WHERE id = ?", (self._ids[best],)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return AnswerHit(json.loads(row[1]), float(scores[best]), row[0], self._ids[best])
+
+    def put(self, vector: np.ndarray, topic: str, result: Dict[str, Any], variant: str = ""):
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO answers (topic, variant, embedding, result, created_at) VALUES (?, ?, ?, ?, ?)",
+                (topic, variant, np.asarray(vector, dtype=np.float32).tobytes(), json.dumps(result), now)
+            )
+            self._conn.commit()
+            if self._matrix.shape[1] not in (0, len(vector)):
+                self._load()
+                return
+            self._ids.append(cursor.lastrowid)
+            self._variants.append(variant)
+            self._created = np.append(self._created, now)
+            self._matrix = np.vstack([self._matrix.reshape(-1, len(vector)), vector[None, :]])
+            if len(self._ids) > self.maxsize:
+                # Drop the oldest rows beyond maxsize, and anything expired with them
+                self._conn.execute(
+                    "DELETE FROM answers WHERE id IN "
+                    "(SELECT id FROM answers ORDER BY id DESC LIMIT -1 OFFSET ?)",
+                    (self.maxsize,)
+                )
+                self._conn.commit()
+                self._load()
+
+    def update(self, answer_id: int, result: Dict[str, Any]):
+        """Replace a stored result, e.g. once a report has been written for it."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE answers SET result = ? WHERE id = ?", (json.dumps(result), answer_id)
+            )
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.commit()
+            self._load()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._ids),
+                "maxsize": self.maxsize,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+_lock = threading.Lock()
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Process-wide semantic answer cache, or None when ANSWER_CACHE=false.
+
+    Stored at ANSWER_CACHE_DB (default backend/data/answers.db) and tuned by
+    ANSWER_CACHE_THRESHOLD, ANSWER_CACHE_TTL and ANSWER_CACHE_SIZE.
+    """
+    global _answer_cache
+    with _lock:
+        if _answer_cache is None:
+            if os.getenv("ANSWER_CACHE", "true").lower() != "true":
+                return None
+            _answer_cache = SemanticAnswerCache(
+                os.getenv("ANSWER_CACHE_DB", str(DEFAULT_ANSWER_DB)),
+                get_embeddings(),
+                threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92")),
+                ttl=float(os.getenv("ANSWER_CACHE_TTL", "86400")),
+                maxsize=int(os.getenv("ANSWER_CACHE_SIZE", "5000"))
+            )
+        return _answer_cache
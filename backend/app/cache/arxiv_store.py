@@ -0,0 +1,143 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_ARXIV_DB = Path(__file__).resolve().parents[2] / "data" / "arxiv.db"
+
+
+class ArxivStore:
+    """On-disk arXiv cache: query -> paper ids, and paper id -> metadata.
+
+    Query lists expire after ``query_ttl`` seconds because new papers keep
+    arriving; paper metadata is immutable per versioned id and is kept.
+    """
+
+    def __init__(self, path: str, query_ttl: float = 86400):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.query_ttl = query_ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.query_hits = 0
+        self.query_misses = 0
+        self.papers_served = 0
+        self.papers_fetched = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS queries (
+                    query_key TEXT PRIMARY KEY,
+                    paper_ids TEXT NOT NULL,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS papers (
+                    paper_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    authors TEXT,
+                    summary TEXT,
+                    published TEXT,
+                    pdf_url TEXT,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+            self._conn.commit()
+
+    def get_query(self, query_key: str) -> Optional[List[str]]:
+        """Paper ids for a query, or None if unknown or stale."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT paper_ids, fetched_at FROM queries WHERE query_key = ?",
+                (query_key,)
+            ).fetchone()
+            if row is None or row[1] + self.query_ttl <= time.time():
+                self.query_misses += 1
+                return None
+            self.query_hits += 1
+        return json.loads(row[0])
+
+    def put_query(self, query_key: str, paper_ids: List[str]):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO queries (query_key, paper_ids, fetched_at) VALUES (?, ?, ?)",
+                (query_key, json.dumps(paper_ids), time.time())
+            )
+            self._conn.commit()
+
+    def get_papers(self, paper_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored metadata for whichever of ``paper_ids`` are known."""
+        if not paper_ids:
+            return {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT paper_id, title, authors, summary, published, pdf_url FROM papers "
+                f"WHERE paper_id IN ({', '.join('?' for _ in paper_ids)})",
+                paper_ids
+            ).fetchall()
+            self.papers_served += len(rows)
+        return {
+            row[0]: {
+                "paper_id": row[0],
+                "title": row[1],
+                "authors": json.loads(row[2]),
+                "summary": row[3],
+                "published": row[4],
+                "pdf_url": row[5],
+            }
+            for row in rows
+        }
+
+    def put_papers(self, papers: List[Dict[str, Any]]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO papers "
+                "(paper_id, title, authors, summary, published, pdf_url, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        paper["paper_id"], paper["title"], json.dumps(paper["authors"]),
+                        paper["summary"], paper["published"], paper["pdf_url"], now
+                    )
+                    for paper in papers
+                ]
+            )
+            self._conn.commit()
+            self.papers_fetched += len(papers)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.query_hits + self.query_misses
+            return {
+                "papers_stored": self._conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0],
+                "queries_stored": self._conn.execute("SELECT COUNT(*) FROM queries").fetchone()[0],
+                "query_hits": self.query_hits,
+                "query_misses": self.query_misses,
+                "query_hit_rate": round(self.query_hits / lookups, 3) if lookups else 0.0,
+                "papers_served": self.papers_served,
+                "papers_fetched": self.papers_fetched,
+            }
+
+
+_arxiv_store: Optional[ArxivStore] = None
+_lock = threading.Lock()
+
+
+def get_arxiv_store() -> ArxivStore:
+    """Process-wide store at ARXIV_CACHE_DB (default backend/data/arxiv.db)."""
+    global _arxiv_store
+    with _lock:
+        if _arxiv_store is None:
+            _arxiv_store = ArxivStore(
+                os.getenv("ARXIV_CACHE_DB", str(DEFAULT_ARXIV_DB)),
+                query_ttl=float(os.getenv("ARXIV_QUERY_TTL", "86400"))
+            )
+        return _arxiv_store
@@ -0,0 +1,124 @@
+import hashlib
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from langchain.globals import get_llm_cache, set_llm_cache
+from langchain.load.dump import dumps
+from langchain.load.load import loads
+from langchain.schema.cache import RETURN_VAL_TYPE, BaseCache
+
+from app.cache.ttl_cache import SQLiteTTLCache, TieredCache, TTLCache
+
+DEFAULT_LLM_CACHE_DB = Path(__file__).resolve().parents[2] / "data" / "llm_cache.db"
+
+_caller: ContextVar[str] = ContextVar("llm_cache_caller", default="other")
+
+
+@contextmanager
+def llm_cache_caller(name: str) -> Iterator[None]:
+    """Attribute LLM cache lookups made inside the block to ``name`` in the stats.
+
+    Context variables follow ``asyncio`` tasks and LangChain's executor
+    hops, so this also covers async calls started within the block.
+    """
+    token = _caller.set(name)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def llm_cache_key(prompt: str, llm_string: str) -> str:
+    """Hash of the serialized messages and the model string.
+
+    LangChain's ``llm_string`` already holds the model name, temperature,
+    stop words and any functions/tools bound to the call, so equal keys mean
+    an identical request.
+    """
+    return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache(BaseCache):
+    """Exact-match cache for chat completions, registered as LangChain's LLM cache.
+
+    Generations are stored serialized, so the same ``TieredCache`` (memory
+    LRU in front of SQLite) used for search results can hold them, and hits
+    return fresh objects rather than shared mutable ones.
+    """
+
+    def __init__(self, cache: TieredCache):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._callers: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def _count(self, hit: bool):
+        with self._lock:
+            self._callers[_caller.get()]["hits" if hit else "misses"] += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        stored = self.cache.get(llm_cache_key(prompt, llm_string))
+        self._count(stored is not None)
+        if stored is None:
+            return None
+        return [loads(generation) for generation in stored]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.cache.set(
+            llm_cache_key(prompt, llm_string),
+            [dumps(generation) for generation in return_val]
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        self.cache.clear()
+        with self._lock:
+            self._callers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.cache.stats()
+        with self._lock:
+            stats["callers"] = {
+                name: dict(counts, hit_rate=round(counts["hits"] / (counts["hits"] + counts["misses"]), 3))
+                for name, counts in self._callers.items()
+            }
+        return stats
+
+
+_llm_cache: Optional[LLMResponseCache] = None
+_lock = threading.Lock()
+
+
+def get_llm_cache_store() -> Optional[LLMResponseCache]:
+    """Process-wide LLM response cache, installed as LangChain's global cache.
+
+    Only models built with caching left on use it; ``create_chat_model``
+    turns it off for sampled (temperature > 0) models.
+
+    Disabled with LLM_CACHE=false. Sized by LLM_CACHE_SIZE (memory entries),
+    LLM_CACHE_DB_SIZE (SQLite rows) and LLM_CACHE_TTL; LLM_CACHE_DB sets the
+    SQLite path (default backend/data/llm_cache.db, empty for memory only).
+    """
+    global _llm_cache
+    with _lock:
+        if _llm_cache is None:
+            if os.getenv("LLM_CACHE", "true").lower() != "true":
+                return None
+            ttl = float(os.getenv("LLM_CACHE_TTL", "604800"))
+            memory = TTLCache(maxsize=int(os.getenv("LLM_CACHE_SIZE", "512")), ttl=ttl)
+            disk = None
+            db_path = os.getenv("LLM_CACHE_DB", str(DEFAULT_LLM_CACHE_DB))
+            if db_path:
+                disk = SQLiteTTLCache(
+                    db_path,
+                    maxsize=int(os.getenv("LLM_CACHE_DB_SIZE", "20000")),
+                    ttl=ttl,
+                    table="llm_cache"
+                )
+            _llm_cache = LLMResponseCache(TieredCache(memory, disk))
+        if get_llm_cache() is None:
+            set_llm_cache(_llm_cache)
+        return _llm_cache
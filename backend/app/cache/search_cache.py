@@ -0,0 +1,51 @@
+import os
+import re
+import threading
+from typing import Optional
+
+from app.cache.ttl_cache import TTLCache, SQLiteTTLCache, TieredCache
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from how in is it of on or that the this to
+was what when where which who why will with about into vs versus
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.+#-][a-z0-9]+)*[+#]*")
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a search query used as its cache key.
+
+    Lowercases, strips punctuation, drops stop words and sorts the remaining
+    terms, so "AI in Healthcare" and "healthcare  AI" share one entry. A
+    query made only of stop words keeps its terms.
+    """
+    tokens = _TOKEN.findall(query.lower())
+    terms = sorted({token for token in tokens if token not in STOP_WORDS})
+    return " ".join(terms or tokens)
+
+
+_search_cache: Optional[TieredCache] = None
+_lock = threading.Lock()
+
+
+def get_search_cache() -> TieredCache:
+    """Process-wide cache for search tool results.
+
+    Configured by SEARCH_CACHE_SIZE and SEARCH_CACHE_TTL; setting
+    SEARCH_CACHE_DB adds a persistent SQLite tier at that path.
+    """
+    global _search_cache
+    with _lock:
+        if _search_cache is None:
+            ttl = float(os.getenv("SEARCH_CACHE_TTL", "3600"))
+            memory = TTLCache(
+                maxsize=int(os.getenv("SEARCH_CACHE_SIZE", "1024")),
+                ttl=ttl
+            )
+            disk = None
+            db_path = os.getenv("SEARCH_CACHE_DB")
+            if db_path:
+                disk = SQLiteTTLCache(db_path, ttl=ttl, table="search_cache")
+            _search_cache = TieredCache(memory, disk)
+        return _search_cache
@@ -1,9 +1,60 @@
+import asyncio
+import os
+from typing import Callable, Dict, Optional
 from langchain.prompts import PromptTemplate
-from langchain.chat_models import ChatOpenAI
+from langchain.output_parsers import PydanticOutputParser
+from langchain.pydantic_v1 import BaseModel, Field
+from langchain.schema import OutputParserException
+
+from app.cache.llm_cache import llm_cache_caller
+from app.context_budget import count_tokens, model_of, report_context_tokens, truncate_tokens
+from app.llm import create_chat_model
+from app.prompts import StablePrompt
+
+METHODOLOGY = "Research conducted using AI agent tools including web search, academic paper search, and data analysis."
+
+# Instructions first, then the request's topic and findings, shared by all
+# of its section calls, then the one line that differs between them
+SECTION_PROMPT = StablePrompt(
+    "report_section",
+    prefix="You are writing one section of a research report. Base it only on the research findings given below.\n\n",
+    shared="TOPIC: {topic}\n\nRESEARCH FINDINGS:\n{findings}\n\n",
+    suffix="TASK: {task}"
+)
+
+SECTION_TASKS = {
+    "executive_summary": "Write an executive summary of the research.",
+    "key_findings": "Extract the key findings from the research.",
+    "detailed_analysis": "Provide a detailed analysis of the topic based on the findings.",
+    "conclusions": "Draw conclusions from the research.",
+    "recommendations": "Provide recommendations based on the research.",
+}
+
+class ReportSections(BaseModel):
+    executive_summary: str = Field(description="Executive summary of the research")
+    key_findings: str = Field(description="Key findings extracted from the research")
+    detailed_analysis: str = Field(description="Detailed analysis of the topic based on the findings")
+    conclusions: str = Field(description="Conclusions drawn from the research")
+    recommendations: str = Field(description="Recommendations based on the research")
 
 class ReportGenerator:
-    def __init__(self):
-        self.llm = ChatOpenAI(model="gpt-3.5-turbo", temperature=0.7)
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.llm = create_chat_model(model="gpt-3.5-turbo", temperature=0.7)
+        # Cap on simultaneous section calls per report in the async path
+        self.max_concurrency = max_concurrency or int(os.getenv("REPORT_MAX_CONCURRENCY", "5"))
+        # Token cap on the research findings pasted into each prompt
+        self.context_tokens = report_context_tokens()
+        self.sections_parser = PydanticOutputParser(pydantic_object=ReportSections)
+        self.structured_prompt = StablePrompt(
+            "report_structured",
+            prefix=f"""Write a research report based only on the research findings given below.
+
+Return the executive summary, key findings, detailed analysis, conclusions and recommendations as a JSON object.
+{self.sections_parser.get_format_instructions()}
+
+""",
+            suffix="TOPIC: {topic}\n\nRESEARCH FINDINGS:\n{findings}"
+        )
         
         self.report_template = """
 # Research Report: {topic}
@@ -33,37 +84,133 @@ class ReportGenerator:
 *Report generated by Agentic Research Assistant*
 """
     
-    def generate_report(self, topic: str, research_data: dict, research_questions: list) -> str:
-        """Generate a comprehensive research report."""
-        
-        # Generate sections using the LLM
-        executive_prompt = f"Write an executive summary for research on: {topic}\n\nResearch findings: {research_data.get('research_output', '')}"
-        executive_summary = self.llm.predict(executive_prompt)
-        
-        methodology = "Research conducted using AI agent tools including web search, academic paper search, and data analysis."
-        
-        findings_prompt = f"Extract key findings from this research: {research_data.get('research_output', '')}"
-        key_findings = self.llm.predict(findings_prompt)
-        
-        analysis_prompt = f"Provide detailed analysis for: {topic}\n\nFindings: {research_data.get('research_output', '')}"
-        detailed_analysis = self.llm.predict(analysis_prompt)
-        
-        conclusions_prompt = f"Draw conclusions from this research: {research_data.get('research_output', '')}"
-        conclusions = self.llm.predict(conclusions_prompt)
-        
-        recommendations_prompt = f"Provide recommendations based on this research: {research_data.get('research_output', '')}"
-        recommendations = self.llm.predict(recommendations_prompt)
-        
-        # Assemble final report
-        final_report = self.report_template.format(
+    def _findings(self, research_data: dict) -> str:
+        """The research output, cut to ``context_tokens`` so every prompt stays bounded."""
+        research_output = research_data.get('research_output') or ''
+        model = model_of(self.llm)
+        if count_tokens(research_output, model) <= self.context_tokens:
+            return research_output
+        print(f"✂️ Research findings trimmed to {self.context_tokens} tokens for the report")
+        return truncate_tokens(research_output, self.context_tokens, model)
+    
+    def _section_prompts(self, topic: str, research_data: dict) -> Dict[str, str]:
+        """Prompts for the LLM-written sections, in report order.
+
+        They differ only in the final task line. Whether a provider caches
+        the shared instructions, topic and findings depends on their length
+        (see ``prompt_stats``); short findings fall below the minimum.
+        """
+        findings = self._findings(research_data)
+        return {
+            name: SECTION_PROMPT.render(topic=topic, findings=findings, task=task)
+            for name, task in SECTION_TASKS.items()
+        }
+    
+    def _structured_prompt(self, topic: str, research_data: dict) -> str:
+        """Single prompt asking for every section as one JSON object."""
+        return self.structured_prompt.render(topic=topic, findings=self._findings(research_data))
+    
+    def _parse_sections(self, text: str) -> Optional[Dict[str, str]]:
+        try:
+            return self.sections_parser.parse(text).dict()
+        except OutputParserException as e:
+            print(f"⚠️ Structured report parsing failed, falling back to per-section calls: {e}")
+            return None
+    
+    @staticmethod
+    def _emit_all(on_section: Optional[Callable[[str, str], None]], sections: Dict[str, str]):
+        if on_section is not None:
+            for name, text in sections.items():
+                on_section(name, text)
+    
+    def assemble(self, topic: str, research_data: dict, sections: Dict[str, str]) -> str:
+        """The full report around already written ``sections``."""
+        return self.report_template.format(
             topic=topic,
-            executive_summary=executive_summary,
-            methodology=methodology,
-            key_findings=key_findings,
-            detailed_analysis=detailed_analysis,
-            conclusions=conclusions,
-            recommendations=recommendations,
-            sources="\n".join(research_data.get("sources_used", ["No sources extracted"]))
+            methodology=METHODOLOGY,
+            sources="\n".join(research_data.get("sources_used", ["No sources extracted"])),
+            **sections
         )
-        
-        return final_report
\ No newline at end of file
+    
+    def generate_report(
+        self,
+        topic: str,
+        research_data: dict,
+        research_questions: list,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        mode: str = "sections"
+    ) -> str:
+        """Generate a comprehensive research report.
+
+        ``mode="structured"`` writes every section in one JSON-formatted call
+        and falls back to one call per section if the reply does not parse.
+        ``on_section(name, text)`` is called as soon as each section is written.
+        """
+        with llm_cache_caller("report"):
+            if mode == "structured":
+                sections = self._parse_sections(self.llm.predict(
+                    self._structured_prompt(topic, research_data),
+                    response_format={"type": "json_object"}
+                ))
+                if sections is not None:
+                    self._emit_all(on_section, sections)
+                    return self.assemble(topic, research_data, sections)
+
+            sections = {}
+            for name, prompt in self._section_prompts(topic, research_data).items():
+                sections[name] = self.llm.predict(prompt)
+                if on_section is not None:
+                    on_section(name, sections[name])
+
+            return self.assemble(topic, research_data, sections)
+    
+    async def agenerate_report(
+        self,
+        topic: str,
+        research_data: dict,
+        research_questions: list,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        mode: str = "sections"
+    ) -> str:
+        """Generate the report with all section calls in flight at once.
+
+        The sections are independent, so latency is roughly that of the
+        slowest one. At most ``max_concurrency`` calls run at a time and
+        ``on_section`` fires in completion order. ``mode`` works as in
+        ``generate_report``.
+        """
+        sections = await self.agenerate_sections(topic, research_data, on_section, mode)
+        return self.assemble(topic, research_data, sections)
+    
+    async def agenerate_sections(
+        self,
+        topic: str,
+        research_data: dict,
+        on_section: Optional[Callable[[str, str], None]] = None,
+        mode: str = "sections"
+    ) -> Dict[str, str]:
+        """The LLM-written sections of ``agenerate_report``, in report order."""
+        with llm_cache_caller("report"):
+            if mode == "structured":
+                sections = self._parse_sections(await self.llm.apredict(
+                    self._structured_prompt(topic, research_data),
+                    response_format={"type": "json_object"}
+                ))
+                if sections is not None:
+                    self._emit_all(on_section, sections)
+                    return sections
+            
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def write_section(name: str, prompt: str):
+                async with semaphore:
+                    text = await self.llm.apredict(prompt)
+                if on_section is not None:
+                    on_section(name, text)
+                return name, text
+            
+            prompts = self._section_prompts(topic, research_data)
+            results = await asyncio.gather(
+                *(write_section(name, prompt) for name, prompt in prompts.items())
+            )
+            return dict(results)
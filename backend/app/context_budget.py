@@ -0,0 +1,128 @@
+import json
+import os
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+DEFAULT_MODEL = "gpt-3.5-turbo"
+TRUNCATION_MARKER = "\n[... truncated ...]\n"
+# Rough tokens-per-character ratio when no tokenizer can be loaded
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: str):
+    """tiktoken encoding for ``model``, loaded once per process; None if unavailable.
+
+    tiktoken downloads its vocabularies on first use, so an offline
+    container falls back to a length-based estimate instead of failing.
+    """
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        print(f"⚠️ No tokenizer for {model} ({e}); estimating tokens from length")
+        return None
+
+
+def model_of(llm: Any) -> str:
+    """Model name to count tokens for; chat models without one count as ``DEFAULT_MODEL``."""
+    return getattr(llm, "model_name", None) or DEFAULT_MODEL
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return -(-len(text) // _CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, budget: int, model: str = DEFAULT_MODEL) -> str:
+    """``text`` cut to about ``budget`` tokens, keeping its start and its end.
+
+    Conclusions and source lists tend to come last, so the cut is taken
+    from the middle: two thirds of the budget go to the head.
+    """
+    encoding = _encoding(model)
+    if encoding is None:
+        pieces, size = text, budget * _CHARS_PER_TOKEN
+    else:
+        pieces, size = encoding.encode(text, disallowed_special=()), budget
+    if len(pieces) <= size:
+        return text
+
+    head, tail = pieces[:size * 2 // 3], pieces[len(pieces) - (size - size * 2 // 3):]
+    if encoding is not None:
+        head, tail = encoding.decode(head), encoding.decode(tail)
+    return f"{head}{TRUNCATION_MARKER}{tail}"
+
+
+def compact_json(value: Any) -> str:
+    """JSON without indentation or padding, for text that goes into a prompt."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def fit_observations(
+    observations: Sequence[str],
+    budget: int,
+    model: str = DEFAULT_MODEL,
+    floor: int = 48
+) -> List[str]:
+    """Shrink the oldest observations first until the total fits ``budget`` tokens.
+
+    The newest observations are kept whole while they fit; the ones before
+    are truncated, but to no less than ``floor`` tokens each so the model
+    still sees what every earlier step returned.
+    """
+    counts = [count_tokens(observation, model) for observation in observations]
+    if sum(counts) <= budget:
+        return list(observations)
+
+    fitted = list(observations)
+    remaining = budget
+    for i in reversed(range(len(fitted))):
+        if counts[i] <= remaining:
+            remaining -= counts[i]
+            continue
+        keep = max(remaining, floor)
+        fitted[i] = truncate_tokens(fitted[i], keep, model)
+        remaining = max(remaining - keep, 0)
+    return fitted
+
+
+def scratchpad_trimmer(
+    budget: int,
+    model: str = DEFAULT_MODEL,
+    observation_budget: Optional[int] = None
+) -> Callable[[List[Tuple[Any, str]]], List[Tuple[Any, str]]]:
+    """``trim_intermediate_steps`` callable bounding an AgentExecutor's scratchpad.
+
+    Each observation is first cut to ``observation_budget`` tokens, then the
+    oldest are shrunk until all of them fit ``budget``.
+    """
+    def trim(steps: List[Tuple[Any, str]]) -> List[Tuple[Any, str]]:
+        observations = [str(observation) for _, observation in steps]
+        if observation_budget is not None:
+            observations = [truncate_tokens(o, observation_budget, model) for o in observations]
+        observations = fit_observations(observations, budget, model)
+        return [(action, observation) for (action, _), observation in zip(steps, observations)]
+
+    return trim
+
+
+def observation_tokens() -> int:
+    """Token budget of a single tool observation (CONTEXT_OBSERVATION_TOKENS)."""
+    return int(os.getenv("CONTEXT_OBSERVATION_TOKENS", "800"))
+
+
+def scratchpad_tokens() -> int:
+    """Token budget of all tool observations in one agent run (CONTEXT_SCRATCHPAD_TOKENS)."""
+    return int(os.getenv("CONTEXT_SCRATCHPAD_TOKENS", "4000"))
+
+
+def report_context_tokens() -> int:
+    """Token budget of the research findings in a report prompt (REPORT_CONTEXT_TOKENS)."""
+    return int(os.getenv("REPORT_CONTEXT_TOKENS", "3000"))
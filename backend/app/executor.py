@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+class ResearchExecutor:
+    """Bounded worker pool that runs blocking research work off the event loop.
+
+    Agent runs are synchronous LangChain calls. Endpoints dispatch them here
+    so the uvicorn loop stays free to answer other requests.
+
+    The pool is created by ``start`` (or the first ``run``) and released by
+    ``shutdown``, so one executor can serve several app lifespans. The
+    concurrency semaphore is rebuilt whenever ``run`` finds a new event loop.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        max_concurrency: Optional[int] = None,
+        use_processes: bool = False,
+    ):
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+        self.use_processes = use_processes
+
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._started = 0
+        self._completed = 0
+        self._failed = 0
+        self._total_wait = 0.0
+        self._total_run = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ResearchExecutor":
+        """Build an executor from RESEARCH_* environment variables."""
+        max_workers = int(os.getenv("RESEARCH_MAX_WORKERS", "16"))
+        max_concurrency = int(os.getenv("RESEARCH_MAX_CONCURRENCY", str(max_workers)))
+        use_processes = os.getenv("RESEARCH_EXECUTOR", "thread").lower() == "process"
+        return cls(
+            max_workers=max_workers,
+            max_concurrency=max_concurrency,
+            use_processes=use_processes
+        )
+
+    def start(self) -> Executor:
+        """Create the worker pool unless it is already running."""
+        with self._lock:
+            if self._pool is None:
+                if self.use_processes:
+                    self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="research-worker"
+                    )
+            return self._pool
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``func`` in the pool once a concurrency slot is free."""
+        pool = self.start()
+        loop = asyncio.get_running_loop()
+        # A semaphore belongs to the loop it was first used on
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        semaphore = self._semaphore
+
+        enqueued_at = time.perf_counter()
+        with self._lock:
+            self._queued += 1
+
+        try:
+            async with semaphore:
+                started_at = time.perf_counter()
+                with self._lock:
+                    self._queued -= 1
+                    self._running += 1
+                    self._started += 1
+                    self._total_wait += started_at - enqueued_at
+                enqueued_at = None
+
+                try:
+                    result = await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+                except Exception:
+                    with self._lock:
+                        self._failed += 1
+                    raise
+                finally:
+                    with self._lock:
+                        self._running -= 1
+                        self._total_run += time.perf_counter() - started_at
+
+                with self._lock:
+                    self._completed += 1
+                return result
+        finally:
+            # Cancelled while still waiting for a slot
+            if enqueued_at is not None:
+                with self._lock:
+                    self._queued -= 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth and throughput counters."""
+        with self._lock:
+            finished = self._completed + self._failed
+            return {
+                "executor": "process" if self.use_processes else "thread",
+                "max_workers": self.max_workers,
+                "max_concurrency": self.max_concurrency,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_seconds": round(self._total_wait / self._started, 3) if self._started else 0.0,
+                "avg_run_seconds": round(self._total_run / finished, 3) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Release the worker pool; a later ``start`` or ``run`` builds a new one."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
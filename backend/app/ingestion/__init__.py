@@ -0,0 +1,17 @@
+from .ledger import IngestionLedger
+from .extract import extract_text
+from .chunking import chunk_text
+from .dedup import DuplicateDetector, collapse_duplicates
+from .pipeline import IngestionPipeline
+from .service import IngestionService, get_ingestion_service
+
+__all__ = [
+    "IngestionLedger",
+    "extract_text",
+    "chunk_text",
+    "DuplicateDetector",
+    "collapse_duplicates",
+    "IngestionPipeline",
+    "IngestionService",
+    "get_ingestion_service"
+]
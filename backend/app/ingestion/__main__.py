@@ -0,0 +1,35 @@
+"""Ingest a list of URLs into the research corpus::
+
+    python -m app.ingestion urls.txt
+
+One URL per line. The file is read lazily, URLs already in the ledger are
+skipped, and the corpus is saved to CORPUS_DIR at the end.
+"""
+import argparse
+from typing import Iterator
+
+from app.ingestion.service import pipeline_from_env
+from app.retrieval.hybrid import save_corpus
+
+
+def _read_urls(path: str) -> Iterator[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest URLs into the research corpus")
+    parser.add_argument("urls", help="File with one URL per line")
+    args = parser.parse_args()
+
+    stats = pipeline_from_env().run(_read_urls(args.urls), verbose=True)
+    print(f"📊 {stats}")
+    if save_corpus():
+        print("💾 Research corpus saved")
+
+
+if __name__ == "__main__":
+    main()
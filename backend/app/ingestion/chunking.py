@@ -0,0 +1,29 @@
+from typing import Iterator
+
+
+def chunk_text(text: str, chunk_size: int = 1200, overlap: int = 200) -> Iterator[str]:
+    """Yield ~``chunk_size``-character chunks that break on paragraph or word boundaries.
+
+    Consecutive chunks share about ``overlap`` characters so a sentence cut at
+    a boundary is still whole in one of them.
+    """
+    start, length = 0, len(text)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            # Prefer a paragraph break, then a sentence end, then any space
+            window = text[start:end]
+            for separator in ("\n\n", ". ", " "):
+                cut = window.rfind(separator, chunk_size // 2)
+                if cut != -1:
+                    end = start + cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+        if end >= length:
+            return
+        next_start = max(end - overlap, start + 1)
+        # Start the overlap on a word boundary
+        space = text.find(" ", next_start, end)
+        start = space + 1 if space != -1 else next_start
@@ -0,0 +1,223 @@
+import hashlib
+import re
+import threading
+import zlib
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_ARXIV_VERSION = re.compile(r"v(\d+)$")
+_TRACKING_PARAM = re.compile(r"^(utm_\w+|fbclid|gclid|msclkid|mc_cid|mc_eid)$", re.IGNORECASE)
+_PRIME = np.uint64((1 << 31) - 1)
+_MASK32 = np.uint64(0xFFFFFFFF)
+_SHINGLE_BASE = np.uint64(1_000_003)
+_BLOCK = 2048  # shingles hashed per numpy step, bounds temporary memory
+
+Fingerprint = Tuple[str, np.ndarray]
+
+
+def content_hash(text: str) -> str:
+    """Hash of the lowercased word sequence, so whitespace and punctuation don't matter."""
+    normalized = " ".join(_WORD.findall(text.lower()))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def arxiv_base_id(paper_id: str) -> str:
+    """``2301.01234v3`` -> ``2301.01234``; all versions of a paper share it."""
+    return _ARXIV_VERSION.sub("", paper_id)
+
+
+def arxiv_version(paper_id: str) -> int:
+    """Version number of a versioned arXiv id, 0 when unversioned."""
+    match = _ARXIV_VERSION.search(paper_id)
+    return int(match.group(1)) if match else 0
+
+
+def canonical_url(url: str) -> str:
+    """Key under which links to the same page compare equal.
+
+    Ignores the scheme, a ``www.`` prefix, host case, the fragment, a
+    trailing slash, tracking parameters and query parameter order.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAM.match(name)
+    ))
+    return urlunsplit(("", host, parts.path.rstrip("/"), query, "")).lstrip("/")
+
+
+class MinHasher:
+    """MinHash signatures over word ``shingle_size``-grams.
+
+    Shingles are hashed to 32 bits and pushed through ``num_perm`` universal
+    hash functions ``(a * x + b) mod p``; the fraction of equal positions in
+    two signatures estimates the Jaccard similarity of their shingle sets.
+    """
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 3, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)[:, None]
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)[:, None]
+
+    def shingles(self, text: str) -> np.ndarray:
+        tokens = _WORD.findall(text.lower())
+        if not tokens:
+            return np.zeros(0, dtype=np.uint64)
+        ids = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64,
+                          count=len(tokens))
+        k = min(self.shingle_size, len(ids))
+        count = len(ids) - k + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for j in range(k):
+            hashes = (hashes * _SHINGLE_BASE + ids[j:j + count]) & _MASK32
+        return np.unique(hashes) % _PRIME
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        signature = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        for start in range(0, len(shingles), _BLOCK):
+            block = shingles[start:start + _BLOCK][None, :]
+            np.minimum(signature, ((self._a * block + self._b) % _PRIME).min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+
+def similarity(first: np.ndarray, second: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.mean(first == second))
+
+
+class MinHashLSH:
+    """Banded LSH over MinHash signatures.
+
+    A signature is split into ``bands`` bands of ``num_perm / bands`` rows;
+    two items become candidates when any band matches exactly, which
+    happens with high probability once similarity passes roughly
+    ``(1 / bands) ** (bands / num_perm)`` (~0.7 for 16 bands of 8).
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError(f"{num_perm} permutations do not split into {bands} bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._buckets: List[Dict[bytes, List[str]]] = [defaultdict(list) for _ in range(bands)]
+        self.signatures: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [
+            signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            for band in range(self.bands)
+        ]
+
+    def insert(self, key: str, signature: np.ndarray):
+        self.signatures[key] = signature
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket[band_key].append(key)
+
+    def query(
+        self,
+        signature: np.ndarray,
+        threshold: float,
+        exhaustive: bool = False
+    ) -> List[Tuple[str, float]]:
+        """Stored keys whose estimated similarity is at least ``threshold``, best first.
+
+        ``exhaustive`` compares against every stored signature instead of
+        only band collisions, which is exact and cheap for small collections.
+        """
+        if exhaustive:
+            candidates = set(self.signatures)
+        else:
+            candidates = set()
+            for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(band_key, ()))
+        scored = [(key, similarity(signature, self.signatures[key])) for key in candidates]
+        return sorted((item for item in scored if item[1] >= threshold), key=lambda item: -item[1])
+
+
+class DuplicateDetector:
+    """Exact (content hash) plus near-duplicate (MinHash + LSH) detection.
+
+    Until ``exhaustive_below`` items are stored, every signature is compared
+    directly; LSH only takes over once that would be slow.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 3,
+        exhaustive_below: int = 256
+    ):
+        self.threshold = threshold
+        self.exhaustive_below = exhaustive_below
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.lsh = MinHashLSH(num_perm, bands)
+        self._hashes: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.lsh)
+
+    def fingerprint(self, text: str) -> Fingerprint:
+        return content_hash(text), self.hasher.signature(text)
+
+    def find(self, fingerprint: Fingerprint) -> Optional[str]:
+        """Key of an already added item this fingerprint duplicates, if any."""
+        digest, signature = fingerprint
+        with self._lock:
+            original = self._hashes.get(digest)
+            if original is not None:
+                return original
+            matches = self.lsh.query(
+                signature, self.threshold, exhaustive=len(self.lsh) < self.exhaustive_below
+            )
+        return matches[0][0] if matches else None
+
+    def add(self, key: str, fingerprint: Fingerprint):
+        digest, signature = fingerprint
+        with self._lock:
+            self._hashes.setdefault(digest, key)
+            self.lsh.insert(key, signature)
+
+    def check_and_add(self, key: str, text: str) -> Optional[str]:
+        """Return the original's key if ``text`` is a duplicate, else remember it."""
+        fingerprint = self.fingerprint(text)
+        original = self.find(fingerprint)
+        if original is None:
+            self.add(key, fingerprint)
+        return original
+
+
+def collapse_duplicates(
+    items: List[Dict[str, Any]],
+    text: Callable[[Dict[str, Any]], str],
+    key: Callable[[Dict[str, Any]], str],
+    threshold: float = 0.8
+) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """Keep the first of each group of duplicate ``items``, in order.
+
+    Returns ``(item, keys of the duplicates folded into it)`` pairs.
+    """
+    detector = DuplicateDetector(threshold=threshold)
+    kept: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+    for item in items:
+        original = detector.check_and_add(key(item), text(item))
+        if original is None:
+            kept[key(item)] = (item, [])
+        elif key(item) != original:
+            kept[original][1].append(key(item))
+    return list(kept.values())
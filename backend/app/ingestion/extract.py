@@ -0,0 +1,89 @@
+import io
+import re
+from html.parser import HTMLParser
+from typing import List, Tuple
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # PDF support is optional
+    PdfReader = None
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "nav", "footer", "header", "aside", "form"}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "br", "li", "ul", "ol", "table", "tr",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "figcaption", "dd", "dt",
+}
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class UnsupportedContent(Exception):
+    """The response body is not a format the pipeline can extract."""
+
+
+class _TextExtractor(HTMLParser):
+    """Visible text of an HTML page, with block elements on their own lines."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.title_parts: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title_parts.append(data)
+        elif not self._skip_depth:
+            self.parts.append(data)
+
+
+def clean_text(text: str) -> str:
+    lines = (_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def extract_html(html: str) -> Tuple[str, str]:
+    """``(title, text)`` of an HTML document."""
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return clean_text("".join(parser.title_parts)), clean_text("".join(parser.parts))
+
+
+def extract_pdf(content: bytes) -> Tuple[str, str]:
+    """``(title, text)`` of a PDF; requires the optional ``pypdf`` package."""
+    if PdfReader is None:
+        raise UnsupportedContent("PDF extraction needs `pip install pypdf`")
+    reader = PdfReader(io.BytesIO(content))
+    title = (reader.metadata.title if reader.metadata else None) or ""
+    pages = (page.extract_text() or "" for page in reader.pages)
+    return clean_text(title), clean_text("\n\n".join(pages))
+
+
+def extract_text(content: bytes, content_type: str = "", url: str = "") -> Tuple[str, str]:
+    """Dispatch on content type (or URL suffix) to ``(title, text)``."""
+    content_type = content_type.split(";")[0].strip().lower()
+    if content_type == "application/pdf" or content[:5] == b"%PDF-" or url.lower().endswith(".pdf"):
+        return extract_pdf(content)
+    if content_type in ("", "text/html", "application/xhtml+xml"):
+        return extract_html(content.decode("utf-8", errors="replace"))
+    if content_type.startswith("text/"):
+        return "", clean_text(content.decode("utf-8", errors="replace"))
+    raise UnsupportedContent(f"Unsupported content type: {content_type}")
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_LEDGER_DB = Path(__file__).resolve().parents[2] / "data" / "ingest.db"
+
+INGEST_DONE = "done"
+INGEST_FAILED = "failed"
+INGEST_SKIPPED = "skipped"  # fetched, but nothing worth indexing
+INGEST_DUPLICATE = "duplicate"  # same or near-same text as an indexed URL
+
+
+class IngestionLedger:
+    """SQLite record of every URL the pipeline has finished with.
+
+    A URL marked done, skipped or duplicate is never fetched again, so an interrupted
+    run resumes where it stopped. Failed URLs are retried on later runs
+    until they have failed ``max_attempts`` times.
+    """
+
+    def __init__(self, path: str, max_attempts: int = 3):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS urls (
+                    url TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    chunks INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS signatures (
+                    url TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    minhash BLOB NOT NULL
+                )"""
+            )
+            self._conn.commit()
+
+    def should_fetch(self, url: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, attempts FROM urls WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return True
+        status, attempts = row
+        return status == INGEST_FAILED and attempts < self.max_attempts
+
+    def mark(self, url: str, status: str, chunks: int = 0, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO urls (url, status, chunks, attempts, error, updated_at)
+                   VALUES (?, ?, ?, 1, ?, ?)
+                   ON CONFLICT(url) DO UPDATE SET
+                       status = excluded.status,
+                       chunks = excluded.chunks,
+                       attempts = urls.attempts + 1,
+                       error = excluded.error,
+                       updated_at = excluded.updated_at""",
+                (url, status, chunks, error, time.time())
+            )
+            self._conn.commit()
+
+    def put_signature(self, url: str, content_hash: str, minhash: np.ndarray):
+        """Remember an indexed document's fingerprint for later duplicate checks."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO signatures (url, content_hash, minhash) VALUES (?, ?, ?)",
+                (url, content_hash, minhash.astype(np.uint32).tobytes())
+            )
+            self._conn.commit()
+
+    def signatures(self) -> Iterator[Tuple[str, str, np.ndarray]]:
+        with self._lock:
+            rows = self._conn.execute("SELECT url, content_hash, minhash FROM signatures").fetchall()
+        for url, digest, blob in rows:
+            yield url, digest, np.frombuffer(blob, dtype=np.uint32)
+
+    def status(self, url: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM urls WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*), SUM(chunks) FROM urls GROUP BY status"
+            ).fetchall()
+        stats = {status: count for status, count, _ in rows}
+        stats["chunks"] = sum(chunks or 0 for _, _, chunks in rows)
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,272 @@
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from app.ingestion.chunking import chunk_text
+from app.ingestion.dedup import DuplicateDetector
+from app.ingestion.extract import UnsupportedContent, extract_text
+from app.ingestion.ledger import (
+    INGEST_DONE,
+    INGEST_DUPLICATE,
+    INGEST_FAILED,
+    INGEST_SKIPPED,
+    IngestionLedger,
+)
+from app.retrieval.hybrid import HybridRetriever
+from app.transport import get_transport
+
+USER_AGENT = "Mozilla/5.0 (compatible; ResearchAssistant/1.0)"
+
+# URL string, or a dict with "url" plus optional "title" and "kind"
+IngestItem = Union[str, Dict[str, Any]]
+
+_END = object()
+
+
+class IngestionPipeline:
+    """Streaming fetch -> extract -> chunk -> embed -> index pipeline.
+
+    Stages are connected by bounded queues: a feeder thread pulls URLs from
+    the (possibly lazy) input, ``fetch_workers`` threads download, extract
+    and chunk them, and the consuming generator batches chunks into one
+    embedding call per ``embed_batch`` chunks. When a stage falls behind, the
+    queue before it fills and the stages upstream block, so memory stays
+    bounded by the queue sizes no matter how many URLs are fed in.
+
+    Every finished URL is recorded in the ledger; URLs it already holds are
+    skipped, so an interrupted run can simply be started again.
+
+    Documents whose text matches an indexed one exactly (content hash) or
+    nearly (MinHash similarity >= ``dedup_threshold``), such as syndicated
+    articles or arXiv versions, are recorded as duplicates and not indexed.
+    Fingerprints are computed by the fetch workers and kept in the ledger.
+    """
+
+    def __init__(
+        self,
+        retriever: HybridRetriever,
+        ledger: IngestionLedger,
+        fetch_workers: int = 8,
+        queue_size: int = 32,
+        embed_batch: int = 64,
+        chunk_size: int = 1200,
+        chunk_overlap: int = 200,
+        max_bytes: int = 10_000_000,
+        max_chunks: int = 200,
+        min_chars: int = 200,
+        flush_interval: float = 1.0,
+        dedup_threshold: Optional[float] = 0.8
+    ):
+        self.retriever = retriever
+        self.ledger = ledger
+        self.fetch_workers = fetch_workers
+        self.queue_size = queue_size
+        self.embed_batch = embed_batch
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.max_bytes = max_bytes
+        self.max_chunks = max_chunks
+        self.min_chars = min_chars
+        self.flush_interval = flush_interval
+        self.detector: Optional[DuplicateDetector] = None
+        if dedup_threshold is not None:
+            self.detector = DuplicateDetector(threshold=dedup_threshold)
+            for url, digest, minhash in ledger.signatures():
+                self.detector.add(url, (digest, minhash))
+
+    def fetch(self, url: str):
+        """Download ``url`` as ``(bytes, content type)``, refusing bodies over ``max_bytes``."""
+        client = get_transport().sync_client()
+        with client.stream("GET", url, headers={"User-Agent": USER_AGENT}) as response:
+            response.raise_for_status()
+            if int(response.headers.get("content-length") or 0) > self.max_bytes:
+                raise UnsupportedContent(f"Body larger than {self.max_bytes} bytes")
+            body = bytearray()
+            for part in response.iter_bytes():
+                body.extend(part)
+                if len(body) > self.max_bytes:
+                    raise UnsupportedContent(f"Body larger than {self.max_bytes} bytes")
+            return bytes(body), response.headers.get("content-type", "")
+
+    def process(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch, extract and chunk one URL into a document dict."""
+        url = item["url"]
+        content, content_type = self.fetch(url)
+        title, text = extract_text(content, content_type, url)
+        chunks = []
+        if len(text) >= self.min_chars:
+            for chunk in chunk_text(text, self.chunk_size, self.chunk_overlap):
+                chunks.append(chunk)
+                if len(chunks) >= self.max_chunks:
+                    break
+        return {
+            "url": url,
+            "title": item.get("title") or title or url,
+            "kind": item.get("kind", "web"),
+            "chunks": chunks,
+            "fingerprint": self.detector.fingerprint(text) if self.detector is not None and chunks else None,
+        }
+
+    def _put(self, q: queue.Queue, value, stop: threading.Event) -> bool:
+        """Blocking put that gives up once ``stop`` is set."""
+        while not stop.is_set():
+            try:
+                q.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _feed(self, items: Iterable[IngestItem], urls: queue.Queue, stats: Dict[str, Any],
+              in_flight: set, stop: threading.Event):
+        try:
+            for item in items:
+                if stop.is_set():
+                    break
+                item = {"url": item} if isinstance(item, str) else item
+                url = item.get("url")
+                if not url or url in in_flight or not self.ledger.should_fetch(url):
+                    stats["already_ingested"] += 1
+                    continue
+                in_flight.add(url)
+                if not self._put(urls, item, stop):
+                    break
+        except Exception as e:
+            print(f"⚠️ Ingestion input failed: {e}")
+        finally:
+            for _ in range(self.fetch_workers):
+                self._put(urls, _END, stop)
+
+    def _fetch_worker(self, urls: queue.Queue, docs: queue.Queue, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                item = urls.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            if item is _END:
+                break
+            try:
+                doc = self.process(item)
+            except Exception as e:
+                doc = {"url": item["url"], "error": f"{type(e).__name__}: {e}"}
+            if not self._put(docs, doc, stop):
+                return
+        self._put(docs, _END, stop)
+
+    def _index(self, batch: List[Dict[str, Any]], stats: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Embed and index a batch of documents in one call, then record them."""
+        texts, metadatas, ids = [], [], []
+        for doc in batch:
+            for position, chunk in enumerate(doc["chunks"]):
+                texts.append(chunk)
+                metadatas.append({
+                    "title": doc["title"],
+                    "source": doc["url"],
+                    "kind": doc["kind"],
+                    "chunk": position,
+                })
+                ids.append(f"{doc['url']}#{position}")
+        try:
+            self.retriever.add_texts(texts, metadatas=metadatas, ids=ids)
+        except Exception as e:
+            for doc in batch:
+                yield self._record(doc["url"], INGEST_FAILED, stats, error=f"Indexing failed: {e}")
+            return
+        stats["batches"] += 1
+        for doc in batch:
+            yield self._record(doc["url"], INGEST_DONE, stats, chunks=len(doc["chunks"]))
+
+    def _duplicate_of(self, doc: Dict[str, Any]) -> Optional[str]:
+        """Original URL if ``doc`` duplicates an indexed one; otherwise claim its fingerprint.
+
+        Only the consuming thread calls this, so check-then-add cannot race.
+        """
+        if doc["fingerprint"] is None:
+            return None
+        original = self.detector.find(doc["fingerprint"])
+        if original is None or original == doc["url"]:
+            self.detector.add(doc["url"], doc["fingerprint"])
+            self.ledger.put_signature(doc["url"], *doc["fingerprint"])
+            return None
+        doc["duplicate_of"] = original
+        return original
+
+    def _record(self, url: str, status: str, stats: Dict[str, Any], chunks: int = 0,
+                error: Optional[str] = None) -> Dict[str, Any]:
+        self.ledger.mark(url, status, chunks, error)
+        stats[status] += 1
+        stats["chunks"] += chunks
+        return {"url": url, "status": status, "chunks": chunks, "error": error}
+
+    def stream(self, items: Iterable[IngestItem]) -> Iterator[Dict[str, Any]]:
+        """Ingest ``items`` lazily, yielding ``{url, status, chunks, error}`` per URL.
+
+        Closing the generator early stops every stage.
+        """
+        stats = self.stats = {
+            INGEST_DONE: 0, INGEST_FAILED: 0, INGEST_SKIPPED: 0, INGEST_DUPLICATE: 0,
+            "already_ingested": 0, "chunks": 0, "batches": 0,
+        }
+        urls: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        docs: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        in_flight: set = set()
+        stop = threading.Event()
+        threads = [threading.Thread(
+            target=self._feed, args=(items, urls, stats, in_flight, stop),
+            name="ingest-feed", daemon=True
+        )] + [threading.Thread(
+            target=self._fetch_worker, args=(urls, docs, stop),
+            name=f"ingest-fetch-{i}", daemon=True
+        ) for i in range(self.fetch_workers)]
+        for thread in threads:
+            thread.start()
+
+        batch: List[Dict[str, Any]] = []
+        pending_chunks = 0
+        finished_workers = 0
+        try:
+            while finished_workers < self.fetch_workers:
+                try:
+                    doc = docs.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    # Input is slow: index what we have rather than wait for a full batch
+                    if batch:
+                        yield from self._index(batch, stats)
+                        batch, pending_chunks = [], 0
+                    continue
+                if doc is _END:
+                    finished_workers += 1
+                    continue
+                in_flight.discard(doc["url"])
+                if "error" in doc:
+                    yield self._record(doc["url"], INGEST_FAILED, stats, error=doc["error"])
+                elif not doc["chunks"]:
+                    yield self._record(doc["url"], INGEST_SKIPPED, stats)
+                elif self._duplicate_of(doc):
+                    yield self._record(doc["url"], INGEST_DUPLICATE, stats,
+                                       error=f"Duplicate of {doc['duplicate_of']}")
+                else:
+                    batch.append(doc)
+                    pending_chunks += len(doc["chunks"])
+                    if pending_chunks >= self.embed_batch:
+                        yield from self._index(batch, stats)
+                        batch, pending_chunks = [], 0
+            if batch:
+                yield from self._index(batch, stats)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join(timeout=1)
+
+    def run(self, items: Iterable[IngestItem], verbose: bool = False) -> Dict[str, Any]:
+        """Ingest everything in ``items`` and return counts by outcome."""
+        started = time.perf_counter()
+        for result in self.stream(items):
+            if verbose:
+                icon = {INGEST_DONE: "✅", INGEST_SKIPPED: "⏭️", INGEST_DUPLICATE: "♊"}.get(
+                    result["status"], "❌"
+                )
+                detail = f"{result['chunks']} chunks" if not result["error"] else result["error"]
+                print(f"{icon} {result['url']} ({detail})")
+        return dict(self.stats, seconds=round(time.perf_counter() - started, 3))
@@ -0,0 +1,103 @@
+import os
+import queue
+import threading
+from typing import Iterator, List, Optional
+
+from app.ingestion.ledger import DEFAULT_LEDGER_DB, INGEST_DONE, IngestionLedger
+from app.ingestion.pipeline import IngestItem, IngestionPipeline
+from app.retrieval.hybrid import get_corpus_retriever
+
+_STOP = object()
+
+
+class IngestionService:
+    """Long-running pipeline fed by tool results.
+
+    ``enqueue`` never blocks the caller: when the inbox is full the URLs are
+    dropped (and can be picked up again the next time a tool returns them).
+    """
+
+    def __init__(self, pipeline: IngestionPipeline, inbox_size: int = 1000):
+        self.pipeline = pipeline
+        self._inbox: queue.Queue = queue.Queue(maxsize=inbox_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def _items(self) -> Iterator[IngestItem]:
+        while True:
+            item = self._inbox.get()
+            if item is _STOP:
+                return
+            yield item
+
+    def _run(self):
+        for result in self.pipeline.stream(self._items()):
+            if result["status"] == INGEST_DONE:
+                print(f"📥 Ingested {result['url']} ({result['chunks']} chunks)")
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ingestion", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, items: List[IngestItem]):
+        self.start()
+        for item in items:
+            try:
+                self._inbox.put_nowait(item)
+            except queue.Full:
+                self.dropped += 1
+
+    def stop(self, timeout: float = 10.0):
+        """Let queued URLs finish (up to ``timeout`` seconds), then stop."""
+        with self._lock:
+            thread = self._thread
+        if thread is None:
+            return
+        self._inbox.put(_STOP)
+        thread.join(timeout)
+
+    def stats(self):
+        return {
+            "inbox": self._inbox.qsize(),
+            "dropped": self.dropped,
+            **self.pipeline.ledger.stats(),
+        }
+
+
+def pipeline_from_env(retriever=None) -> IngestionPipeline:
+    # An empty INGEST_DEDUP_THRESHOLD turns duplicate detection off
+    threshold = os.getenv("INGEST_DEDUP_THRESHOLD", "0.8")
+    return IngestionPipeline(
+        retriever or get_corpus_retriever(),
+        IngestionLedger(os.getenv("INGEST_LEDGER_DB", str(DEFAULT_LEDGER_DB))),
+        fetch_workers=int(os.getenv("INGEST_FETCH_WORKERS", "8")),
+        queue_size=int(os.getenv("INGEST_QUEUE_SIZE", "32")),
+        embed_batch=int(os.getenv("INGEST_EMBED_BATCH", "64")),
+        chunk_size=int(os.getenv("INGEST_CHUNK_SIZE", "1200")),
+        chunk_overlap=int(os.getenv("INGEST_CHUNK_OVERLAP", "200")),
+        max_bytes=int(os.getenv("INGEST_MAX_BYTES", "10000000")),
+        dedup_threshold=float(threshold) if threshold else None
+    )
+
+
+_service: Optional[IngestionService] = None
+_service_lock = threading.Lock()
+
+
+def get_ingestion_service() -> IngestionService:
+    """Process-wide ingestion service over the research corpus."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = IngestionService(pipeline_from_env())
+        return _service
+
+
+def stop_ingestion_service(timeout: float = 10.0):
+    with _service_lock:
+        service = _service
+    if service is not None:
+        service.stop(timeout)
@@ -0,0 +1,9 @@
+from .store import JobStore, InMemoryJobStore, SQLiteJobStore
+from .manager import JobManager
+
+__all__ = [
+    "JobStore",
+    "InMemoryJobStore",
+    "SQLiteJobStore",
+    "JobManager"
+]
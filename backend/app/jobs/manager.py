@@ -0,0 +1,139 @@
+import asyncio
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.executor import ResearchExecutor
+from app.jobs.store import (
+    JobStore, InMemoryJobStore, SQLiteJobStore,
+    JOB_RUNNING, JOB_COMPLETED, JOB_FAILED
+)
+from app.research_service import conduct_research
+
+DEFAULT_JOB_DB = Path(__file__).resolve().parents[2] / "data" / "jobs.db"
+
+
+class JobManager:
+    """Accepts research jobs immediately and runs them from an in-process queue.
+
+    Intake only writes to the store and enqueues the job id; a fixed number of
+    worker tasks pull ids off the queue and dispatch the blocking research run
+    through ``conduct_research`` on the shared ``ResearchExecutor``.
+
+    Store calls run on a single I/O thread, off the event loop and in the
+    order they were issued, so a job's last progress write never lands after
+    its final status. ``start``/``stop`` can be repeated, e.g. by one app
+    going through several lifespans.
+    """
+
+    def __init__(self, store: JobStore, executor: ResearchExecutor, workers: int = 4):
+        self.store = store
+        self.executor = executor
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._io: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls, executor: ResearchExecutor) -> "JobManager":
+        """Build a manager from JOB_* environment variables."""
+        if os.getenv("JOB_STORE", "sqlite").lower() == "memory":
+            store: JobStore = InMemoryJobStore()
+        else:
+            store = SQLiteJobStore(os.getenv("JOB_DB_PATH", str(DEFAULT_JOB_DB)))
+        workers = int(os.getenv("JOB_WORKERS", str(executor.max_concurrency)))
+        return cls(store, executor, workers=workers)
+
+    async def start(self):
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-store")
+        await self._call(self.store.open)
+        self._queue = asyncio.Queue()
+        # Pick up anything a previous process accepted but never finished
+        for job in await self._call(self.store.list_unfinished):
+            self._queue.put_nowait(job["job_id"])
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._call(self.store.close)
+        self._io.shutdown(wait=True)
+        self._io = None
+
+    def _call(self, func, *args, **kwargs) -> asyncio.Future:
+        """Queue a store call on the I/O thread."""
+        return asyncio.get_running_loop().run_in_executor(self._io, partial(func, *args, **kwargs))
+
+    async def submit(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a new job and queue it for execution."""
+        job = await self._call(self.store.create, uuid.uuid4().hex, request)
+        self._queue.put_nowait(job["job_id"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self._call(self.store.get, job_id)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run_job(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job_id: str):
+        job = await self._call(self.store.get, job_id)
+        if job is None:
+            return
+        request = job["request"]
+        await self._call(self.store.update, job_id, status=JOB_RUNNING, stage="starting", progress=5)
+
+        def report_progress(stage: str, progress: int, partial_output: Optional[str] = None):
+            fields = {"stage": stage, "progress": progress}
+            if partial_output is not None:
+                fields["partial_output"] = partial_output
+            # Queued behind earlier writes, not awaited: the report goes on
+            self._call(self.store.update, job_id, **fields)
+
+        try:
+            result = await conduct_research(
+                self.executor,
+                request["topic"],
+                request["research_questions"],
+                request.get("detailed_report", True),
+                advanced=request.get("advanced", False),
+                report_mode=request.get("report_mode", "sections"),
+                progress=report_progress
+            )
+        except Exception as e:
+            await self._call(self.store.update, job_id, status=JOB_FAILED, stage="failed", error=str(e))
+            return
+
+        if result["success"]:
+            await self._call(
+                self.store.update,
+                job_id,
+                status=JOB_COMPLETED,
+                stage="completed",
+                progress=100,
+                result=result
+            )
+        else:
+            await self._call(
+                self.store.update,
+                job_id,
+                status=JOB_FAILED,
+                stage="failed",
+                result=result,
+                error=result["error"]
+            )
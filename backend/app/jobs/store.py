@@ -0,0 +1,199 @@
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+
+
+class JobStore(ABC):
+    """Persistence interface for research jobs.
+
+    Jobs are plain dicts with the keys ``job_id``, ``status``, ``stage``,
+    ``progress``, ``request``, ``partial_output``, ``result``, ``error``,
+    ``created_at`` and ``updated_at``.
+    """
+
+    @abstractmethod
+    def create(self, job_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, **fields) -> None:
+        ...
+
+    @abstractmethod
+    def list_unfinished(self) -> List[Dict[str, Any]]:
+        """Jobs left queued or running, e.g. by a previous process."""
+
+    def open(self) -> None:
+        """Acquire resources released by ``close``; the store is usable again afterwards."""
+
+    def close(self) -> None:
+        pass
+
+    @staticmethod
+    def _new_job(job_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "job_id": job_id,
+            "status": JOB_QUEUED,
+            "stage": "queued",
+            "progress": 0,
+            "request": request,
+            "partial_output": None,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+
+class InMemoryJobStore(JobStore):
+    """Non-durable store, handy for tests and single-shot deployments."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        job = self._new_job(job_id, request)
+        with self._lock:
+            self._jobs[job_id] = job
+        return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields, updated_at=time.time())
+
+    def list_unfinished(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                dict(job) for job in self._jobs.values()
+                if job["status"] in (JOB_QUEUED, JOB_RUNNING)
+            ]
+
+
+class SQLiteJobStore(JobStore):
+    """Durable job store backed by a single SQLite file.
+
+    Nothing touches the file until ``open``, which ``JobManager.start`` calls,
+    so building the store (e.g. by importing ``app.main``) has no side effects.
+    """
+
+    _JSON_FIELDS = ("request", "result")
+    _COLUMNS = (
+        "job_id", "status", "stage", "progress", "request", "partial_output",
+        "result", "error", "created_at", "updated_at"
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                return
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            # Calls arrive from the job manager's I/O thread
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    stage TEXT,
+                    progress INTEGER,
+                    request TEXT,
+                    partial_output TEXT,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL,
+                    updated_at REAL
+                )"""
+            )
+            self._conn.commit()
+
+    def create(self, job_id: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        job = self._new_job(job_id, request)
+        row = self._encode(job)
+        with self._lock:
+            self._db().execute(
+                f"INSERT INTO jobs ({', '.join(self._COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in self._COLUMNS)})",
+                [row[column] for column in self._COLUMNS]
+            )
+            self._conn.commit()
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db().execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._decode(row) if row else None
+
+    def update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        fields = self._encode(fields)
+        assignments = ", ".join(f"{column} = ?" for column in fields)
+        with self._lock:
+            self._db().execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                [*fields.values(), job_id]
+            )
+            self._conn.commit()
+
+    def list_unfinished(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM jobs "
+                "WHERE status IN (?, ?) ORDER BY created_at",
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+        return [self._decode(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError(f"Job store {self.path} is not open")
+        return self._conn
+
+    def _encode(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        encoded = dict(fields)
+        for key in self._JSON_FIELDS:
+            if key in encoded and encoded[key] is not None:
+                encoded[key] = json.dumps(encoded[key])
+        return encoded
+
+    def _decode(self, row) -> Dict[str, Any]:
+        job = dict(zip(self._COLUMNS, row))
+        for key in self._JSON_FIELDS:
+            if job[key] is not None:
+                job[key] = json.loads(job[key])
+        return job
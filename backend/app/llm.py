@@ -0,0 +1,31 @@
+import os
+
+from langchain.chat_models import ChatOpenAI
+
+from app.cache.llm_cache import get_llm_cache_store
+from app.transport import get_transport
+
+
+def create_chat_model(model: str = "gpt-3.5-turbo", temperature: float = 0.7, **kwargs) -> ChatOpenAI:
+    """Build a ``ChatOpenAI`` that talks through the shared keep-alive transport.
+
+    Every chat model in the app should come from here so that they all reuse
+    the same connection pool instead of opening their own, and so that
+    repeated identical temperature-0 calls are answered from the LLM
+    response cache. Sampled models (temperature > 0) bypass the cache, as
+    their replies are meant to vary; pass ``cache`` to override.
+    """
+    get_llm_cache_store()
+    api_key = kwargs.pop("openai_api_key", None) or os.getenv('OPENAI_API_KEY')
+    sync_client, async_client = get_transport().openai_clients(api_key)
+    # None uses the global cache; False skips it
+    kwargs.setdefault("cache", None if temperature == 0 else False)
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=api_key,
+        client=sync_client.chat.completions,
+        # Left unset outside an event loop; ChatOpenAI then builds its own
+        async_client=async_client.chat.completions if async_client else None,
+        **kwargs
+    )
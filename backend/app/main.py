@@ -1,11 +1,27 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Literal, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
 from dotenv import load_dotenv
 from pathlib import Path
 
+from app.executor import ResearchExecutor
+from app.jobs import JobManager
+from app.jobs.store import JOB_COMPLETED, JOB_FAILED
+from app.cache import get_answer_cache, get_arxiv_store, get_llm_cache_store, get_search_cache
+from app.prompts import prompt_stats
+from app.registry import get_registry
+from app.ingestion.service import stop_ingestion_service
+from app.retrieval.hybrid import save_corpus
+from app.singleflight import get_tool_flights
+from app.transport import get_transport
+from app import research_service
+
 # ABSOLUTE PATH to .env file - USE THE PATH FROM DEBUG
 env_path = Path(r"C:\Users\wajiz.pk\Documents\agentic-research-rag\.env")
 print(f"🔍 Loading .env from: {env_path}")
@@ -22,10 +38,31 @@ print(f"🔑 API Key: {'✅ FOUND' if api_key else '❌ MISSING'}")
 if api_key:
     print(f"   Key starts with: {api_key[:10]}...")
 
+# Blocking agent runs are dispatched here so the event loop stays responsive
+research_executor = ResearchExecutor.from_env()
+job_manager = JobManager.from_env(research_executor)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared agents and LLM clients, reused by every request
+    if get_registry().warm_up():
+        print("✅ Research agents initialized")
+    research_executor.start()
+    await job_manager.start()
+    yield
+    await job_manager.stop()
+    research_executor.shutdown(wait=False)
+    # Tool results captured during this run survive a restart
+    await asyncio.to_thread(stop_ingestion_service)
+    if await asyncio.to_thread(save_corpus):
+        print("💾 Research corpus saved")
+    await get_transport().aclose()
+
 app = FastAPI(
     title="Research Assistant API",
     description="AI-powered research system",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -40,6 +77,8 @@ class ResearchRequest(BaseModel):
     topic: str
     research_questions: List[str]
     detailed_report: bool = True
+    # "structured" writes the whole report in one JSON-formatted LLM call
+    report_mode: Literal["sections", "structured"] = "sections"
 
 class ResearchResponse(BaseModel):
     success: bool
@@ -49,6 +88,19 @@ class ResearchResponse(BaseModel):
     sources: Optional[List[str]] = None
     error: Optional[str] = None
 
+class JobRequest(ResearchRequest):
+    advanced: bool = False
+
+class JobStatus(BaseModel):
+    job_id: str
+    status: str
+    stage: Optional[str] = None
+    progress: int = 0
+    partial_output: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
 @app.get("/")
 async def root():
     api_key = os.getenv('OPENAI_API_KEY')
@@ -67,6 +119,38 @@ async def health_check():
         "message": "API is ready for research" if api_key else "API key not configured"
     }
 
+def _to_response(topic: str, result: dict) -> ResearchResponse:
+    if not result["success"]:
+        return ResearchResponse(
+            success=False,
+            topic=topic,
+            error=result["error"]
+        )
+    return ResearchResponse(
+        success=True,
+        topic=topic,
+        research_output=result["research_output"],
+        report=result["report"],
+        sources=result["sources"]
+    )
+
+@app.get("/metrics")
+async def metrics():
+    """Worker pool queue depth and throughput."""
+    return {
+        "executor": research_executor.metrics(),
+        "jobs": {"queue_depth": job_manager.queue_depth()},
+        "search_cache": get_search_cache().stats(),
+        "arxiv_store": get_arxiv_store().stats(),
+        "llm_cache": llm_cache.stats() if (llm_cache := get_llm_cache_store()) else None,
+        "answer_cache": answers.stats() if (answers := get_answer_cache()) else None,
+        "coalescing": {
+            "research": research_service.research_flights.stats(),
+            "tools": get_tool_flights().stats()
+        },
+        "prompts": prompt_stats()
+    }
+
 @app.post("/research", response_model=ResearchResponse)
 async def conduct_research(request: ResearchRequest):
     """Conduct standard research."""
@@ -79,40 +163,16 @@ async def conduct_research(request: ResearchRequest):
                 error="OPENAI_API_KEY not found"
             )
         
-        from app.agents.research_agent import ResearchAgent
-        from app.chains.report_generator import ReportGenerator
-        
-        # Use standard mode
-        research_agent = ResearchAgent(advanced_mode=False)
-        report_generator = ReportGenerator()
-        
-        research_result = research_agent.research_topic(
-            request.topic, 
-            request.research_questions
-        )
-        
-        if not research_result["success"]:
-            return ResearchResponse(
-                success=False,
-                topic=request.topic,
-                error=research_result["error"]
-            )
-        
-        report = None
-        if request.detailed_report:
-            report = report_generator.generate_report(
-                request.topic,
-                research_result,
-                request.research_questions
-            )
-        
-        return ResearchResponse(
-            success=True,
-            topic=request.topic,
-            research_output=research_result["research_output"],
-            report=report,
-            sources=research_result.get("sources_used", [])
+        # Identical requests already in flight share that run's result
+        result = await research_service.conduct_research_shared(
+            research_executor,
+            request.topic,
+            request.research_questions,
+            request.detailed_report,
+            advanced=False,
+            report_mode=request.report_mode
         )
+        return _to_response(request.topic, result)
         
     except Exception as e:
         return ResearchResponse(
@@ -133,32 +193,16 @@ async def conduct_advanced_research(request: ResearchRequest):
                 error="OPENAI_API_KEY not found"
             )
         
-        from app.agents.research_agent import MultiStepResearchAgent
-        from app.chains.report_generator import ReportGenerator
-        
-        multi_step_agent = MultiStepResearchAgent()
-        report_generator = ReportGenerator()
-        
-        research_result = multi_step_agent.conduct_research(
+        # Identical requests already in flight share that run's result
+        result = await research_service.conduct_research_shared(
+            research_executor,
             request.topic,
-            request.research_questions
-        )
-        
-        report = None
-        if request.detailed_report:
-            report = report_generator.generate_report(
-                request.topic,
-                research_result,
-                request.research_questions
-            )
-        
-        return ResearchResponse(
-            success=True,
-            topic=request.topic,
-            research_output=research_result.get("research_output", ""),
-            report=report,
-            sources=research_result.get("sources_used", [])
+            request.research_questions,
+            request.detailed_report,
+            advanced=True,
+            report_mode=request.report_mode
         )
+        return _to_response(request.topic, result)
         
     except Exception as e:
         return ResearchResponse(
@@ -166,6 +210,107 @@ async def conduct_advanced_research(request: ResearchRequest):
             topic=request.topic,
             error=str(e)
         )
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/research/stream")
+async def stream_research(request: JobRequest):
+    """Stream agent steps and report sections as Server-Sent Events.
+
+    Emits ``token``, ``thought``, ``tool_call``, ``observation``,
+    ``agent_finish``, ``stage`` and ``section`` events while the run is in
+    progress, then a single ``result`` event carrying the ResearchResponse.
+    """
+    from app.agents.callbacks import ResearchEventHandler
+
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit(event: str, data: dict):
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    async def run() -> ResearchResponse:
+        try:
+            if not os.getenv('OPENAI_API_KEY'):
+                return ResearchResponse(
+                    success=False,
+                    topic=request.topic,
+                    error="OPENAI_API_KEY not found"
+                )
+            result = await research_service.conduct_research(
+                research_executor,
+                request.topic,
+                request.research_questions,
+                request.detailed_report,
+                advanced=request.advanced,
+                report_mode=request.report_mode,
+                progress=lambda stage, percent, _output=None: emit(
+                    "stage", {"stage": stage, "progress": percent}
+                ),
+                callbacks=[ResearchEventHandler(emit)],
+                on_section=lambda name, text: emit("section", {"name": name, "text": text})
+            )
+            return _to_response(request.topic, result)
+        except Exception as e:
+            return ResearchResponse(
+                success=False,
+                topic=request.topic,
+                error=str(e)
+            )
+
+    async def event_stream():
+        task = asyncio.create_task(run())
+        yield _sse("stage", {"stage": "queued", "progress": 0})
+        while not (task.done() and events.empty()):
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                event, data = getter.result()
+                yield _sse(event, data)
+            else:
+                getter.cancel()
+        response = task.result()
+        yield _sse("result", response.model_dump())
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/jobs", response_model=JobStatus, status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a research job and return its id immediately."""
+    if not os.getenv('OPENAI_API_KEY'):
+        raise HTTPException(status_code=503, detail="OPENAI_API_KEY not found")
+    job = await job_manager.submit(request.model_dump())
+    return JobStatus(**job)
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Poll a job's status, progress and partial output."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatus(**job)
+
+@app.get("/jobs/{job_id}/result", response_model=ResearchResponse)
+async def get_job_result(job_id: str):
+    """Fetch the finished ResearchResponse for a job."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    topic = job["request"]["topic"]
+    if job["status"] == JOB_FAILED:
+        return ResearchResponse(
+            success=False,
+            topic=topic,
+            error=job["error"]
+        )
+    if job["status"] != JOB_COMPLETED:
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    return _to_response(topic, job["result"])
     
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,96 @@
+import threading
+from typing import Any, Dict, Optional
+
+from app.context_budget import count_tokens
+
+# Providers only cache prompt prefixes of at least this many tokens (OpenAI: 1024)
+CACHE_MIN_PREFIX_TOKENS = 1024
+
+
+class StablePrompt:
+    """A prompt laid out for provider-side prompt caching.
+
+    Providers reuse the work done on the longest prefix a prompt shares
+    with recent requests, so everything that never changes (instructions,
+    tool descriptions, output format) lives in ``prefix`` and the request's
+    data goes in ``suffix``, a ``str.format`` template always rendered
+    after it. The prefix is used verbatim, braces included.
+
+    ``shared`` is an optional template rendered between the two for data
+    that repeats across the several calls of one request, such as the
+    findings every report section is written from. Those calls then share
+    ``prefix`` plus ``shared`` and differ only in ``suffix``. Nothing is
+    cached below ``CACHE_MIN_PREFIX_TOKENS``, so ``prompt_stats`` reports
+    how often the shared part reached that size.
+    """
+
+    def __init__(self, name: str, prefix: str, suffix: str, shared: str = ""):
+        self.name = name
+        self.prefix = prefix
+        self.shared = shared
+        self.suffix = suffix
+        self._prefix_tokens: Optional[int] = None
+        # The calls of one request render the same shared text; count it once
+        self._last_shared = ("", 0)
+        _prompts[name] = self
+
+    @property
+    def prefix_tokens(self) -> int:
+        if self._prefix_tokens is None:
+            self._prefix_tokens = count_tokens(self.prefix)
+        return self._prefix_tokens
+
+    def _shared_tokens(self, shared: str) -> int:
+        last_text, last_tokens = self._last_shared
+        if shared == last_text:
+            return last_tokens
+        tokens = count_tokens(shared)
+        self._last_shared = (shared, tokens)
+        return tokens
+
+    def render(self, **values: Any) -> str:
+        shared = self.shared.format(**values)
+        text = self.prefix + shared + self.suffix.format(**values)
+        shared_tokens = self.prefix_tokens + self._shared_tokens(shared)
+        with _lock:
+            renders, chars, tokens, cacheable = _renders.get(self.name, (0, 0, 0, 0))
+            _renders[self.name] = (
+                renders + 1,
+                chars + len(text),
+                tokens + shared_tokens,
+                cacheable + (shared_tokens >= CACHE_MIN_PREFIX_TOKENS)
+            )
+        return text
+
+
+_prompts: Dict[str, StablePrompt] = {}
+# name -> (renders, prompt chars, shared prefix tokens, renders with a cacheable prefix)
+_renders: Dict[str, tuple] = {}
+_lock = threading.Lock()
+
+
+def prompt_stats() -> Dict[str, Dict[str, Any]]:
+    """Stable prefix size of every prompt and how much of the rendered prompts it makes up.
+
+    ``prefix_cacheable`` says whether the static prefix alone is long enough
+    for providers to cache; ``cacheable_share`` is the fraction of renders
+    whose static plus shared part was. Counts cover the current process
+    only; agent prompts rendered in a process pool worker are not seen here.
+    """
+    with _lock:
+        renders = dict(_renders)
+    stats = {}
+    for name, prompt in sorted(_prompts.items()):
+        count, chars, shared_tokens, cacheable = renders.get(name, (0, 0, 0, 0))
+        mean_chars = chars / count if count else 0.0
+        stats[name] = {
+            "prefix_chars": len(prompt.prefix),
+            "prefix_tokens": prompt.prefix_tokens,
+            "prefix_cacheable": prompt.prefix_tokens >= CACHE_MIN_PREFIX_TOKENS,
+            "renders": count,
+            "mean_prompt_chars": round(mean_chars, 1),
+            "prefix_share": round(len(prompt.prefix) / mean_chars, 3) if count else None,
+            "mean_shared_prefix_tokens": round(shared_tokens / count, 1) if count else None,
+            "cacheable_share": round(cacheable / count, 3) if count else None,
+        }
+    return stats
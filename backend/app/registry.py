@@ -0,0 +1,69 @@
+import os
+import threading
+from typing import Optional
+
+from app.agents.research_agent import ResearchAgent, MultiStepResearchAgent
+from app.chains.report_generator import ReportGenerator
+from app.transport import get_transport
+
+
+class AgentRegistry:
+    """Process-wide agents and LLM clients shared by every request.
+
+    Building a ``ResearchAgent`` creates a ``ChatOpenAI`` client, the tool
+    instances and an agent executor. None of them hold per-request state, so
+    one instance per mode serves all concurrent requests and keeps the
+    underlying HTTP connection pools warm. Each object is built on first use,
+    which also covers process-pool workers that never ran the app lifespan.
+    """
+
+    def __init__(self):
+        # Reentrant: building a model can replace the transport's async
+        # client, which resets the registry from inside that build
+        self._lock = threading.RLock()
+        self._standard_agent: Optional[ResearchAgent] = None
+        self._multi_step_agent: Optional[MultiStepResearchAgent] = None
+        self._report_generator: Optional[ReportGenerator] = None
+
+    def standard_agent(self) -> ResearchAgent:
+        with self._lock:
+            if self._standard_agent is None:
+                self._standard_agent = ResearchAgent(advanced_mode=False)
+            return self._standard_agent
+
+    def multi_step_agent(self) -> MultiStepResearchAgent:
+        with self._lock:
+            if self._multi_step_agent is None:
+                self._multi_step_agent = MultiStepResearchAgent()
+            return self._multi_step_agent
+
+    def report_generator(self) -> ReportGenerator:
+        with self._lock:
+            if self._report_generator is None:
+                self._report_generator = ReportGenerator()
+            return self._report_generator
+
+    def warm_up(self) -> bool:
+        """Build everything up front; skipped when no API key is configured."""
+        if not os.getenv('OPENAI_API_KEY'):
+            return False
+        self.standard_agent()
+        self.multi_step_agent()
+        self.report_generator()
+        return True
+
+    def reset(self):
+        """Drop the shared instances, e.g. after the API key changes or the transport closes."""
+        with self._lock:
+            self._standard_agent = None
+            self._multi_step_agent = None
+            self._report_generator = None
+
+
+_registry = AgentRegistry()
+# Cached models hold the transport's clients; rebuild them once those close
+get_transport().on_reset(_registry.reset)
+
+
+def get_registry() -> AgentRegistry:
+    return _registry
@@ -0,0 +1,176 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.cache.answer_cache import get_answer_cache
+from app.executor import ResearchExecutor
+from app.registry import get_registry
+from app.singleflight import AsyncSingleFlight
+
+# progress(stage, percent, partial_output)
+ProgressCallback = Callable[[str, int, Optional[str]], None]
+
+research_flights = AsyncSingleFlight()
+
+
+def run_agent(
+    topic: str,
+    research_questions: List[str],
+    advanced: bool = False,
+    callbacks: Optional[list] = None
+) -> Dict[str, Any]:
+    """Run the (blocking) research agent.
+
+    Kept as a module-level function so it can be shipped to either a thread
+    or a process pool by ``ResearchExecutor``. Agents come from the
+    process-wide registry rather than being rebuilt per call.
+    """
+    registry = get_registry()
+    if advanced:
+        return registry.multi_step_agent().conduct_research(
+            topic, research_questions, callbacks=callbacks
+        )
+    return registry.standard_agent().research_topic(
+        topic, research_questions, callbacks=callbacks
+    )
+
+
+async def conduct_research(
+    executor: ResearchExecutor,
+    topic: str,
+    research_questions: List[str],
+    detailed_report: bool = True,
+    advanced: bool = False,
+    report_mode: str = "sections",
+    progress: Optional[ProgressCallback] = None,
+    callbacks: Optional[list] = None,
+    on_section: Optional[Callable[[str, str], None]] = None
+) -> Dict[str, Any]:
+    """Run the agent on the worker pool, then write the report on the event loop.
+
+    ``callbacks`` are LangChain handlers for the agent run and are dropped
+    when the executor uses processes. ``on_section`` sees each report section
+    and ``report_mode`` picks per-section or single-call structured reports.
+
+    A paraphrase of a recently completed request reuses that request's agent
+    output from the semantic answer cache instead of running the agent
+    again, and its report sections when they were written in the same
+    ``report_mode``. Reused sections still go to ``on_section`` and are
+    assembled under this request's topic.
+    """
+    def notify(stage: str, percent: int, partial_output: Optional[str] = None):
+        if progress is not None:
+            progress(stage, percent, partial_output)
+
+    answers = get_answer_cache()
+    variant = "advanced" if advanced else "standard"
+    vector: Optional[np.ndarray] = None
+    cached = None
+    if answers is not None:
+        try:
+            vector = await asyncio.to_thread(answers.embed, topic, research_questions)
+            cached = await asyncio.to_thread(answers.lookup, vector, variant)
+        except Exception as e:
+            print(f"⚠️ Answer cache lookup failed: {e}")
+
+    sections = None
+    if cached is not None:
+        print(f"♻️ Reusing research on '{cached.topic}' (similarity {cached.similarity:.3f})")
+        research_result = cached.result["research"]
+        # Sections written in another report mode are not reused
+        if cached.result.get("report_mode") == report_mode:
+            sections = cached.result.get("sections")
+        notify("cache_hit", 60, research_result.get("research_output", ""))
+    else:
+        notify("researching", 10)
+        research_result = await executor.run(
+            run_agent,
+            topic,
+            research_questions,
+            advanced,
+            # Handlers cannot be pickled into a process pool
+            callbacks=None if executor.use_processes else callbacks
+        )
+
+    if not research_result.get("success"):
+        return {
+            "success": False,
+            "error": research_result.get("error", "Research failed")
+        }
+
+    research_output = research_result.get("research_output", "")
+    notify("research_complete", 60, research_output)
+
+    report = None
+    written = False
+    if detailed_report:
+        generator = get_registry().report_generator()
+        if sections is None:
+            notify("generating_report", 70)
+            sections = await generator.agenerate_sections(
+                topic, research_result, on_section=on_section, mode=report_mode
+            )
+            written = True
+        elif on_section is not None:
+            for name, text in sections.items():
+                on_section(name, text)
+        # Assembled here so a reused report carries this request's topic
+        report = generator.assemble(topic, research_result, sections)
+
+    # Fallback answers are not worth pinning for a whole TTL
+    if vector is not None and research_result.get("mode") != "fallback":
+        entry = {"research": research_result, "sections": sections, "report_mode": report_mode}
+        try:
+            if cached is None:
+                await asyncio.to_thread(answers.put, vector, topic, entry, variant)
+            elif written:
+                await asyncio.to_thread(answers.update, cached.answer_id, entry)
+        except Exception as e:
+            print(f"⚠️ Answer cache update failed: {e}")
+
+    return {
+        "success": True,
+        "research_output": research_output,
+        "report": report,
+        "sources": research_result.get("sources_used", [])
+    }
+
+
+def request_key(
+    topic: str,
+    research_questions: List[str],
+    detailed_report: bool = True,
+    advanced: bool = False,
+    report_mode: str = "sections"
+) -> tuple:
+    """Identity of a research request, ignoring case and whitespace."""
+    def clean(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    questions = tuple(clean(q) for q in research_questions)
+    return clean(topic), questions, detailed_report, advanced, report_mode
+
+
+async def conduct_research_shared(
+    executor: ResearchExecutor,
+    topic: str,
+    research_questions: List[str],
+    detailed_report: bool = True,
+    advanced: bool = False,
+    report_mode: str = "sections"
+) -> Dict[str, Any]:
+    """``conduct_research`` where identical concurrent requests share one run.
+
+    Only for callers that need nothing but the final result: progress,
+    callbacks and section events would reach just the first caller.
+    """
+    key = request_key(topic, research_questions, detailed_report, advanced, report_mode)
+    return await research_flights.do(key, lambda: conduct_research(
+        executor,
+        topic,
+        research_questions,
+        detailed_report,
+        advanced=advanced,
+        report_mode=report_mode
+    ))
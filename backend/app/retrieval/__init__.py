@@ -0,0 +1,24 @@
+# Index modules with a CLI (e.g. arxiv_index) are imported directly
+from .text import tokenize
+from .embeddings import HashingEmbeddings, get_embeddings
+from .hnsw import HNSWIndex
+from .pq import PQIndex, ProductQuantizer
+from .vector_store import FlatIndex, VectorStore, get_corpus_store
+from .sparse import SparseIndex
+from .hybrid import HybridRetriever, get_corpus_retriever, reciprocal_rank_fusion
+
+__all__ = [
+    "tokenize",
+    "HashingEmbeddings",
+    "get_embeddings",
+    "FlatIndex",
+    "HNSWIndex",
+    "PQIndex",
+    "ProductQuantizer",
+    "VectorStore",
+    "get_corpus_store",
+    "SparseIndex",
+    "HybridRetriever",
+    "get_corpus_retriever",
+    "reciprocal_rank_fusion"
+]
@@ -0,0 +1,305 @@
+"""Offline arXiv metadata index with BM25 ranking.
+
+Build an index from the bulk arXiv metadata snapshot (one JSON object per
+line) and query it without touching the network::
+
+    python -m app.retrieval.arxiv_index build arxiv-metadata-oai-snapshot.json data/arxiv_index
+    python -m app.retrieval.arxiv_index search data/arxiv_index "graph neural networks"
+
+Ingestion streams the dump, spilling sorted postings blocks every
+``block_size`` papers and k-way merging them at the end. The index itself is
+flat binary arrays (postings, document lengths, metadata offsets) that are
+memory-mapped at query time, plus a JSON vocabulary of term offsets.
+"""
+import argparse
+import heapq
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.retrieval.text import tokenize
+
+DOC_DTYPE = np.uint32
+TF_DTYPE = np.uint16
+TF_MAX = np.iinfo(TF_DTYPE).max
+
+
+def _published(record: Dict[str, Any]) -> str:
+    versions = record.get("versions") or []
+    if versions and versions[0].get("created"):
+        try:
+            return parsedate_to_datetime(versions[0]["created"]).strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            pass
+    return record.get("update_date", "")
+
+
+def _authors(record: Dict[str, Any]) -> List[str]:
+    parsed = record.get("authors_parsed")
+    if parsed:
+        return [" ".join(part for part in (p[1], p[0]) if part).strip() for p in parsed]
+    return [name.strip() for name in record.get("authors", "").split(",") if name.strip()]
+
+
+def paper_from_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Map a snapshot record to the paper dict used by ``ArxivSearchTool``."""
+    paper_id = record["id"]
+    return {
+        "paper_id": paper_id,
+        "title": " ".join(record.get("title", "").split()),
+        "authors": _authors(record),
+        "summary": " ".join(record.get("abstract", "").split()),
+        "published": _published(record),
+        "pdf_url": f"https://arxiv.org/pdf/{paper_id}",
+    }
+
+
+def _read_records(path: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for count, line in enumerate(f):
+            if limit is not None and count >= limit:
+                return
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _spill_block(postings: Dict[str, List[Tuple[int, int]]], path: Path):
+    """Write one block's postings as a sorted stream of pickled records."""
+    with open(path, "wb") as f:
+        for term in sorted(postings):
+            entries = postings[term]
+            pickle.dump((
+                term,
+                np.fromiter((doc for doc, _ in entries), dtype=DOC_DTYPE, count=len(entries)),
+                np.fromiter((tf for _, tf in entries), dtype=TF_DTYPE, count=len(entries)),
+            ), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _iter_block(path: Path) -> Iterator[Tuple[str, np.ndarray, np.ndarray]]:
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield pickle.load(f)
+            except EOFError:
+                return
+
+
+def build_index(
+    records: Iterable[Dict[str, Any]],
+    index_dir: str,
+    block_size: int = 50_000,
+    k1: float = 1.2,
+    b: float = 0.75,
+    verbose: bool = False
+) -> Dict[str, Any]:
+    """Stream ``records`` into an on-disk BM25 index at ``index_dir``."""
+    out = Path(index_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    spill_dir = Path(tempfile.mkdtemp(prefix="arxiv_blocks_", dir=out))
+    started = time.perf_counter()
+
+    blocks: List[Path] = []
+    postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+    doc_count = 0
+    total_len = 0
+
+    with open(out / "meta.jsonl", "wb") as meta_file, \
+            open(out / "meta_offsets.u64", "wb") as offsets_file, \
+            open(out / "doc_lens.u32", "wb") as lens_file:
+        for record in records:
+            paper = paper_from_record(record)
+            offsets_file.write(np.uint64(meta_file.tell()).tobytes())
+            meta_file.write(json.dumps(paper).encode("utf-8") + b"\n")
+
+            # Title terms count double: they are the strongest topical signal
+            tokens = tokenize(paper["title"]) * 2 + tokenize(paper["summary"])
+            lens_file.write(np.uint32(len(tokens)).tobytes())
+            total_len += len(tokens)
+            for term, tf in Counter(tokens).items():
+                postings[term].append((doc_count, min(tf, TF_MAX)))
+            doc_count += 1
+
+            if doc_count % block_size == 0:
+                blocks.append(spill_dir / f"block_{len(blocks):05d}.bin")
+                _spill_block(postings, blocks[-1])
+                postings.clear()
+                if verbose:
+                    print(f"📦 Indexed {doc_count} papers ({time.perf_counter() - started:.1f}s)")
+
+        if postings:
+            blocks.append(spill_dir / f"block_{len(blocks):05d}.bin")
+            _spill_block(postings, blocks[-1])
+            postings.clear()
+
+    # Blocks hold increasing doc ids, so merging by term keeps postings sorted
+    vocab: Dict[str, List[int]] = {}
+    offset = 0
+    with open(out / "postings_docs.u32", "wb") as docs_file, \
+            open(out / "postings_tfs.u16", "wb") as tfs_file:
+        merged = heapq.merge(*(_iter_block(path) for path in blocks), key=lambda item: item[0])
+        current_term, df = None, 0
+        for term, docs, tfs in merged:
+            if term != current_term:
+                if current_term is not None:
+                    vocab[current_term] = [offset, df]
+                    offset += df
+                current_term, df = term, 0
+            docs_file.write(docs.tobytes())
+            tfs_file.write(tfs.tobytes())
+            df += len(docs)
+        if current_term is not None:
+            vocab[current_term] = [offset, df]
+
+    shutil.rmtree(spill_dir, ignore_errors=True)
+
+    with open(out / "vocab.json", "w", encoding="utf-8") as f:
+        json.dump(vocab, f)
+    stats = {
+        "doc_count": doc_count,
+        "avg_doc_len": total_len / doc_count if doc_count else 0.0,
+        "vocab_size": len(vocab),
+        "k1": k1,
+        "b": b,
+    }
+    with open(out / "index.json", "w", encoding="utf-8") as f:
+        json.dump(stats, f)
+    if verbose:
+        print(f"✅ Index built: {doc_count} papers, {len(vocab)} terms "
+              f"({time.perf_counter() - started:.1f}s)")
+    return stats
+
+
+def _memmap(path: Path, dtype) -> np.ndarray:
+    # np.memmap refuses empty files
+    if path.stat().st_size == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+class ArxivIndex:
+    """Read-only BM25 search over an index written by ``build_index``."""
+
+    def __init__(self, index_dir: str):
+        root = Path(index_dir)
+        with open(root / "index.json", "r", encoding="utf-8") as f:
+            stats = json.load(f)
+        with open(root / "vocab.json", "r", encoding="utf-8") as f:
+            self.vocab: Dict[str, List[int]] = json.load(f)
+        self.doc_count = stats["doc_count"]
+        self.avg_doc_len = stats["avg_doc_len"] or 1.0
+        self.k1 = stats["k1"]
+        self.b = stats["b"]
+
+        self.postings_docs = _memmap(root / "postings_docs.u32", DOC_DTYPE)
+        self.postings_tfs = _memmap(root / "postings_tfs.u16", TF_DTYPE)
+        self.doc_lens = _memmap(root / "doc_lens.u32", np.uint32)
+        self.meta_offsets = _memmap(root / "meta_offsets.u64", np.uint64)
+        self._meta_file = open(root / "meta.jsonl", "rb")
+        self._meta_lock = threading.Lock()
+        # Per-document length normalisation, computed once
+        self._norm = (
+            self.k1 * (1 - self.b + self.b * self.doc_lens.astype(np.float32) / self.avg_doc_len)
+        ).astype(np.float32)
+
+    def search_ids(self, query: str, k: int = 10) -> List[Tuple[int, float]]:
+        """Top-``k`` ``(doc_id, score)`` pairs for ``query``."""
+        doc_parts, score_parts = [], []
+        for term in set(tokenize(query)):
+            entry = self.vocab.get(term)
+            if entry is None:
+                continue
+            offset, df = entry
+            docs = np.asarray(self.postings_docs[offset:offset + df])
+            tfs = np.asarray(self.postings_tfs[offset:offset + df], dtype=np.float32)
+            idf = np.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            doc_parts.append(docs)
+            score_parts.append(idf * tfs * (self.k1 + 1) / (tfs + self._norm[docs]))
+
+        if not doc_parts:
+            return []
+        docs = np.concatenate(doc_parts)
+        unique_docs, inverse = np.unique(docs, return_inverse=True)
+        totals = np.zeros(len(unique_docs), dtype=np.float32)
+        np.add.at(totals, inverse, np.concatenate(score_parts))
+
+        k = min(k, len(unique_docs))
+        top = np.argpartition(-totals, k - 1)[:k]
+        top = top[np.argsort(-totals[top])]
+        return [(int(unique_docs[i]), float(totals[i])) for i in top]
+
+    def paper(self, doc_id: int) -> Dict[str, Any]:
+        with self._meta_lock:
+            self._meta_file.seek(int(self.meta_offsets[doc_id]))
+            return json.loads(self._meta_file.readline())
+
+    def search(self, query: str, k: int = 10) -> List[Dict[str, Any]]:
+        """Top-``k`` paper dicts for ``query``, best first."""
+        return [self.paper(doc_id) for doc_id, _ in self.search_ids(query, k)]
+
+    def close(self):
+        self._meta_file.close()
+
+
+_arxiv_index: Optional[ArxivIndex] = None
+_lock = threading.Lock()
+
+
+def get_arxiv_index() -> ArxivIndex:
+    """Process-wide index opened from ARXIV_INDEX_DIR."""
+    global _arxiv_index
+    with _lock:
+        if _arxiv_index is None:
+            index_dir = os.getenv("ARXIV_INDEX_DIR")
+            if not index_dir:
+                raise ValueError("ARXIV_INDEX_DIR is not set; build an index with "
+                                 "`python -m app.retrieval.arxiv_index build`")
+            _arxiv_index = ArxivIndex(index_dir)
+        return _arxiv_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the offline arXiv index")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index an arXiv metadata snapshot (JSON lines)")
+    build.add_argument("dump")
+    build.add_argument("index_dir")
+    build.add_argument("--block-size", type=int, default=50_000)
+    build.add_argument("--limit", type=int, default=None, help="Only index the first N records")
+
+    search = commands.add_parser("search", help="Run a BM25 query against an index")
+    search.add_argument("index_dir")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=5)
+
+    args = parser.parse_args()
+    if args.command == "build":
+        build_index(
+            _read_records(args.dump, args.limit),
+            args.index_dir,
+            block_size=args.block_size,
+            verbose=True
+        )
+    else:
+        index = ArxivIndex(args.index_dir)
+        started = time.perf_counter()
+        papers = index.search(args.query, args.k)
+        elapsed = (time.perf_counter() - started) * 1000
+        for paper in papers:
+            print(f"{paper['paper_id']}  {paper['published']}  {paper['title']}")
+        print(f"({len(papers)} results in {elapsed:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import hashlib
+import os
+import threading
+from typing import List, Optional
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+from app.retrieval.text import tokenize
+
+
+class HashingEmbeddings(Embeddings):
+    """Deterministic, network-free embeddings from hashed unigrams and bigrams.
+
+    Quality is far below a learned model, but vectors are stable across
+    processes and runs, which makes it the embedding of choice for tests and
+    offline development.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        tokens = tokenize(text)
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` into an L2-normalised ``(len(texts), dim)`` float32 matrix."""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                # Low bits pick the bucket, the top bit picks the sign
+                vectors[row, value % self.dim] += 1.0 if value >> 63 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_array([text])[0].tolist()
+
+
+def embed_array(embeddings: Embeddings, texts: List[str]) -> np.ndarray:
+    """Embed ``texts`` with any LangChain ``Embeddings`` as a float32 matrix."""
+    if isinstance(embeddings, HashingEmbeddings):
+        return embeddings.embed_array(texts)
+    return np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+
+_embeddings: Optional[Embeddings] = None
+# Reentrant for the same reason as the agent registry's lock
+_lock = threading.RLock()
+
+
+def _reset_embeddings():
+    """Drop the OpenAI embeddings once the transport clients they hold close."""
+    global _embeddings
+    with _lock:
+        _embeddings = None
+
+
+def get_embeddings() -> Embeddings:
+    """Process-wide embedding model selected by EMBEDDING_BACKEND.
+
+    ``openai`` (default when an API key is configured) uses OpenAIEmbeddings
+    over the shared transport; ``hashing`` uses ``HashingEmbeddings``.
+    """
+    global _embeddings
+    with _lock:
+        if _embeddings is None:
+            api_key = os.getenv('OPENAI_API_KEY')
+            backend = os.getenv("EMBEDDING_BACKEND", "openai" if api_key else "hashing")
+            if backend == "openai":
+                from langchain.embeddings import OpenAIEmbeddings
+                from app.transport import get_transport
+
+                transport = get_transport()
+                sync_client, async_client = transport.openai_clients(api_key)
+                _embeddings = OpenAIEmbeddings(
+                    openai_api_key=api_key,
+                    client=sync_client.embeddings,
+                    async_client=async_client.embeddings if async_client else None
+                )
+                transport.on_reset(_reset_embeddings)
+            else:
+                _embeddings = HashingEmbeddings(dim=int(os.getenv("EMBEDDING_DIM", "256")))
+        return _embeddings
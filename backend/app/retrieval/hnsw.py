@@ -0,0 +1,226 @@
+import heapq
+import json
+import threading
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from app.retrieval.index_base import SearchHits, VectorBuffer, normalize
+
+# (similarity, node) pairs, best first
+Candidates = List[Tuple[float, int]]
+
+
+class HNSWIndex:
+    """Approximate cosine-similarity index on a Hierarchical Navigable Small World graph.
+
+    Each vector becomes a node on layers ``0..level``, with ``level`` drawn
+    from an exponential distribution, so upper layers are sparse express
+    lanes. Search descends greedily to layer 0 and then runs a beam of width
+    ``ef_search`` over it. Inserts are incremental and use the same search
+    with ``ef_construction``.
+
+    ``M`` bounds the links per node (``2 * M`` on layer 0). Larger ``M`` and
+    ``ef`` values trade memory and latency for recall; ``ef_search`` can be
+    changed at any time.
+    """
+
+    kind = "hnsw"
+
+    def __init__(
+        self,
+        dim: int,
+        M: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 64,
+        seed: int = 42
+    ):
+        self.dim = dim
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.seed = seed
+        self._level_mult = 1 / np.log(max(M, 2))
+        self._rng = np.random.default_rng(seed)
+        self._buffer = VectorBuffer(dim)
+        self.ids: List[str] = []
+        # _links[node][layer] is the node's neighbour list on that layer
+        self._links: List[List[List[int]]] = []
+        self._entry = -1
+        self._max_level = -1
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._buffer.rows
+
+    def _similarities(self, query: np.ndarray, nodes: List[int]) -> List[float]:
+        return (self._buffer.rows[nodes] @ query).tolist()
+
+    def _search_layer(self, query: np.ndarray, entry: List[int], ef: int, layer: int) -> Candidates:
+        """Beam search of width ``ef`` over one layer, best first."""
+        visited = set(entry)
+        scored = list(zip(self._similarities(query, entry), entry))
+        candidates = [(-sim, node) for sim, node in scored]
+        heapq.heapify(candidates)
+        results = heapq.nlargest(ef, scored)
+        heapq.heapify(results)
+
+        while candidates:
+            neg_sim, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_sim < results[0][0]:
+                break
+            fresh = [n for n in self._links[node][layer] if n not in visited]
+            if not fresh:
+                continue
+            visited.update(fresh)
+            for sim, neighbour in zip(self._similarities(query, fresh), fresh):
+                if len(results) < ef or sim > results[0][0]:
+                    heapq.heappush(candidates, (-sim, neighbour))
+                    heapq.heappush(results, (sim, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted(results, reverse=True)
+
+    def _select_neighbours(self, candidates: Candidates, m: int) -> List[int]:
+        """Prefer candidates closer to the base than to any already selected.
+
+        This keeps links spread across directions instead of all pointing into
+        one cluster; remaining slots are filled with the closest leftovers.
+        """
+        if len(candidates) <= m:
+            return [node for _, node in candidates]
+        nodes = [node for _, node in candidates]
+        block = self._buffer.rows[nodes]
+        # One matrix product up front; the greedy pass then only reads floats
+        pairwise = (block @ block.T).tolist()
+        selected: List[int] = []
+        skipped: List[int] = []
+        for i, (sim, _) in enumerate(candidates):
+            if len(selected) >= m:
+                break
+            row = pairwise[i]
+            if all(row[j] < sim for j in selected):
+                selected.append(i)
+            else:
+                skipped.append(i)
+        return [nodes[i] for i in selected + skipped[:m - len(selected)]]
+
+    def _insert(self, node: int):
+        vector = self._buffer.rows[node]
+        level = int(-np.log(1.0 - self._rng.random()) * self._level_mult)
+        self._links.append([[] for _ in range(level + 1)])
+        if self._entry < 0:
+            self._entry, self._max_level = node, level
+            return
+
+        entry = [self._entry]
+        for layer in range(self._max_level, level, -1):
+            entry = [self._search_layer(vector, entry, 1, layer)[0][1]]
+
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(vector, entry, self.ef_construction, layer)
+            max_links = 2 * self.M if layer == 0 else self.M
+            neighbours = self._select_neighbours(candidates, self.M)
+            self._links[node][layer] = neighbours
+            for neighbour in neighbours:
+                links = self._links[neighbour][layer]
+                links.append(node)
+                if len(links) > max_links:
+                    sims = self._similarities(self._buffer.rows[neighbour], links)
+                    ranked = sorted(zip(sims, links), reverse=True)
+                    self._links[neighbour][layer] = self._select_neighbours(ranked, max_links)
+            entry = [n for _, n in candidates]
+
+        if level > self._max_level:
+            self._entry, self._max_level = node, level
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        vectors = normalize(vectors)
+        with self._lock:
+            positions = self._buffer.append(vectors)
+            self.ids.extend(ids)
+            for node in positions:
+                self._insert(node)
+
+    def search(self, queries: np.ndarray, k: int = 5) -> SearchHits:
+        queries = normalize(queries)
+        hits: SearchHits = []
+        with self._lock:
+            for query in queries:
+                if self._entry < 0:
+                    hits.append([])
+                    continue
+                entry = [self._entry]
+                for layer in range(self._max_level, 0, -1):
+                    entry = [self._search_layer(query, entry, 1, layer)[0][1]]
+                found = self._search_layer(query, entry, max(self.ef_search, k), 0)[:k]
+                hits.append([(self.ids[node], sim) for sim, node in found])
+        return hits
+
+    def save(self, path: str):
+        out = Path(path)
+        out.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._buffer.save(out / "vectors.f32")
+            # Flatten the graph: one offsets entry per (node, layer), in order
+            levels = np.fromiter((len(layers) - 1 for layers in self._links), dtype=np.int32,
+                                 count=len(self._links))
+            lists = [links for layers in self._links for links in layers]
+            offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+            np.cumsum([len(links) for links in lists], out=offsets[1:])
+            neighbours = np.fromiter((n for links in lists for n in links), dtype=np.int32,
+                                     count=int(offsets[-1]))
+            np.save(out / "levels.npy", levels)
+            np.save(out / "link_offsets.npy", offsets)
+            np.save(out / "links.npy", neighbours)
+            with open(out / "ids.json", "w", encoding="utf-8") as f:
+                json.dump(self.ids, f)
+            with open(out / "index.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "kind": self.kind,
+                    "dim": self.dim,
+                    "count": len(self._buffer),
+                    "M": self.M,
+                    "ef_construction": self.ef_construction,
+                    "ef_search": self.ef_search,
+                    "seed": self.seed,
+                    "entry": self._entry,
+                    "max_level": self._max_level,
+                }, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "HNSWIndex":
+        root = Path(path)
+        with open(root / "index.json", "r", encoding="utf-8") as f:
+            info = json.load(f)
+        index = cls(
+            info["dim"],
+            M=info["M"],
+            ef_construction=info["ef_construction"],
+            ef_search=info["ef_search"],
+            seed=info["seed"]
+        )
+        with open(root / "ids.json", "r", encoding="utf-8") as f:
+            index.ids = json.load(f)
+        index._buffer = VectorBuffer.load(root / "vectors.f32", info["dim"], info["count"], mmap)
+
+        levels = np.load(root / "levels.npy")
+        offsets = np.load(root / "link_offsets.npy").tolist()
+        neighbours = np.load(root / "links.npy").tolist()
+        slot = 0
+        for level in levels.tolist():
+            layers = []
+            for _ in range(level + 1):
+                layers.append(neighbours[offsets[slot]:offsets[slot + 1]])
+                slot += 1
+            index._links.append(layers)
+        index._entry = info["entry"]
+        index._max_level = info["max_level"]
+        # Keep level draws for later inserts independent of the saved ones
+        index._rng = np.random.default_rng([info["seed"], info["count"]])
+        return index
@@ -0,0 +1,182 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain.embeddings.base import Embeddings
+
+from app.retrieval.sparse import SparseIndex
+from app.retrieval.vector_store import FlatIndex, VectorStore, corpus_dir, get_corpus_store
+
+SEARCH_MODES = ("hybrid", "sparse", "dense")
+
+# Sparse and dense lookups of one query run side by side on this pool;
+# the dense side usually waits on a remote embedding call.
+_search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="hybrid-search")
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: ``score(d) = sum_i w_i / (k + rank_i(d))``.
+
+    Only ranks are used, so BM25 and cosine scores never need to be put on
+    a common scale.
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, chunk_id in enumerate(ranking, start=1):
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + weight / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever:
+    """BM25 and dense retrieval over the same chunk ids, fused with RRF.
+
+    Texts are added to both a ``SparseIndex`` and the ``VectorStore``; the
+    sparse side is rebuilt from the docstore on load, so only the vector
+    store is persisted. Each side contributes its best ``candidates`` ids.
+    """
+
+    def __init__(
+        self,
+        store: VectorStore,
+        sparse: Optional[SparseIndex] = None,
+        rrf_k: int = 60,
+        candidates: int = 20
+    ):
+        self.store = store
+        self.sparse = sparse or SparseIndex()
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.dirty = False
+        self._lock = threading.Lock()
+        # One writer keeps background inserts ordered and off the callers' path
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hybrid-writer")
+        if len(self.sparse) == 0 and store.docs:
+            docs = list(store.docs.values())
+            self.sparse.add([doc["id"] for doc in docs], [doc["text"] for doc in docs])
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def add_texts(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """Index ``texts`` in both indexes, skipping ids that are already present."""
+        metadatas = metadatas or [{} for _ in texts]
+        with self._lock:
+            if ids is None:
+                start = len(self.store)
+                ids = [f"chunk-{start + i}" for i in range(len(texts))]
+            fresh = [
+                (chunk_id, text, metadata)
+                for chunk_id, text, metadata in zip(ids, texts, metadatas)
+                if chunk_id not in self.store.docs
+            ]
+            if not fresh:
+                return []
+            new_ids, new_texts, new_metadatas = map(list, zip(*fresh))
+            self.store.add_texts(new_texts, metadatas=new_metadatas, ids=new_ids)
+            self.sparse.add(new_ids, new_texts)
+            self.dirty = True
+        return new_ids
+
+    def submit(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None
+    ):
+        """Queue ``add_texts`` on the background writer; errors are logged, not raised."""
+        def _add():
+            try:
+                self.add_texts(texts, metadatas, ids)
+            except Exception as e:
+                print(f"⚠️ Failed to index {len(texts)} texts into the corpus: {e}")
+        return self._writer.submit(_add)
+
+    def flush(self):
+        """Wait for queued background inserts to finish."""
+        self._writer.submit(lambda: None).result()
+
+    def _dense(self, query: str, k: int) -> List[str]:
+        return [hit["id"] for hit in self.store.similarity_search(query, k)]
+
+    def _sparse(self, query: str, k: int) -> List[str]:
+        return [chunk_id for chunk_id, _ in self.sparse.search(query, k)]
+
+    def search(self, query: str, k: int = 5, mode: str = "hybrid") -> List[Dict[str, Any]]:
+        """Top-``k`` chunk dicts (text, metadata, score) for ``query``.
+
+        ``mode`` is ``hybrid`` (RRF of both), ``sparse`` or ``dense``.
+        """
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}; expected one of {SEARCH_MODES}")
+        if len(self.store) == 0:
+            return []
+        depth = max(self.candidates, k)
+        if mode == "sparse":
+            ranked = self.sparse.search(query, k)
+        elif mode == "dense":
+            ranked = [(hit["id"], hit["score"]) for hit in self.store.similarity_search(query, k)]
+        else:
+            dense = _search_pool.submit(self._dense, query, depth)
+            sparse = self._sparse(query, depth)
+            ranked = reciprocal_rank_fusion([sparse, dense.result()], k=self.rrf_k)[:k]
+        return [dict(self.store.docs[chunk_id], score=score) for chunk_id, score in ranked]
+
+    def save(self, path: str):
+        self.flush()
+        with self._lock:
+            self.store.save(path)
+            self.dirty = False
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        embeddings: Embeddings,
+        index_factory: Callable[[int], Any] = FlatIndex
+    ) -> "HybridRetriever":
+        return cls(VectorStore.load(path, embeddings, index_factory=index_factory))
+
+
+_corpus_retriever: Optional[HybridRetriever] = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus_retriever() -> HybridRetriever:
+    """Process-wide hybrid retriever over the research corpus."""
+    global _corpus_retriever
+    with _corpus_lock:
+        if _corpus_retriever is None:
+            _corpus_retriever = HybridRetriever(get_corpus_store())
+        return _corpus_retriever
+
+
+def corpus_available() -> bool:
+    """Whether the corpus holds documents, loaded or saved in CORPUS_DIR, without loading it."""
+    with _corpus_lock:
+        retriever = _corpus_retriever
+    if retriever is not None and len(retriever) > 0:
+        return True
+    return (corpus_dir() / "docstore.jsonl").exists()
+
+
+def save_corpus() -> bool:
+    """Persist the corpus to CORPUS_DIR if anything was added; returns whether it saved."""
+    with _corpus_lock:
+        retriever = _corpus_retriever
+    if retriever is None:
+        return False
+    retriever.flush()
+    if not retriever.dirty:
+        return False
+    retriever.save(str(corpus_dir()))
+    return True
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# (chunk id, similarity) pairs for each query row
+SearchHits = List[List[Tuple[str, float]]]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Row-wise L2 normalisation into a new contiguous float32 matrix."""
+    vectors = np.ascontiguousarray(np.atleast_2d(vectors), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the ``k`` best scores in each row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+class VectorBuffer:
+    """Growable row-major matrix that can be backed by a read-only memmap.
+
+    Rows are appended into spare capacity that grows geometrically. A buffer
+    loaded with ``mmap=True`` is copied into RAM on the first append.
+    """
+
+    def __init__(self, dim: int, dtype=np.float32):
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self._data = np.zeros((0, dim), dtype=self.dtype)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._data[:self.count]
+
+    def append(self, vectors: np.ndarray) -> range:
+        """Append rows and return their positions."""
+        needed = self.count + len(vectors)
+        if needed > self._data.shape[0] or not self._data.flags.writeable:
+            capacity = max(needed, 2 * self._data.shape[0], 1024)
+            grown = np.zeros((capacity, self.dim), dtype=self.dtype)
+            grown[:self.count] = self._data[:self.count]
+            self._data = grown
+        self._data[self.count:needed] = vectors
+        start, self.count = self.count, needed
+        return range(start, needed)
+
+    def save(self, path: Path):
+        # Write beside and swap in, so a memmap of the old file stays valid
+        tmp = path.with_name(path.name + ".tmp")
+        self.rows.tofile(tmp)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        dim: int,
+        count: int,
+        mmap: bool = True,
+        dtype=np.float32
+    ) -> "VectorBuffer":
+        buffer = cls(dim, dtype)
+        if count:
+            if mmap:
+                buffer._data = np.memmap(path, dtype=buffer.dtype, mode="r", shape=(count, dim))
+            else:
+                buffer._data = np.fromfile(path, dtype=buffer.dtype, count=count * dim).reshape(count, dim)
+        buffer.count = count
+        return buffer
+
+
+class VectorFile:
+    """Append-only float32 rows kept in a file and read through a memmap.
+
+    Unlike ``VectorBuffer`` nothing is held in RAM, so the page cache decides
+    what stays resident. Without a ``path`` rows go to a temporary file that
+    is removed with the object; ``save`` copies them to a permanent location.
+    """
+
+    def __init__(self, dim: int, path: Optional[Path] = None, count: int = 0):
+        self.dim = dim
+        self.count = count
+        if path is None:
+            fd, name = tempfile.mkstemp(prefix="vectors_", suffix=".f32")
+            os.close(fd)
+            path = Path(name)
+            weakref.finalize(self, _remove_file, name)
+        self.path = Path(path)
+        self.path.touch(exist_ok=True)
+        self._map: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def _row_bytes(self) -> int:
+        return self.dim * np.dtype(np.float32).itemsize
+
+    @property
+    def rows(self) -> np.ndarray:
+        if self.count == 0:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if self._map is None or len(self._map) != self.count:
+            self._map = np.memmap(self.path, dtype=np.float32, mode="r", shape=(self.count, self.dim))
+        return self._map
+
+    def append(self, vectors: np.ndarray) -> range:
+        """Append rows and return their positions."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        # Seek rather than append: a loaded file may hold rows past ``count``
+        with open(self.path, "r+b") as f:
+            f.seek(self.count * self._row_bytes)
+            f.write(vectors.tobytes())
+        start, self.count = self.count, self.count + len(vectors)
+        return range(start, self.count)
+
+    def save(self, path: Path):
+        if path.exists() and os.path.samefile(path, self.path):
+            os.truncate(path, self.count * self._row_bytes)
+            return
+        tmp = path.with_name(path.name + ".tmp")
+        self.rows.tofile(tmp)
+        os.replace(tmp, path)
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
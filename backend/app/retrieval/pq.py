@@ -0,0 +1,255 @@
+import json
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from app.retrieval.index_base import SearchHits, VectorBuffer, VectorFile, normalize, top_k
+
+CODE_DTYPE = np.uint8
+CENTROIDS = 256  # one uint8 code per subspace
+MAX_TRAIN_ROWS = 32_768  # ~128 points per centroid is plenty
+
+
+def default_subspaces(dim: int) -> int:
+    """Largest divisor of ``dim`` no bigger than ``dim // 8`` (32x compression)."""
+    for m in range(max(dim // 8, 1), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def _kmeans(data: np.ndarray, k: int, iterations: int, rng: np.random.Generator) -> np.ndarray:
+    """Lloyd's k-means; empty clusters are re-seeded from random points."""
+    centroids = data[rng.choice(len(data), size=k, replace=False)].copy()
+    for _ in range(iterations):
+        # argmin ||x - c||^2 == argmax (2 x.c - ||c||^2)
+        assign = np.argmax(data @ (2 * centroids.T) - (centroids ** 2).sum(axis=1), axis=1)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.stack([
+            np.bincount(assign, weights=data[:, d], minlength=k) for d in range(data.shape[1])
+        ], axis=1)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = data[rng.choice(len(data), size=len(empty), replace=False)]
+    return centroids
+
+
+class ProductQuantizer:
+    """Product-quantization codec: ``m`` subspaces, 256 centroids each.
+
+    A ``dim``-float vector is stored as ``m`` uint8 codes, i.e. ``4 * dim / m``
+    times smaller. Queries are never quantised: ``distance_tables`` scores a
+    query against every centroid once, after which any code is scored with
+    ``m`` table lookups (asymmetric distance computation).
+    """
+
+    def __init__(self, dim: int, m: Optional[int] = None):
+        m = m or default_subspaces(dim)
+        if dim % m:
+            raise ValueError(f"dim {dim} is not divisible into {m} subspaces")
+        self.dim = dim
+        self.m = m
+        self.sub_dim = dim // m
+        self.codebooks: Optional[np.ndarray] = None  # (m, centroids, sub_dim)
+
+    @property
+    def trained(self) -> bool:
+        return self.codebooks is not None
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors.reshape(len(vectors), self.m, self.sub_dim)
+
+    def train(self, vectors: np.ndarray, iterations: int = 20, seed: int = 0):
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        k = min(CENTROIDS, len(vectors))
+        rng = np.random.default_rng(seed)
+        parts = self._split(vectors)
+        self.codebooks = np.stack([
+            _kmeans(np.ascontiguousarray(parts[:, j]), k, iterations, rng) for j in range(self.m)
+        ]).astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        parts = self._split(np.ascontiguousarray(vectors, dtype=np.float32))
+        codes = np.empty((len(vectors), self.m), dtype=CODE_DTYPE)
+        for j, codebook in enumerate(self.codebooks):
+            sims = np.ascontiguousarray(parts[:, j]) @ (2 * codebook.T) - (codebook ** 2).sum(axis=1)
+            codes[:, j] = np.argmax(sims, axis=1)
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        return self.codebooks[np.arange(self.m), codes].reshape(len(codes), self.dim)
+
+    def distance_tables(self, queries: np.ndarray) -> np.ndarray:
+        """Inner products of each query subvector with each centroid: ``(q, m, 256)``."""
+        return np.einsum("qmd,mkd->qmk", self._split(queries), self.codebooks)
+
+    def scores(self, table: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        """Approximate inner products of one query (via its table) with every code.
+
+        ``columns`` is the code matrix transposed to ``(m, n)``; a contiguous
+        gather per subspace is several times faster than one 2-D fancy index.
+        """
+        out = np.zeros(columns.shape[1], dtype=np.float32)
+        for j in range(self.m):
+            out += table[j].take(columns[j])
+        return out
+
+
+class PQIndex:
+    """Compressed cosine-similarity index: PQ codes in RAM, full vectors on disk.
+
+    Candidates are ranked by asymmetric distance over the codes, then the
+    best ``rerank`` of them are re-scored exactly against the float32
+    vectors, which live in a memory-mapped file and are only paged in for
+    those rows. ``rerank=0`` returns the approximate scores as is.
+
+    The codebooks are trained once ``train_size`` vectors have arrived;
+    until then search is exact over the stored vectors.
+    """
+
+    kind = "pq"
+
+    def __init__(
+        self,
+        dim: int,
+        m: Optional[int] = None,
+        rerank: int = 100,
+        train_size: int = 4096,
+        seed: int = 0,
+        vectors_path: Optional[str] = None
+    ):
+        self.dim = dim
+        self.quantizer = ProductQuantizer(dim, m)
+        self.rerank = rerank
+        self.train_size = train_size
+        self.seed = seed
+        self._vectors = VectorFile(dim, Path(vectors_path) if vectors_path else None)
+        self._codes = VectorBuffer(self.quantizer.m, CODE_DTYPE)
+        self._columns: Optional[np.ndarray] = None  # codes transposed for scanning
+        self.ids: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors.rows
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._codes.rows
+
+    @property
+    def compression(self) -> float:
+        """In-RAM bytes per vector relative to float32."""
+        return 4 * self.dim / self.quantizer.m
+
+    def train(self, sample: Optional[np.ndarray] = None, iterations: int = 20):
+        """Train codebooks on ``sample`` (default: the stored vectors) and re-encode."""
+        with self._lock:
+            self._train(sample, iterations)
+
+    def _train(self, sample: Optional[np.ndarray], iterations: int = 20):
+        rows = self._vectors.rows
+        if sample is None:
+            picked = np.random.default_rng(self.seed).permutation(len(rows))[:MAX_TRAIN_ROWS]
+            sample = rows[np.sort(picked)]
+        self.quantizer.train(normalize(sample), iterations, self.seed)
+        self._codes = VectorBuffer(self.quantizer.m, CODE_DTYPE)
+        self._columns = None
+        # Encode in slices so the float rows never all sit in RAM at once
+        for start in range(0, len(rows), 65536):
+            self._codes.append(self.quantizer.encode(rows[start:start + 65536]))
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        vectors = normalize(vectors)
+        with self._lock:
+            self._vectors.append(vectors)
+            self.ids.extend(ids)
+            if self.quantizer.trained:
+                self._codes.append(self.quantizer.encode(vectors))
+                self._columns = None
+            elif len(self._vectors) >= self.train_size:
+                self._train(None)
+
+    def search(self, queries: np.ndarray, k: int = 5) -> SearchHits:
+        queries = normalize(queries)
+        with self._lock:
+            vectors, ids = self._vectors.rows, self.ids
+            trained = self.quantizer.trained
+            if trained and self._columns is None:
+                self._columns = np.ascontiguousarray(self._codes.rows.T)
+            columns = self._columns
+        if len(ids) == 0:
+            return [[] for _ in range(len(queries))]
+        if not trained:
+            scores = queries @ vectors.T
+            top = top_k(scores, k)
+            return [[(ids[c], float(scores[r, c])) for c in top[r]] for r in range(len(top))]
+
+        hits: SearchHits = []
+        tables = self.quantizer.distance_tables(queries)
+        for query, table in zip(queries, tables):
+            approx = self.quantizer.scores(table, columns)
+            depth = max(self.rerank, k) if self.rerank else k
+            candidates = top_k(approx[None, :], depth)[0]
+            if self.rerank:
+                # Sorted row order keeps memmap reads sequential
+                rows = np.sort(candidates)
+                exact = np.asarray(vectors[rows] @ query)
+                order = top_k(exact[None, :], k)[0]
+                hits.append([(ids[rows[i]], float(exact[i])) for i in order])
+            else:
+                hits.append([(ids[i], float(approx[i])) for i in candidates])
+        return hits
+
+    def save(self, path: str):
+        out = Path(path)
+        out.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._vectors.save(out / "vectors.f32")
+            self._codes.save(out / "codes.u8")
+            if self.quantizer.trained:
+                np.save(out / "codebooks.npy", self.quantizer.codebooks)
+            with open(out / "ids.json", "w", encoding="utf-8") as f:
+                json.dump(self.ids, f)
+            with open(out / "index.json", "w", encoding="utf-8") as f:
+                json.dump({
+                    "kind": self.kind,
+                    "dim": self.dim,
+                    "count": len(self._vectors),
+                    "m": self.quantizer.m,
+                    "rerank": self.rerank,
+                    "train_size": self.train_size,
+                    "seed": self.seed,
+                    "trained": self.quantizer.trained,
+                }, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "PQIndex":
+        """Load codes into RAM; the full vectors stay memory-mapped (``mmap`` is implied)."""
+        root = Path(path)
+        with open(root / "index.json", "r", encoding="utf-8") as f:
+            info = json.load(f)
+        index = cls(
+            info["dim"],
+            m=info["m"],
+            rerank=info["rerank"],
+            train_size=info["train_size"],
+            seed=info["seed"],
+            vectors_path=str(root / "vectors.f32")
+        )
+        index._vectors.count = info["count"]
+        with open(root / "ids.json", "r", encoding="utf-8") as f:
+            index.ids = json.load(f)
+        if info["trained"]:
+            index.quantizer.codebooks = np.load(root / "codebooks.npy")
+            index._codes = VectorBuffer.load(
+                root / "codes.u8", index.quantizer.m, info["count"], mmap=False, dtype=CODE_DTYPE
+            )
+        return index
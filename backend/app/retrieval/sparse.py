@@ -0,0 +1,79 @@
+import threading
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.retrieval.text import tokenize
+
+
+class SparseIndex:
+    """Incremental in-memory BM25 inverted index over chunk ids.
+
+    Postings grow as plain lists and are converted to arrays lazily, once
+    per term per batch of inserts, so scoring stays vectorised the same way
+    as ``ArxivIndex.search_ids``.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self._doc_lens: List[int] = []
+        self._total_len = 0
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._norm = np.zeros(0, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]):
+        with self._lock:
+            for chunk_id, text in zip(ids, texts):
+                doc = len(self.ids)
+                tokens = tokenize(text)
+                self.ids.append(chunk_id)
+                self._doc_lens.append(len(tokens))
+                self._total_len += len(tokens)
+                for term, tf in Counter(tokens).items():
+                    docs, tfs = self._postings.setdefault(term, ([], []))
+                    docs.append(doc)
+                    tfs.append(tf)
+                    self._arrays.pop(term, None)
+            # Document length normalisation depends on the corpus average
+            lens = np.asarray(self._doc_lens, dtype=np.float32)
+            avg = self._total_len / len(lens) if len(lens) else 1.0
+            self._norm = self.k1 * (1 - self.b + self.b * lens / (avg or 1.0))
+
+    def _term_arrays(self, term: str):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            docs, tfs = self._postings[term]
+            arrays = (np.asarray(docs, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top-``k`` ``(chunk id, BM25 score)`` pairs for ``query``."""
+        with self._lock:
+            doc_count = len(self.ids)
+            doc_parts, score_parts = [], []
+            for term in set(tokenize(query)):
+                if term not in self._postings:
+                    continue
+                docs, tfs = self._term_arrays(term)
+                idf = np.log(1 + (doc_count - len(docs) + 0.5) / (len(docs) + 0.5))
+                doc_parts.append(docs)
+                score_parts.append(idf * tfs * (self.k1 + 1) / (tfs + self._norm[docs]))
+            ids = self.ids
+
+        if not doc_parts:
+            return []
+        unique_docs, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(score_parts))
+        k = min(k, len(unique_docs))
+        top = np.argpartition(-totals, k - 1)[:k]
+        top = top[np.argsort(-totals[top])]
+        return [(ids[unique_docs[i]], float(totals[i])) for i in top]
@@ -0,0 +1,24 @@
+import re
+from typing import List
+
+STOP_WORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no
+nor not now of off on once only or other our ours ourselves out over own same
+she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your yours yourself
+yourselves via using based also paper
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[+#]+)?")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric terms with stop words and single characters removed."""
+    return [
+        token for token in _TOKEN.findall(text.lower())
+        if len(token) > 1 and token not in STOP_WORDS
+    ]
@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+from langchain.embeddings.base import Embeddings
+
+from app.retrieval.embeddings import embed_array, get_embeddings
+from app.retrieval.hnsw import HNSWIndex
+from app.retrieval.index_base import SearchHits, VectorBuffer, normalize, top_k
+from app.retrieval.pq import PQIndex
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parents[2] / "data" / "corpus"
+
+
+class FlatIndex:
+    """Exact cosine-similarity index over a contiguous float32 matrix.
+
+    Vectors are L2-normalised on insert, so a batch of queries is scored
+    with a single matrix multiply. Rows live in a growable buffer, and a
+    saved index is memory-mapped on load instead of read into RAM.
+
+    Every index type exposes ``add``, ``search``, ``save``, ``load`` and
+    ``len()`` so ``VectorStore`` can use them interchangeably.
+    """
+
+    kind = "flat"
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._buffer = VectorBuffer(dim)
+        self.ids: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._buffer.rows
+
+    def add(self, ids: Sequence[str], vectors: np.ndarray):
+        vectors = normalize(vectors)
+        with self._lock:
+            self._buffer.append(vectors)
+            self.ids.extend(ids)
+
+    def search(self, queries: np.ndarray, k: int = 5) -> SearchHits:
+        with self._lock:
+            matrix, ids = self._buffer.rows, self.ids
+        if len(ids) == 0:
+            return [[] for _ in range(len(queries))]
+        scores = normalize(queries) @ matrix.T
+        top = top_k(scores, k)
+        return [
+            [(ids[col], float(scores[row, col])) for col in top[row]]
+            for row in range(len(top))
+        ]
+
+    def save(self, path: str):
+        out = Path(path)
+        out.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._buffer.save(out / "vectors.f32")
+            with open(out / "ids.json", "w", encoding="utf-8") as f:
+                json.dump(self.ids, f)
+            with open(out / "index.json", "w", encoding="utf-8") as f:
+                json.dump({"kind": self.kind, "dim": self.dim, "count": len(self._buffer)}, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "FlatIndex":
+        root = Path(path)
+        with open(root / "index.json", "r", encoding="utf-8") as f:
+            info = json.load(f)
+        index = cls(info["dim"])
+        with open(root / "ids.json", "r", encoding="utf-8") as f:
+            index.ids = json.load(f)
+        index._buffer = VectorBuffer.load(root / "vectors.f32", info["dim"], info["count"], mmap)
+        return index
+
+
+INDEX_TYPES: Dict[str, Any] = {
+    FlatIndex.kind: FlatIndex,
+    HNSWIndex.kind: HNSWIndex,
+    PQIndex.kind: PQIndex,
+}
+
+
+def load_index(path: str):
+    """Load any registered index type from ``path``."""
+    with open(Path(path) / "index.json", "r", encoding="utf-8") as f:
+        kind = json.load(f)["kind"]
+    return INDEX_TYPES[kind].load(path)
+
+
+class VectorStore:
+    """Chunk texts and metadata plus a vector index over their embeddings.
+
+    ``index_factory(dim)`` builds the index the first time vectors arrive,
+    since the dimension of a remote embedding model is only known then.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        index_factory: Callable[[int], Any] = FlatIndex,
+        index=None
+    ):
+        self.embeddings = embeddings
+        self.index_factory = index_factory
+        self.index = index
+        self.docs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    def add_texts(
+        self,
+        texts: List[str],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        ids: Optional[List[str]] = None,
+        vectors: Optional[np.ndarray] = None
+    ) -> List[str]:
+        """Embed (unless ``vectors`` is given) and index ``texts``."""
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        with self._lock:
+            start = len(self.docs)
+            ids = ids or [f"chunk-{start + i}" for i in range(len(texts))]
+        if vectors is None:
+            vectors = embed_array(self.embeddings, texts)
+        with self._lock:
+            if self.index is None:
+                self.index = self.index_factory(vectors.shape[1])
+            # Docs go in first so no search can return an id without its chunk
+            for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                self.docs[chunk_id] = {"id": chunk_id, "text": text, "metadata": metadata}
+            self.index.add(ids, vectors)
+        return ids
+
+    def search_by_vectors(self, queries: np.ndarray, k: int = 5) -> List[List[Dict[str, Any]]]:
+        # Serialised with add_texts: the indexes are not safe to read mid-insert
+        with self._lock:
+            if self.index is None or len(self.index) == 0:
+                return [[] for _ in range(len(queries))]
+            return [
+                [dict(self.docs[chunk_id], score=score) for chunk_id, score in hits]
+                for hits in self.index.search(queries, k)
+            ]
+
+    def similarity_search(self, query: str, k: int = 5) -> List[Dict[str, Any]]:
+        """Top-``k`` chunks for ``query`` as dicts with text, metadata and score."""
+        return self.search_by_vectors(embed_array(self.embeddings, [query]), k)[0]
+
+    def save(self, path: str):
+        out = Path(path)
+        out.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            if self.index is not None:
+                self.index.save(str(out / "index"))
+            with open(out / "docstore.jsonl", "w", encoding="utf-8") as f:
+                for doc in self.docs.values():
+                    f.write(json.dumps(doc) + "\n")
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        embeddings: Embeddings,
+        index_factory: Callable[[int], Any] = FlatIndex
+    ) -> "VectorStore":
+        root = Path(path)
+        index = load_index(str(root / "index")) if (root / "index" / "index.json").exists() else None
+        store = cls(embeddings, index_factory=index_factory, index=index)
+        with open(root / "docstore.jsonl", "r", encoding="utf-8") as f:
+            for line in f:
+                doc = json.loads(line)
+                store.docs[doc["id"]] = doc
+        return store
+
+
+def corpus_dir() -> Path:
+    return Path(os.getenv("CORPUS_DIR", str(DEFAULT_CORPUS_DIR)))
+
+
+def index_factory_from_env() -> Callable[[int], Any]:
+    """Index type for new corpora: CORPUS_INDEX=flat (exact, default), hnsw or pq."""
+    kind = os.getenv("CORPUS_INDEX", "flat")
+    if kind == "hnsw":
+        return partial(
+            HNSWIndex,
+            M=int(os.getenv("HNSW_M", "16")),
+            ef_construction=int(os.getenv("HNSW_EF_CONSTRUCTION", "100")),
+            ef_search=int(os.getenv("HNSW_EF_SEARCH", "64"))
+        )
+    if kind == "pq":
+        subspaces = os.getenv("PQ_SUBSPACES")
+        return partial(
+            PQIndex,
+            m=int(subspaces) if subspaces else None,
+            rerank=int(os.getenv("PQ_RERANK", "100")),
+            train_size=int(os.getenv("PQ_TRAIN_SIZE", "4096"))
+        )
+    return INDEX_TYPES[kind]
+
+
+_corpus_store: Optional[VectorStore] = None
+_corpus_lock = threading.Lock()
+
+
+def get_corpus_store() -> VectorStore:
+    """Process-wide research corpus, loaded from CORPUS_DIR if it exists.
+
+    A saved corpus keeps the index type it was built with; CORPUS_INDEX only
+    applies when the index is created.
+    """
+    global _corpus_store
+    with _corpus_lock:
+        if _corpus_store is None:
+            path = corpus_dir()
+            factory = index_factory_from_env()
+            if (path / "docstore.jsonl").exists():
+                _corpus_store = VectorStore.load(str(path), get_embeddings(), index_factory=factory)
+            else:
+                _corpus_store = VectorStore(get_embeddings(), index_factory=factory)
+        return _corpus_store
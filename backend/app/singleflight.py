@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapse identical concurrent calls from threads into one execution.
+
+    The first caller for a key runs ``fn``; callers arriving while it is in
+    flight block until it finishes and get the same result (or exception).
+    Nothing is remembered afterwards, so this complements a cache rather
+    than replacing it.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """``SingleFlight`` for coroutines on one event loop.
+
+    The work runs in its own task, so a caller that disconnects or is
+    cancelled stops waiting without cancelling the run the others share.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finished(self, key: Hashable, task: asyncio.Task):
+        self._tasks.pop(key, None)
+        if not task.cancelled():
+            # Mark the error as retrieved even if every waiter went away
+            task.exception()
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._tasks)}
+
+
+_tool_flights: Optional[SingleFlight] = None
+# Tasks belong to one event loop, so async callers get a group per loop
+_async_tool_flights: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSingleFlight]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def get_tool_flights() -> SingleFlight:
+    """Process-wide single-flight group shared by the search tools."""
+    global _tool_flights
+    with _lock:
+        if _tool_flights is None:
+            _tool_flights = SingleFlight()
+        return _tool_flights
+
+
+def get_async_tool_flights() -> AsyncSingleFlight:
+    """Single-flight group for the search tools' async paths on the running loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        flights = _async_tool_flights.get(loop)
+        if flights is None:
+            flights = _async_tool_flights[loop] = AsyncSingleFlight()
+        return flights
@@ -0,0 +1,243 @@
+import asyncio
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+import httpx
+from duckduckgo_search import AsyncDDGS, DDGS
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30")),
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        float(os.getenv("HTTP_TIMEOUT", "60")),
+        connect=float(os.getenv("HTTP_CONNECT_TIMEOUT", "10")),
+    )
+
+
+def _http2() -> bool:
+    return os.getenv("HTTP2", "true").lower() == "true"
+
+
+class Transport:
+    """Keep-alive HTTP clients shared by the LLM and the search tools.
+
+    One sync ``httpx.Client`` serves every worker thread. Async clients are
+    bound to the event loop that created them, so one is kept per loop; the
+    previous loop's client is closed when it is replaced. Objects that keep
+    clients handed out here (e.g. the agent registry's chat models) register
+    with ``on_reset`` to drop them once they are closed or replaced.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._openai_clients = {}
+        self._ddgs: Optional[DDGS] = None
+        self._async_ddgs: Optional[AsyncDDGS] = None
+        self._async_ddgs_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reset_callbacks: List[Callable[[], None]] = []
+        self._closing = set()
+
+    def on_reset(self, callback: Callable[[], None]):
+        """Call ``callback`` whenever clients handed out so far are closed or replaced."""
+        with self._lock:
+            if callback not in self._reset_callbacks:
+                self._reset_callbacks.append(callback)
+
+    def _reset(self):
+        with self._lock:
+            callbacks = list(self._reset_callbacks)
+        for callback in callbacks:
+            callback()
+
+    def _close_later(self, close, loop: asyncio.AbstractEventLoop):
+        """Close a client bound to ``loop`` from a different loop, without waiting.
+
+        A loop that is still running closes its own client; otherwise the
+        current loop tries, and a client whose loop is gone is just dropped.
+        """
+        async def quietly():
+            try:
+                await close()
+            except Exception:
+                pass
+
+        if loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(quietly(), loop)
+                return
+            except RuntimeError:
+                pass
+        task = asyncio.get_running_loop().create_task(quietly())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def sync_client(self) -> httpx.Client:
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    http2=_http2(),
+                    limits=_limits(),
+                    timeout=_timeout(),
+                    follow_redirects=True
+                )
+            return self._sync_client
+
+    def async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        replaced = None
+        with self._lock:
+            if self._async_client is None or self._async_loop is not loop:
+                if self._async_client is not None:
+                    replaced = (self._async_client, self._async_loop)
+                self._async_client = httpx.AsyncClient(
+                    http2=_http2(),
+                    limits=_limits(),
+                    timeout=_timeout(),
+                    follow_redirects=True
+                )
+                self._async_loop = loop
+                # OpenAI async clients wrap the previous loop's client
+                self._openai_clients = {
+                    key: (sync, None) for key, (sync, _) in self._openai_clients.items()
+                }
+            client = self._async_client
+        if replaced is not None:
+            self._close_later(replaced[0].aclose, replaced[1])
+            self._reset()
+        return client
+
+    def openai_clients(self, api_key: str):
+        """Shared ``(OpenAI, AsyncOpenAI)`` pair for an API key.
+
+        The async client is only created when called from inside a running
+        event loop; otherwise ``None`` is returned in its place.
+        """
+        import openai
+
+        try:
+            async_http = self.async_client()
+        except RuntimeError:
+            async_http = None
+
+        sync_http = self.sync_client()
+        with self._lock:
+            sync, async_ = self._openai_clients.get(api_key, (None, None))
+            if sync is None:
+                sync = openai.OpenAI(api_key=api_key, http_client=sync_http)
+            if async_ is None and async_http is not None:
+                async_ = openai.AsyncOpenAI(api_key=api_key, http_client=async_http)
+            self._openai_clients[api_key] = (sync, async_)
+            return sync, async_
+
+    def ddgs(self) -> DDGS:
+        """Long-lived DuckDuckGo session.
+
+        DDGS owns its HTTP/2 client and sets per-backend headers on it, so it
+        gets a dedicated keep-alive session instead of the shared client.
+        """
+        with self._lock:
+            if self._ddgs is None:
+                self._ddgs = DDGS(timeout=int(float(os.getenv("HTTP_TIMEOUT", "60"))))
+            return self._ddgs
+
+    def async_ddgs(self) -> AsyncDDGS:
+        """``ddgs`` for coroutines; like ``async_client``, one per event loop."""
+        loop = asyncio.get_running_loop()
+        replaced = None
+        with self._lock:
+            if self._async_ddgs is None or self._async_ddgs_loop is not loop:
+                if self._async_ddgs is not None:
+                    replaced = (self._async_ddgs, self._async_ddgs_loop)
+                self._async_ddgs = AsyncDDGS(timeout=int(float(os.getenv("HTTP_TIMEOUT", "60"))))
+                self._async_ddgs_loop = loop
+            ddgs = self._async_ddgs
+        if replaced is not None:
+            self._close_later(replaced[0]._client.aclose, replaced[1])
+        return ddgs
+
+    def close(self):
+        with self._lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+            if self._ddgs is not None:
+                self._ddgs._client.close()
+            self._sync_client = None
+            self._ddgs = None
+            self._openai_clients = {}
+        # Models built on the closed clients would fail with "client has been closed"
+        self._reset()
+
+    async def aclose(self):
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(task for task in list(self._closing) if task.get_loop() is loop), return_exceptions=True
+        )
+        client = self._async_client
+        self._async_client = None
+        self._async_loop = None
+        if client is not None:
+            await client.aclose()
+        ddgs, self._async_ddgs, self._async_ddgs_loop = self._async_ddgs, None, None
+        if ddgs is not None:
+            await ddgs._client.aclose()
+        self.close()
+
+
+class RateLimiter:
+    """Keep calls at least ``interval`` seconds apart, across threads and event loops.
+
+    Each caller reserves the next free slot under a lock and then sleeps
+    until it comes, so a concurrent burst is spread out instead of sent
+    at once.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+            return slot - now
+
+    def wait(self):
+        time.sleep(self._reserve())
+
+    async def wait_async(self):
+        await asyncio.sleep(self._reserve())
+
+
+_transport = Transport()
+_arxiv_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    return _transport
+
+
+def get_arxiv_limiter() -> RateLimiter:
+    """Process-wide spacing of arXiv API calls (ARXIV_MIN_INTERVAL, default 3s).
+
+    arXiv asks clients for no more than one request every three seconds.
+    """
+    global _arxiv_limiter
+    with _limiter_lock:
+        if _arxiv_limiter is None:
+            _arxiv_limiter = RateLimiter(float(os.getenv("ARXIV_MIN_INTERVAL", "3")))
+        return _arxiv_limiter
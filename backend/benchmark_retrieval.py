@@ -0,0 +1,114 @@
+"""Recall-vs-latency benchmark for the approximate vector indexes.
+
+Exact ``FlatIndex`` search is the ground truth. Each approximate setting
+reports recall@k against it, mean per-query latency, the in-RAM bytes
+per stored vector and build time::
+
+    python benchmark_retrieval.py --n 20000 --dim 128 --ef 16 32 64 128
+    python benchmark_retrieval.py --skip-hnsw --pq-m 16 32 64 --rerank 0 50 200
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.retrieval.hnsw import HNSWIndex
+from app.retrieval.pq import PQIndex
+from app.retrieval.vector_store import FlatIndex
+
+
+def clustered_vectors(n: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Gaussian blobs, closer to real embedding distributions than uniform noise."""
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    return centres[labels] + 0.8 * rng.standard_normal((n, dim)).astype(np.float32)
+
+
+def recall_at_k(found, truth) -> float:
+    hits = sum(len({i for i, _ in f} & {i for i, _ in t}) for f, t in zip(found, truth))
+    return hits / max(sum(len(t) for t in truth), 1)
+
+
+def timed_search(index, queries: np.ndarray, k: int, batched: bool):
+    started = time.perf_counter()
+    if batched:
+        found = index.search(queries, k)
+    else:
+        found = [index.search(query[None, :], k)[0] for query in queries]
+    return found, (time.perf_counter() - started) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20_000, help="Indexed vectors")
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--M", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=100)
+    parser.add_argument("--ef", type=int, nargs="+", default=[10, 20, 40, 80, 160])
+    parser.add_argument("--skip-hnsw", action="store_true")
+    parser.add_argument("--pq-m", type=int, nargs="+", default=[16, 32],
+                        help="PQ subspaces (bytes per vector)")
+    parser.add_argument("--rerank", type=int, nargs="+", default=[0, 50, 200],
+                        help="Candidates re-scored against full vectors")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    data = clustered_vectors(args.n + args.queries, args.dim, args.clusters, rng)
+    vectors, queries = data[:args.n], data[args.n:]
+    ids = [str(i) for i in range(args.n)]
+
+    print(f"📊 {args.n} vectors, dim {args.dim}, {args.queries} queries, k={args.k}\n")
+
+    flat = FlatIndex(args.dim)
+    flat.add(ids, vectors)
+    truth, flat_batch_ms = timed_search(flat, queries, args.k, batched=True)
+    _, flat_single_ms = timed_search(flat, queries, args.k, batched=False)
+    float_bytes = 4 * args.dim
+    print(f"{'index':<28}{'recall@k':>10}{'ms/query':>12}{'RAM B/vec':>12}")
+    print(f"{'flat (batched)':<28}{1.0:>10.3f}{flat_batch_ms:>12.3f}{float_bytes:>12}")
+    print(f"{'flat (one at a time)':<28}{1.0:>10.3f}{flat_single_ms:>12.3f}{float_bytes:>12}")
+    builds = []
+
+    if not args.skip_hnsw:
+        started = time.perf_counter()
+        hnsw = HNSWIndex(args.dim, M=args.M, ef_construction=args.ef_construction)
+        hnsw.add(ids, vectors)
+        builds.append((f"HNSW ef_construction={args.ef_construction}", time.perf_counter() - started))
+
+        for ef in args.ef:
+            hnsw.ef_search = ef
+            found, ms = timed_search(hnsw, queries, args.k, batched=False)
+            label = f"hnsw M={args.M} ef={ef}"
+            # Vectors plus the saved layer-0 graph (int32 links)
+            print(f"{label:<28}{recall_at_k(found, truth):>10.3f}{ms:>12.3f}"
+                  f"{f'{float_bytes}+graph':>12}")
+
+    for m in args.pq_m:
+        started = time.perf_counter()
+        pq = PQIndex(args.dim, m=m, train_size=min(args.n, 4096))
+        pq.add(ids, vectors)
+        builds.append((f"PQ m={m}", time.perf_counter() - started))
+
+        for rerank in args.rerank:
+            pq.rerank = rerank
+            found, ms = timed_search(pq, queries, args.k, batched=False)
+            label = f"pq m={m} ({pq.compression:.0f}x) rerank={rerank}"
+            print(f"{label:<28}{recall_at_k(found, truth):>10.3f}{ms:>12.3f}{m:>12}")
+
+    print()
+    for label, seconds in builds:
+        print(f"⏱️ {label} build: {seconds:.1f}s ({args.n / seconds:.0f} inserts/s)")
+
+
+if __name__ == "__main__":
+    main()
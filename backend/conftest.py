@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from langchain.globals import set_llm_cache
+
+from app import context_budget
+from app.cache import llm_cache
+from app.transport import get_transport
+
+
+@pytest.fixture
+def offline_llm(monkeypatch):
+    """Build real chat models without an API key or the on-disk LLM cache."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("LLM_CACHE", "false")
+    monkeypatch.setattr(llm_cache, "_llm_cache", None)
+    yield
+    set_llm_cache(None)
+
+
+@pytest.fixture
+def offline_tokenizer(monkeypatch):
+    """Length-based token counts, independent of tiktoken's vocabulary downloads."""
+    monkeypatch.setattr(context_budget, "_encoding", lambda model: None)
+
+
+def _page_about(query: str) -> list:
+    return [{"title": f"About {query}", "href": f"https://example.org/{query}", "body": f"{query} " * 20}]
+
+
+class FakeDDGS:
+    """DuckDuckGo stand-in that waits ``delay`` seconds per search and records each query.
+
+    ``results(query)`` builds the hits (one page about the query by default)
+    and may raise to simulate a failed search.
+    """
+
+    def __init__(self, delay: float = 0.2, results=_page_about):
+        self.delay = delay
+        self.results = results
+        self.queries = []
+        self._lock = threading.Lock()
+
+    @property
+    def calls(self) -> int:
+        return len(self.queries)
+
+    def _hits(self, query: str) -> list:
+        with self._lock:
+            self.queries.append(query)
+        return list(self.results(query))
+
+    def text(self, query, max_results=None):
+        time.sleep(self.delay)
+        return iter(self._hits(query))
+
+
+class FakeAsyncDDGS(FakeDDGS):
+    async def text(self, query, max_results=None):
+        await asyncio.sleep(self.delay)
+        for result in self._hits(query):
+            yield result
+
+
+@pytest.fixture
+def no_tool_side_effects(monkeypatch):
+    """Keep search tools from indexing or ingesting their results."""
+    monkeypatch.setenv("CORPUS_CAPTURE", "false")
+    monkeypatch.setenv("INGEST_TOOL_URLS", "false")
+
+
+@pytest.fixture
+def fake_ddgs(monkeypatch, no_tool_side_effects):
+    """Install a fake DuckDuckGo session on the shared transport: ``fake_ddgs(delay, results, asynchronous)``."""
+    def install(delay: float = 0.2, results=_page_about, asynchronous: bool = False) -> FakeDDGS:
+        ddgs = (FakeAsyncDDGS if asynchronous else FakeDDGS)(delay, results)
+        monkeypatch.setattr(get_transport(), "async_ddgs" if asynchronous else "ddgs", lambda: ddgs)
+        return ddgs
+
+    return install
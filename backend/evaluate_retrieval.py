@@ -0,0 +1,159 @@
+"""Offline retrieval evaluation: sparse vs dense vs hybrid (RRF).
+
+Indexes a fixed corpus, runs a fixed query set with known relevant chunks
+and reports recall@k, MRR and per-query latency for each search mode::
+
+    python evaluate_retrieval.py -k 3
+    EMBEDDING_BACKEND=openai python evaluate_retrieval.py --dataset my_eval.json
+
+A dataset file is JSON: ``{"documents": [{"id", "title", "text"}],
+"queries": [{"query", "relevant": [ids]}]}``.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.retrieval.embeddings import get_embeddings
+from app.retrieval.hybrid import HybridRetriever
+from app.retrieval.vector_store import VectorStore
+
+# Shaped like captured tool results: a title plus a snippet or abstract
+DOCUMENTS = [
+    ("bert", "BERT: Pre-training of Deep Bidirectional Transformers",
+     "BERT pre-trains deep bidirectional representations from unlabeled text by masked language modeling."),
+    ("gpt3", "Language Models are Few-Shot Learners",
+     "GPT-3, an autoregressive language model with 175 billion parameters, performs tasks from a few examples in the prompt."),
+    ("lora", "LoRA: Low-Rank Adaptation of Large Language Models",
+     "LoRA freezes pretrained weights and injects trainable rank decomposition matrices, cutting fine-tuning memory."),
+    ("rag", "Retrieval-Augmented Generation for Knowledge-Intensive NLP",
+     "RAG combines a parametric seq2seq model with a dense passage index of Wikipedia retrieved at generation time."),
+    ("hnsw", "Efficient and robust approximate nearest neighbor search using HNSW graphs",
+     "Hierarchical navigable small world graphs give logarithmic search complexity for approximate nearest neighbours."),
+    ("pq", "Product Quantization for Nearest Neighbor Search",
+     "Vectors are split into subspaces quantized separately; asymmetric distance computation scores compressed codes."),
+    ("bm25", "The Probabilistic Relevance Framework: BM25 and Beyond",
+     "BM25 ranks documents by term frequency saturation and document length normalisation in the probabilistic model."),
+    ("crispr", "A Programmable Dual-RNA-Guided DNA Endonuclease",
+     "CRISPR-Cas9 uses a guide RNA to cut DNA at targeted sites, enabling precise genome editing."),
+    ("mrna", "mRNA vaccines: a new era in vaccinology",
+     "Messenger RNA vaccines deliver lipid nanoparticle encapsulated mRNA so cells produce the viral spike protein."),
+    ("alphafold", "Highly accurate protein structure prediction with AlphaFold",
+     "AlphaFold predicts three-dimensional protein structures from amino acid sequences with atomic accuracy."),
+    ("perovskite", "Perovskite solar cells exceed 25% efficiency",
+     "Metal halide perovskite photovoltaics reach power conversion efficiency above 25 percent in lab cells."),
+    ("wind", "Offshore wind turbines and grid integration",
+     "Offshore wind farms generate renewable electricity; grid integration needs storage and transmission upgrades."),
+    ("battery", "Solid-state lithium batteries",
+     "Solid electrolytes promise safer lithium metal batteries with higher energy density for electric vehicles."),
+    ("qubits", "Quantum supremacy using a programmable superconducting processor",
+     "A 53-qubit superconducting quantum processor sampled random circuits faster than classical supercomputers."),
+    ("qec", "Surface code quantum error correction",
+     "Surface codes protect logical qubits by measuring stabilizers; error rates fall below threshold with larger codes."),
+    ("resnet", "Deep Residual Learning for Image Recognition",
+     "Residual networks with skip connections train very deep convolutional networks for ImageNet classification."),
+    ("vit", "An Image is Worth 16x16 Words: Transformers for Image Recognition",
+     "Vision Transformer applies a pure transformer to sequences of image patches and matches convolutional networks."),
+    ("diffusion", "Denoising Diffusion Probabilistic Models",
+     "Diffusion models generate images by learning to reverse a gradual noising process."),
+    ("ppo", "Proximal Policy Optimization Algorithms",
+     "PPO is a policy gradient reinforcement learning method with a clipped surrogate objective."),
+    ("alphago", "Mastering the game of Go with deep neural networks and tree search",
+     "AlphaGo combines policy and value networks with Monte Carlo tree search to defeat a human Go champion."),
+    ("carbon", "Direct air capture of carbon dioxide",
+     "Direct air capture plants remove CO2 from the atmosphere with sorbents, at high energy cost per tonne."),
+    ("inflation", "Monetary policy and inflation expectations",
+     "Central banks raise interest rates to anchor inflation expectations and slow price growth."),
+    ("microplastics", "Microplastics in drinking water",
+     "Microplastic particles are found in tap and bottled water; health effects of ingestion remain uncertain."),
+    ("sleep", "Sleep deprivation and memory consolidation",
+     "Lack of sleep impairs hippocampal memory consolidation and attention in healthy adults."),
+]
+
+QUERIES = [
+    # Rare keywords and acronyms, where BM25 shines
+    ("LoRA fine-tuning memory", ["lora"]),
+    ("CRISPR Cas9 genome editing", ["crispr"]),
+    ("HNSW graph nearest neighbour search", ["hnsw"]),
+    ("BM25 document length normalisation", ["bm25"]),
+    ("perovskite photovoltaic efficiency", ["perovskite"]),
+    ("PPO clipped objective", ["ppo"]),
+    # Topical questions, where term overlap is partial
+    ("how do transformers handle images", ["vit"]),
+    ("masked language model pretraining", ["bert"]),
+    ("retrieval of passages during text generation", ["rag"]),
+    ("compressing vectors for similarity search", ["pq", "hnsw"]),
+    ("predicting how proteins fold", ["alphafold"]),
+    ("quantum processors and qubits", ["qubits", "qec"]),
+    ("renewable electricity from wind", ["wind"]),
+    ("removing CO2 from the air", ["carbon"]),
+    ("interest rates and inflation", ["inflation"]),
+    ("reinforcement learning for board games", ["alphago", "ppo"]),
+    ("generating images with diffusion", ["diffusion"]),
+    ("vaccines based on messenger RNA", ["mrna"]),
+]
+
+
+def load_dataset(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    documents = [(d["id"], d.get("title", ""), d["text"]) for d in data["documents"]]
+    queries = [(q["query"], q["relevant"]) for q in data["queries"]]
+    return documents, queries
+
+
+def evaluate(retriever: HybridRetriever, queries, k: int, mode: str, repeat: int):
+    recalls, reciprocal_ranks, latencies = [], [], []
+    for query, relevant in queries:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            hits = retriever.search(query, k=k, mode=mode)
+            latencies.append((time.perf_counter() - started) * 1000)
+        ranked = [hit["id"] for hit in hits]
+        recalls.append(len(set(ranked) & set(relevant)) / len(relevant))
+        first = next((rank for rank, chunk_id in enumerate(ranked, 1) if chunk_id in relevant), None)
+        reciprocal_ranks.append(1 / first if first else 0.0)
+    latencies.sort()
+    return {
+        "recall": statistics.mean(recalls),
+        "mrr": statistics.mean(reciprocal_ranks),
+        "p50_ms": latencies[len(latencies) // 2],
+        "p95_ms": latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", type=int, default=3)
+    parser.add_argument("--dataset", help="JSON dataset instead of the built-in one")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per query")
+    args = parser.parse_args()
+
+    documents, queries = load_dataset(args.dataset) if args.dataset else (DOCUMENTS, QUERIES)
+    embeddings = get_embeddings()
+    retriever = HybridRetriever(VectorStore(embeddings))
+    started = time.perf_counter()
+    retriever.add_texts(
+        [f"{title}\n{text}" for _, title, text in documents],
+        metadatas=[{"title": title} for _, title, _ in documents],
+        ids=[chunk_id for chunk_id, _, _ in documents]
+    )
+    print(f"📊 {len(documents)} documents, {len(queries)} queries, k={args.k}, "
+          f"embeddings={type(embeddings).__name__} "
+          f"(indexed in {time.perf_counter() - started:.2f}s)\n")
+
+    print(f"{'mode':<8}{'recall@k':>10}{'MRR':>8}{'p50 ms':>10}{'p95 ms':>10}")
+    for mode in ("sparse", "dense", "hybrid"):
+        result = evaluate(retriever, queries, args.k, mode, args.repeat)
+        print(f"{mode:<8}{result['recall']:>10.3f}{result['mrr']:>8.3f}"
+              f"{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
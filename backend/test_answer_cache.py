@@ -0,0 +1,119 @@
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app import research_service
+from app.cache.answer_cache import SemanticAnswerCache
+from app.retrieval.embeddings import HashingEmbeddings
+
+QUESTIONS = ["What are the main applications?", "What are the risks?"]
+
+
+class _CountingExecutor:
+    use_processes = False
+
+    def __init__(self):
+        self.runs = 0
+
+    async def run(self, fn, *args, **kwargs):
+        self.runs += 1
+        return {"success": True, "research_output": "Findings", "sources_used": ["web"], "mode": "standard"}
+
+
+def test_paraphrases_hit_and_stale_or_other_variants_miss():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticAnswerCache(str(Path(tmp) / "answers.db"), HashingEmbeddings(dim=256), threshold=0.9)
+        cache.put(cache.embed("AI in healthcare", QUESTIONS), "AI in healthcare", {"answer": 1}, "standard")
+
+        # Case, punctuation and question order do not matter (a learned embedding
+        # model also matches real paraphrases; the hashing one only sees words)
+        hit = cache.lookup(cache.embed("AI in Healthcare?", list(reversed(QUESTIONS))), "standard")
+        assert hit is not None and hit.result == {"answer": 1} and hit.topic == "AI in healthcare"
+        assert cache.lookup(cache.embed("Quantum error correction", QUESTIONS), "standard") is None
+        assert cache.lookup(cache.embed("AI in healthcare", QUESTIONS), "advanced") is None
+
+        # Results survive a restart, but not their TTL
+        reopened = SemanticAnswerCache(str(Path(tmp) / "answers.db"), HashingEmbeddings(dim=256), threshold=0.9)
+        assert len(reopened) == 1
+        reopened.ttl = 0.01
+        time.sleep(0.02)
+        assert reopened.lookup(reopened.embed("AI in healthcare", QUESTIONS), "standard") is None
+
+
+def test_conduct_research_skips_the_agent_for_a_paraphrase(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticAnswerCache(str(Path(tmp) / "answers.db"), HashingEmbeddings(dim=256), threshold=0.9)
+        monkeypatch.setattr(research_service, "get_answer_cache", lambda: cache)
+        executor = _CountingExecutor()
+
+        first = asyncio.run(research_service.conduct_research(
+            executor, "AI in healthcare", QUESTIONS, detailed_report=False
+        ))
+        second = asyncio.run(research_service.conduct_research(
+            executor, "ai in healthcare", QUESTIONS[::-1], detailed_report=False
+        ))
+        assert executor.runs == 1
+        assert second == first and second["research_output"] == "Findings"
+
+        # Advanced research is never answered from standard results
+        asyncio.run(research_service.conduct_research(
+            executor, "AI in healthcare", QUESTIONS, detailed_report=False, advanced=True
+        ))
+        assert executor.runs == 2
+
+
+class _FakeReports:
+    def __init__(self):
+        self.written = 0
+
+    def report_generator(self):
+        return self
+
+    async def agenerate_sections(self, topic, research_data, on_section=None, mode="sections"):
+        self.written += 1
+        sections = {"executive_summary": f"Summary {self.written}", "conclusions": "Conclusions"}
+        for name, text in sections.items():
+            on_section(name, text)
+        return sections
+
+    def assemble(self, topic, research_data, sections):
+        return f"# Research Report: {topic}\n" + "\n".join(sections.values())
+
+
+def test_reused_sections_get_this_requests_topic_and_events(monkeypatch):
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SemanticAnswerCache(str(Path(tmp) / "answers.db"), HashingEmbeddings(dim=256), threshold=0.9)
+        reports = _FakeReports()
+        monkeypatch.setattr(research_service, "get_answer_cache", lambda: cache)
+        monkeypatch.setattr(research_service, "get_registry", lambda: reports)
+        executor = _CountingExecutor()
+
+        def run(topic, mode="sections"):
+            events = []
+            result = asyncio.run(research_service.conduct_research(
+                executor, topic, QUESTIONS, report_mode=mode,
+                on_section=lambda name, text: events.append(name)
+            ))
+            return result, events
+
+        first, first_events = run("AI in healthcare")
+        second, second_events = run("AI in Healthcare?")
+        assert executor.runs == 1 and reports.written == 1
+        assert second["report"].startswith("# Research Report: AI in Healthcare?")
+        assert second_events == first_events == ["executive_summary", "conclusions"]
+
+        # Sections written in another report mode are regenerated
+        third, _ = run("AI in healthcare", mode="structured")
+        assert executor.runs == 1 and reports.written == 2
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,128 @@
+import json
+import math
+import sys
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.agents.tools import ArxivSearchTool
+from app.retrieval import arxiv_index
+from app.retrieval.arxiv_index import ArxivIndex, _read_records, build_index
+from app.retrieval.text import tokenize
+
+RECORDS = [
+    {"id": "2401.00001", "title": "Graph neural networks for molecules",
+     "abstract": "We apply graph neural networks to molecular property prediction.",
+     "authors_parsed": [["Curie", "Marie", ""], ["Bohr", "Niels", ""]],
+     "versions": [{"created": "Mon, 1 Jan 2024 10:00:00 GMT"}]},
+    {"id": "2401.00002", "title": "Solid state batteries",
+     "abstract": "A survey of solid electrolytes, their conductivity and interface stability.",
+     "authors": "A. Volta, M. Faraday", "update_date": "2024-01-02"},
+    {"id": "2401.00003", "title": "Attention for graphs",
+     "abstract": "Transformers on graphs match message passing networks on molecules.",
+     "authors": "Y. Vaswani", "update_date": "2024-01-03"},
+    {"id": "2401.00004", "title": "Battery  degradation\n models",
+     "abstract": "Cycle life of lithium batteries under fast charging.",
+     "authors": "J. Goodenough", "update_date": "2024-01-04"},
+    {"id": "2401.00005", "title": "Neural scaling laws",
+     "abstract": "Loss falls as a power law in parameters, data and compute for neural networks.",
+     "authors": "J. Kaplan", "update_date": "2024-01-05"},
+]
+
+
+def _dump(tmp_path) -> str:
+    path = tmp_path / "snapshot.json"
+    path.write_text("\n".join(json.dumps(record) for record in RECORDS) + "\n\n", encoding="utf-8")
+    return str(path)
+
+
+def _reference_bm25(query: str, k1: float = 1.2, b: float = 0.75) -> dict:
+    """Textbook BM25 over the same tokens, computed straight from the records."""
+    docs = [Counter(tokenize(" ".join(r["title"].split())) * 2 + tokenize(r["abstract"])) for r in RECORDS]
+    avg_len = sum(sum(doc.values()) for doc in docs) / len(docs)
+    scores = {}
+    for doc_id, doc in enumerate(docs):
+        length = sum(doc.values())
+        score = 0.0
+        for term in set(tokenize(query)):
+            df = sum(term in other for other in docs)
+            if term in doc:
+                idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * doc[term] * (k1 + 1) / (doc[term] + k1 * (1 - b + b * length / avg_len))
+        if score:
+            scores[doc_id] = score
+    return scores
+
+
+@pytest.fixture
+def index(tmp_path):
+    # Two papers per block, so the build spills three blocks and merges them
+    stats = build_index(_read_records(_dump(tmp_path)), str(tmp_path / "index"), block_size=2)
+    assert stats["doc_count"] == len(RECORDS)
+    index = ArxivIndex(str(tmp_path / "index"))
+    yield index
+    index.close()
+
+
+def test_build_merges_blocks_into_memmapped_postings(index, tmp_path):
+    for array in (index.postings_docs, index.postings_tfs, index.doc_lens, index.meta_offsets):
+        assert isinstance(array, np.memmap)
+    # No spill blocks are left behind
+    assert sorted(p.name for p in (tmp_path / "index").iterdir()) == [
+        "doc_lens.u32", "index.json", "meta.jsonl", "meta_offsets.u64",
+        "postings_docs.u32", "postings_tfs.u16", "vocab.json"
+    ]
+
+    offset, df = index.vocab["molecules"]
+    assert list(index.postings_docs[offset:offset + df]) == [0, 2]
+    # Title terms count double
+    assert list(index.postings_tfs[offset:offset + df]) == [2, 1]
+    offset, df = index.vocab["networks"]
+    # Postings from different blocks stay in doc id order
+    assert list(index.postings_docs[offset:offset + df]) == [0, 2, 4]
+    assert index.postings_docs.size == sum(df for _, df in index.vocab.values())
+
+
+def test_bm25_scores_and_metadata(index):
+    for query in ["graph neural networks", "batteries", "solid electrolytes conductivity"]:
+        expected = _reference_bm25(query)
+        results = index.search_ids(query, k=10)
+        assert [doc_id for doc_id, _ in results] == sorted(expected, key=expected.get, reverse=True)
+        for doc_id, score in results:
+            assert score == pytest.approx(expected[doc_id], rel=1e-5)
+
+    assert index.search_ids("graph neural networks", k=1)[0][0] == 0
+    assert index.search_ids("quantum chromodynamics") == []
+
+    paper = index.search("graph neural networks", k=1)[0]
+    assert paper == {
+        "paper_id": "2401.00001",
+        "title": "Graph neural networks for molecules",
+        "authors": ["Marie Curie", "Niels Bohr"],
+        "summary": "We apply graph neural networks to molecular property prediction.",
+        "published": "2024-01-01",
+        "pdf_url": "https://arxiv.org/pdf/2401.00001",
+    }
+    assert index.paper(3)["title"] == "Battery degradation models"
+
+
+def test_local_backend_and_empty_index(monkeypatch, tmp_path, index, no_tool_side_effects):
+    monkeypatch.setenv("ARXIV_INDEX_DIR", str(tmp_path / "index"))
+    monkeypatch.setattr(arxiv_index, "_arxiv_index", None)
+    output = ArxivSearchTool(backend="local").run("lithium battery cycle life")
+    assert output.startswith("arXiv search results") and "Battery degradation models" in output
+
+    build_index([], str(tmp_path / "empty"))
+    empty = ArxivIndex(str(tmp_path / "empty"))
+    assert empty.search("anything") == []
+    empty.close()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.agents.tools import ArxivSearchTool
+from app.cache.arxiv_store import ArxivStore, get_arxiv_store
+
+
+def _paper(n: int) -> dict:
+    return {
+        "paper_id": f"2401.0000{n}v1",
+        "title": f"Paper {n}",
+        "authors": ["A. Author", f"B. Writer {n}"],
+        "summary": f"Findings number {n} on retrieval.",
+        "published": "2024-01-01",
+        "pdf_url": f"http://arxiv.org/pdf/2401.0000{n}v1",
+    }
+
+
+def test_store_round_trip_and_query_expiry(tmp_path):
+    path = str(tmp_path / "arxiv.db")
+    store = ArxivStore(path)
+    store.put_papers([_paper(1), _paper(2)])
+    store.put_query("retrieval|3", ["2401.00001v1", "2401.00002v1"])
+    store.close()
+
+    reopened = ArxivStore(path)
+    assert reopened.get_query("retrieval|3") == ["2401.00001v1", "2401.00002v1"]
+    assert reopened.get_papers(["2401.00002v1", "2401.00009v1"]) == {"2401.00002v1": _paper(2)}
+    assert reopened.get_query("unknown|3") is None
+
+    # Query lists go stale; the papers they pointed at are kept
+    stale = ArxivStore(path, query_ttl=0)
+    assert stale.get_query("retrieval|3") is None
+    assert set(stale.get_papers(["2401.00001v1", "2401.00002v1"])) == {"2401.00001v1", "2401.00002v1"}
+
+
+def test_tool_fetches_only_what_the_store_lacks(monkeypatch, tmp_path, no_tool_side_effects):
+    monkeypatch.setenv("ARXIV_CACHE_DB", str(tmp_path / "arxiv.db"))
+    monkeypatch.setattr("app.cache.arxiv_store._arxiv_store", None)
+    fetches = []
+
+    def fake_fetch(self, params):
+        fetches.append(params)
+        if "id_list" in params:
+            return [_paper(int(paper_id[-3])) for paper_id in params["id_list"].split(",")]
+        return [_paper(1), _paper(2)]
+
+    monkeypatch.setattr(ArxivSearchTool, "_fetch", fake_fetch)
+    tool = ArxivSearchTool(backend="api")
+
+    first = tool.run("store round trip")
+    assert "Paper 2" in first and len(fetches) == 1
+    # Same normalized query: answered from disk without an API call
+    assert tool.run("Round trip of the store") == first.replace("store round trip", "Round trip of the store")
+    assert len(fetches) == 1
+
+    # A paper missing from the store is fetched by id, alone
+    store = get_arxiv_store()
+    store._conn.execute("DELETE FROM papers WHERE paper_id = ?", ("2401.00002v1",))
+    store._conn.commit()
+    assert "Paper 2" in tool.run("store round trip")
+    assert fetches[-1] == {"id_list": "2401.00002v1", "max_results": 1}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,129 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.agents import tools
+from app.agents.tools import ArxivSearchTool, CalculatorTool, WebSearchTool
+from app.transport import RateLimiter
+
+FEED = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <entry>
+    <id>http://arxiv.org/abs/2401.00001v1</id>
+    <title>Async Retrieval</title>
+    <summary>Serving search tools on the event loop.</summary>
+    <published>2024-01-01T00:00:00Z</published>
+    <author><name>A. Author</name></author>
+    <link title="pdf" href="http://arxiv.org/pdf/2401.00001v1" rel="related"/>
+  </entry>
+</feed>"""
+
+
+def test_web_searches_run_concurrently_on_the_loop_and_time_out(fake_ddgs):
+    ddgs = fake_ddgs(delay=0.3, asynchronous=True)
+    tool = WebSearchTool()
+
+    async def main():
+        started = time.perf_counter()
+        outputs = await asyncio.gather(*(
+            tool.arun(f"async topic {n}") for n in [1, 2, 3, 4, 1]
+        ))
+        return outputs, time.perf_counter() - started
+
+    outputs, elapsed = asyncio.run(main())
+    assert elapsed < 0.6  # five searches overlap instead of taking 1.5s
+    assert ddgs.calls == 4  # the repeated query shared the in-flight search
+    assert "https://example.org/async topic 3" in outputs[2]
+
+    ddgs.delay = 5
+    slow = WebSearchTool(timeout=0.1)
+    started = time.perf_counter()
+    output = asyncio.run(slow.arun("async slow topic"))
+    assert "timed out after 0.1s" in output and time.perf_counter() - started < 1
+
+
+def test_arxiv_and_calculator_async_paths(monkeypatch, tmp_path, no_tool_side_effects):
+    monkeypatch.setenv("ARXIV_CACHE_DB", str(tmp_path / "arxiv.db"))
+    monkeypatch.setattr("app.cache.arxiv_store._arxiv_store", None)
+
+    async def fake_afetch(self, params):
+        await asyncio.sleep(0.05)
+        return tools._parse_arxiv_feed(FEED)
+
+    monkeypatch.setattr(ArxivSearchTool, "_afetch", fake_afetch)
+    output = asyncio.run(ArxivSearchTool(backend="api").arun("async retrieval"))
+    assert "Async Retrieval" in output and "2024-01-01" in output
+
+    assert asyncio.run(CalculatorTool().arun("6 * 7")) == "6 * 7 = 42"
+
+
+def test_calculator_bounds_powers_and_stays_off_the_loop(monkeypatch):
+    calculator = CalculatorTool(timeout=0.2)
+    started = time.perf_counter()
+    assert "exceed" in asyncio.run(calculator.arun("9**9**8"))
+    assert time.perf_counter() - started < 1
+    assert calculator.run("2**-2 + (7 - 1) / 4") == "2**-2 + (7 - 1) / 4 = 1.75"
+    assert calculator.run("(2)(3)").startswith("Error evaluating expression")
+
+    def slow_run(self, expression):
+        time.sleep(0.5)
+        return "late"
+
+    monkeypatch.setattr(CalculatorTool, "_run", slow_run)
+
+    async def main():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        output = await calculator.arun("1 + 1")
+        beat.cancel()
+        return output, ticks
+
+    output, ticks = asyncio.run(main())
+    # The loop kept running while the evaluation was stuck, and gave up on it
+    assert output == "Error evaluating expression: timed out after 0.2s" and ticks >= 10
+
+
+def test_rate_limiter_spaces_threads_and_coroutines():
+    limiter = RateLimiter(0.1)
+    stamps = []
+
+    def call():
+        limiter.wait()
+        stamps.append(time.monotonic())
+
+    threads = [threading.Thread(target=call) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    async def acall():
+        await limiter.wait_async()
+        stamps.append(time.monotonic())
+
+    async def main():
+        await asyncio.gather(acall(), acall())
+
+    asyncio.run(main())
+    stamps.sort()
+    gaps = [later - earlier for earlier, later in zip(stamps, stamps[1:])]
+    assert len(gaps) == 4 and min(gaps) >= 0.09
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.context_budget import (
+    TRUNCATION_MARKER, compact_json, count_tokens, fit_observations, scratchpad_trimmer, truncate_tokens
+)
+
+
+pytestmark = pytest.mark.usefixtures("offline_tokenizer")
+
+
+def _words(n: int, word: str = "finding") -> str:
+    return " ".join(f"{word}{i}" for i in range(n))
+
+
+def test_truncate_keeps_head_and_tail_within_budget():
+    text = _words(400)
+    assert truncate_tokens("short text", 50) == "short text"
+
+    cut = truncate_tokens(text, 100)
+    head, tail = cut.split(TRUNCATION_MARKER)
+    assert text.startswith(head) and text.endswith(tail)
+    assert count_tokens(head) + count_tokens(tail) <= 101
+    assert len(head) > len(tail)
+
+
+def test_observations_fit_budget_oldest_first():
+    old, middle, new = _words(200, "old"), _words(200, "mid"), _words(20, "new")
+    fitted = fit_observations([old, middle, new], budget=400)
+    assert fitted[2] == new
+    assert sum(count_tokens(o) for o in fitted) <= 400 + 48 + len(TRUNCATION_MARKER)
+    # Every step keeps at least a stub of what it returned
+    assert fitted[0].startswith("old0") and TRUNCATION_MARKER in fitted[0]
+
+    steps = [("action-1", old), ("action-2", new)]
+    trimmed = scratchpad_trimmer(budget=10_000, observation_budget=100)(steps)
+    assert [action for action, _ in trimmed] == ["action-1", "action-2"]
+    assert count_tokens(trimmed[0][1]) <= 110 and trimmed[1][1] == new
+
+
+def test_compact_json_is_denser_than_indented():
+    results = [{"title": "Café", "url": "https://example.org", "snippet": "..."}]
+    assert compact_json(results) == '[{"title":"Café","url":"https://example.org","snippet":"..."}]'
+
+
+def test_report_prompts_are_bounded(monkeypatch, offline_llm):
+    monkeypatch.setenv("REPORT_CONTEXT_TOKENS", "500")
+    from app.chains.report_generator import ReportGenerator
+
+    generator = ReportGenerator()
+    research = {"research_output": _words(5000) + " FINAL CONCLUSION"}
+    prompts = list(generator._section_prompts("Batteries", research).values())
+    prompts.append(generator._structured_prompt("Batteries", research))
+    for prompt in prompts:
+        assert count_tokens(prompt) < 1000
+    assert all("FINAL CONCLUSION" in prompt for prompt in prompts)
+
+    short = {"research_output": "Solid state batteries are safer."}
+    assert "Solid state batteries are safer." in generator._section_prompts("Batteries", short)["key_findings"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
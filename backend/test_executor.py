@@ -0,0 +1,137 @@
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.testclient import TestClient
+
+from app import research_service
+from app.executor import ResearchExecutor
+from app.jobs import InMemoryJobStore, JobManager
+
+
+def test_concurrency_bound_and_metrics():
+    executor = ResearchExecutor(max_workers=4, max_concurrency=2)
+    lock = threading.Lock()
+    active = peak = 0
+
+    def work(n):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.1)
+        with lock:
+            active -= 1
+        if n == 5:
+            raise ValueError("bad input")
+        return n * 2
+
+    async def main():
+        tasks = [asyncio.create_task(executor.run(work, n)) for n in range(6)]
+        await asyncio.sleep(0.05)
+        during = executor.metrics()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return during, results
+
+    try:
+        during, results = asyncio.run(main())
+    finally:
+        executor.shutdown()
+
+    # Four pool threads, but only two runs at a time; the rest wait in the queue
+    assert peak == 2
+    assert during["running"] == 2 and during["queue_depth"] == 4
+    assert results[:5] == [0, 2, 4, 6, 8] and isinstance(results[5], ValueError)
+
+    metrics = executor.metrics()
+    assert metrics["completed"] == 5 and metrics["failed"] == 1
+    assert metrics["queue_depth"] == 0 and metrics["running"] == 0
+    assert metrics["avg_run_seconds"] >= 0.1 and metrics["avg_wait_seconds"] > 0
+
+
+def test_cancelled_while_queued_leaves_no_queue_depth():
+    executor = ResearchExecutor(max_workers=1)
+
+    async def main():
+        running = asyncio.create_task(executor.run(time.sleep, 0.2))
+        await asyncio.sleep(0.02)
+        waiting = asyncio.create_task(executor.run(time.sleep, 0.2))
+        await asyncio.sleep(0.02)
+        assert executor.metrics()["queue_depth"] == 1
+        waiting.cancel()
+        await asyncio.gather(running, waiting, return_exceptions=True)
+
+    try:
+        asyncio.run(main())
+    finally:
+        executor.shutdown()
+    metrics = executor.metrics()
+    assert metrics["queue_depth"] == 0 and metrics["completed"] == 1
+
+
+def test_pool_and_semaphore_survive_shutdown_and_a_new_loop():
+    executor = ResearchExecutor(max_workers=2)
+
+    async def main():
+        return await asyncio.gather(*(executor.run(time.sleep, 0.01) for _ in range(3)))
+
+    # Each asyncio.run is a new loop, as each lifespan may be
+    for _ in range(2):
+        executor.start()
+        assert asyncio.run(main()) == [None] * 3
+        executor.shutdown()
+    assert executor.metrics()["completed"] == 6
+
+
+def test_process_executor_runs_in_worker_processes(monkeypatch):
+    monkeypatch.setenv("RESEARCH_EXECUTOR", "process")
+    monkeypatch.setenv("RESEARCH_MAX_WORKERS", "2")
+    executor = ResearchExecutor.from_env()
+    assert executor.use_processes and executor.metrics()["executor"] == "process"
+
+    async def main():
+        return await asyncio.gather(*(executor.run(os.getpid) for _ in range(4)))
+
+    try:
+        pids = asyncio.run(main())
+    finally:
+        executor.shutdown()
+    assert os.getpid() not in pids and len(set(pids)) <= 2
+    assert executor.metrics()["completed"] == 4
+
+
+def _fake_agent(topic, research_questions, advanced=False, callbacks=None):
+    return {"success": True, "research_output": f"notes on {topic} from {threading.current_thread().name}",
+            "sources_used": []}
+
+
+def test_app_executor_serves_a_second_lifespan(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    main = importlib.import_module("app.main")
+    monkeypatch.setattr(main, "job_manager", JobManager(InMemoryJobStore(), main.research_executor))
+    monkeypatch.setattr(main.get_registry(), "warm_up", lambda: False)
+    monkeypatch.setattr(main, "stop_ingestion_service", lambda: None)
+    monkeypatch.setattr(main, "save_corpus", lambda: False)
+    monkeypatch.setattr(research_service, "run_agent", _fake_agent)
+    monkeypatch.setattr(research_service, "get_answer_cache", lambda: None)
+
+    request = {"topic": "batteries", "research_questions": [], "detailed_report": False}
+    for _ in range(2):
+        with TestClient(main.app) as client:
+            result = client.post("/research", json=request).json()
+            assert result["success"], result
+            assert "research-worker" in result["research_output"]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
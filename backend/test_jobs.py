@@ -0,0 +1,136 @@
+import asyncio
+import importlib
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.testclient import TestClient
+
+from app.executor import ResearchExecutor
+from app.jobs import JobManager, JobStore, SQLiteJobStore
+from app.jobs import manager as job_module
+from app.jobs.store import JOB_COMPLETED, JOB_RUNNING
+
+
+async def _fake_research(executor, topic, research_questions, detailed_report=True,
+                         advanced=False, report_mode="sections", progress=None):
+    progress("researching", 10)
+    await asyncio.sleep(0.05)
+    if topic == "broken":
+        raise RuntimeError("agent crashed")
+    progress("research_complete", 60, f"notes on {topic}")
+    return {"success": True, "research_output": f"notes on {topic}", "report": f"# {topic}", "sources": []}
+
+
+@pytest.fixture
+def api(monkeypatch, tmp_path):
+    """The FastAPI app with a fresh SQLite job store and no agents, corpus or network."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    main = importlib.import_module("app.main")
+    executor = ResearchExecutor(max_workers=2)
+    monkeypatch.setattr(main, "research_executor", executor)
+    monkeypatch.setattr(main, "job_manager", JobManager(SQLiteJobStore(str(tmp_path / "jobs.db")), executor))
+    monkeypatch.setattr(main.get_registry(), "warm_up", lambda: False)
+    monkeypatch.setattr(main, "stop_ingestion_service", lambda: None)
+    monkeypatch.setattr(main, "save_corpus", lambda: False)
+    monkeypatch.setattr(job_module, "conduct_research", _fake_research)
+    return main.app
+
+
+def _wait_for(client, job_id: str, status: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").json()
+        if job["status"] == status:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} never reached {status}: {job}")
+
+
+def test_submit_poll_and_result_across_lifespans(api):
+    request = {"topic": "solid state batteries", "research_questions": ["Who makes them?"]}
+    with TestClient(api) as client:
+        submitted = client.post("/jobs", json=request)
+        assert submitted.status_code == 202
+        job_id = submitted.json()["job_id"]
+        assert client.get(f"/jobs/{job_id}/result").status_code == 409
+
+        job = _wait_for(client, job_id, JOB_COMPLETED)
+        # The last progress write landed before the final status, not after it
+        assert job["progress"] == 100 and job["stage"] == "completed"
+        assert job["partial_output"] == "notes on solid state batteries"
+        result = client.get(f"/jobs/{job_id}/result").json()
+        assert result["success"] and result["report"] == "# solid state batteries"
+
+        failed = client.post("/jobs", json=dict(request, topic="broken")).json()["job_id"]
+        _wait_for(client, failed, "failed")
+        assert client.get(f"/jobs/{failed}/result").json()["error"] == "agent crashed"
+        assert client.get("/jobs/missing").status_code == 404
+
+    # A second lifespan in the same process reopens the store it closed
+    with TestClient(api) as client:
+        assert client.get(f"/jobs/{job_id}/result").json()["research_output"] == "notes on solid state batteries"
+        again = client.post("/jobs", json=request).json()["job_id"]
+        _wait_for(client, again, JOB_COMPLETED)
+
+
+def test_unfinished_jobs_resume_after_restart(monkeypatch, tmp_path):
+    monkeypatch.setattr(job_module, "conduct_research", _fake_research)
+    path = str(tmp_path / "jobs.db")
+    # A previous process accepted one job and crashed while running another
+    crashed = SQLiteJobStore(path)
+    crashed.open()
+    crashed.create("queued-job", {"topic": "anodes", "research_questions": []})
+    crashed.create("running-job", {"topic": "cathodes", "research_questions": []})
+    crashed.update("running-job", status=JOB_RUNNING, stage="researching", progress=10)
+    crashed.close()
+
+    async def restart():
+        manager = JobManager(SQLiteJobStore(path), ResearchExecutor(max_workers=2), workers=2)
+        await manager.start()
+        try:
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                jobs = [await manager.get(job_id) for job_id in ("queued-job", "running-job")]
+                if all(job["status"] == JOB_COMPLETED for job in jobs):
+                    return jobs
+                await asyncio.sleep(0.02)
+            raise AssertionError(jobs)
+        finally:
+            await manager.stop()
+
+    jobs = asyncio.run(restart())
+    assert [job["result"]["report"] for job in jobs] == ["# anodes", "# cathodes"]
+    reopened = SQLiteJobStore(path)
+    reopened.open()
+    assert reopened.list_unfinished() == []
+
+    with pytest.raises(TypeError):
+        JobStore()
+
+
+
+def test_store_touches_no_file_until_the_manager_starts(monkeypatch, tmp_path):
+    path = tmp_path / "data" / "jobs.db"
+    monkeypatch.setenv("JOB_DB_PATH", str(path))
+    manager = JobManager.from_env(ResearchExecutor(max_workers=1))
+    assert not (tmp_path / "data").exists()
+    with pytest.raises(RuntimeError):
+        manager.store.get("any")
+
+    async def lifespan():
+        await manager.start()
+        assert path.exists() and await manager.get("any") is None
+        await manager.stop()
+
+    asyncio.run(lifespan())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
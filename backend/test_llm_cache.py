@@ -0,0 +1,66 @@
+import sys
+import tempfile
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from langchain.chat_models.fake import FakeListChatModel
+from langchain.globals import set_llm_cache
+
+from app.cache import LLMResponseCache, llm_cache_caller
+from app.llm import create_chat_model
+from app.cache.ttl_cache import SQLiteTTLCache, TieredCache, TTLCache
+
+
+def _cache(path: str) -> LLMResponseCache:
+    return LLMResponseCache(TieredCache(TTLCache(maxsize=8), SQLiteTTLCache(path, table="llm_cache")))
+
+
+def test_identical_calls_are_served_from_cache_and_survive_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "llm.db")
+        cache = _cache(path)
+        set_llm_cache(cache)
+        try:
+            # The fake model answers each call with the next response in its list
+            llm = FakeListChatModel(responses=["first", "second", "third"])
+            with llm_cache_caller("agent"):
+                assert llm.predict("Summarize topic X") == "first"
+                assert llm.predict("Summarize topic X") == "first"
+            with llm_cache_caller("report"):
+                assert llm.predict("Summarize topic Y") == "second"
+                # Extra call arguments (e.g. bound tools) are part of the key
+                assert llm.predict("Summarize topic X", stop=["Observation:"]) == "third"
+
+            callers = cache.stats()["callers"]
+            assert callers["agent"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+            assert callers["report"]["hits"] == 0 and callers["report"]["misses"] == 2
+
+            # A new process only has the SQLite tier to go on; a fresh model would say "first"
+            set_llm_cache(_cache(path))
+            restarted = FakeListChatModel(responses=["first", "second", "third"])
+            assert restarted.predict("Summarize topic Y") == "second"
+        finally:
+            set_llm_cache(None)
+
+
+def test_sampled_models_bypass_the_cache(offline_llm):
+    assert create_chat_model(temperature=0).cache is None
+    assert create_chat_model(temperature=0.7).cache is False
+
+    with tempfile.TemporaryDirectory() as tmp:
+        set_llm_cache(_cache(str(Path(tmp) / "llm.db")))
+        try:
+            sampled = FakeListChatModel(responses=["draft one", "draft two"], cache=False)
+            assert sampled.predict("Write a summary") == "draft one"
+            assert sampled.predict("Write a summary") == "draft two"
+        finally:
+            set_llm_cache(None)
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,65 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from langchain.chat_models.fake import FakeListChatModel
+
+from app.agents.research_agent import MultiStepResearchAgent
+
+
+class _SlowAgent:
+    """Stands in for ResearchAgent: each question takes 0.3s of "tool calls"."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def research_topic(self, topic, research_questions, callbacks=None):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.3)
+        with self._lock:
+            self.active -= 1
+        question = research_questions[0]
+        if "fail" in question:
+            return {"success": False, "error": "tools down", "research_output": None}
+        return {"success": True, "research_output": f"Answer to {question}",
+                "sources_used": ["https://example.org/shared", f"https://example.org/{question}"]}
+
+
+def _agent(max_concurrency: int) -> MultiStepResearchAgent:
+    agent = MultiStepResearchAgent.__new__(MultiStepResearchAgent)
+    agent.research_agent = _SlowAgent()
+    agent.max_concurrency = max_concurrency
+    agent.llm = FakeListChatModel(responses=["Synthesized analysis"])
+    return agent
+
+
+def test_questions_run_concurrently_then_synthesize():
+    agent = _agent(max_concurrency=3)
+    questions = ["q1", "q2", "q3", "q4 will fail", "q5", "q6"]
+
+    started = time.perf_counter()
+    result = agent.conduct_research("Topic", questions)
+    elapsed = time.perf_counter() - started
+
+    # Six 0.3s questions, three at a time: two rounds instead of six
+    assert elapsed < 1.2 and agent.research_agent.peak == 3
+    assert result["success"] and result["mode"] == "multi_step"
+    assert result["research_output"] == "Synthesized analysis"
+    assert result["sources_used"][0] == "https://example.org/shared"
+    assert len(result["sources_used"]) == 6  # shared source listed once
+    assert [q["success"] for q in result["questions"]] == [True, True, True, False, True, True]
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,106 @@
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from langchain.schema.messages import AIMessage
+from langchain.tools import Tool
+from langchain.chat_models.fake import FakeMessagesListChatModel
+
+from app.agents.callbacks import ResearchEventHandler
+from app.agents.plan_execute_agent import PlanExecuteAgent
+from app.agents.tools import WebSearchTool
+
+
+def _call(call_id: str, name: str, query: str, arguments: Optional[dict] = None) -> dict:
+    return {"id": call_id, "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments or {"__arg1": query})}}
+
+
+def _slow_tool(name: str) -> Tool:
+    def search(query: str) -> str:
+        time.sleep(0.3)
+        return f"{name} results for {query}"
+    return Tool(name=name, func=search, description=f"{name} tool")
+
+
+def test_one_planned_batch_runs_concurrently():
+    llm = FakeMessagesListChatModel(responses=[
+        AIMessage(content="", additional_kwargs={"tool_calls": [
+            _call("1", "web_search", "ai healthcare adoption"),
+            _call("2", "web_search", "ai diagnosis accuracy"),
+            _call("3", "arxiv_search", "medical imaging deep learning"),
+        ]}),
+        AIMessage(content="Final answer citing all three results"),
+    ])
+    agent = PlanExecuteAgent(llm, [_slow_tool("web_search"), _slow_tool("arxiv_search")])
+
+    started = time.perf_counter()
+    run = agent.run("Research AI in healthcare")
+    elapsed = time.perf_counter() - started
+
+    # Three 0.3s tools in one batch take about as long as one
+    assert elapsed < 0.8
+    assert run == {"output": "Final answer citing all three results",
+                   "rounds": 1, "tool_calls": 3, "llm_calls": 2}
+
+
+def test_single_key_arguments_reach_the_named_field(monkeypatch, fake_ddgs):
+    monkeypatch.setattr("app.cache.search_cache._search_cache", None)
+    ddgs = fake_ddgs(delay=0)
+    llm = FakeMessagesListChatModel(responses=[
+        AIMessage(content="", additional_kwargs={"tool_calls": [
+            _call("1", "web_search", "", {"queries": ["solid state anodes", "solid state cathodes"]}),
+            _call("2", "web_search", "", {"queries": ["solid state separators"]}),
+            _call("3", "web_search", "", {"queries": []}),
+        ]}),
+        AIMessage(content="Done"),
+    ])
+    agent = PlanExecuteAgent(llm, [WebSearchTool()])
+    state = agent.graph.invoke({"messages": [], "rounds": 0, "tool_calls": 0})
+
+    both, one, none = (message.content for message in state["messages"][1:4])
+    assert "solid state cathodes" in both and not both.startswith("Error")
+    assert one.startswith("Web search results for 'solid state separators'")
+    assert "query or a list of queries" in none
+    assert sorted(ddgs.queries) == ["solid state anodes", "solid state cathodes", "solid state separators"]
+
+
+def test_planned_calls_reach_event_handlers():
+    llm = FakeMessagesListChatModel(responses=[
+        AIMessage(content="Search both angles at once.", additional_kwargs={"tool_calls": [
+            _call("1", "web_search", "ai healthcare adoption"),
+            _call("2", "arxiv_search", "medical imaging deep learning"),
+        ]}),
+        AIMessage(content="Final answer"),
+    ])
+    agent = PlanExecuteAgent(llm, [_slow_tool("web_search"), _slow_tool("arxiv_search")])
+    events = []
+    agent.run("Research AI in healthcare", callbacks=[ResearchEventHandler(lambda kind, data: events.append((kind, data)))])
+
+    kinds = [kind for kind, _ in events]
+    assert kinds[:3] == ["thought", "tool_call", "tool_call"]
+    assert events[0][1] == {"text": "Search both angles at once."}
+    assert events[1][1] == {"tool": "web_search", "input": {"__arg1": "ai healthcare adoption"}}
+    assert kinds.count("observation") == 2
+
+
+@pytest.mark.parametrize("strategy", ["react", "plan_execute"])
+def test_research_agent_builds_only_the_selected_agent(offline_llm, strategy):
+    from app.agents.research_agent import ResearchAgent
+
+    agent = ResearchAgent(strategy=strategy)
+    assert agent.strategy == strategy
+    assert (agent.agent_executor is not None) == (strategy == "react")
+    assert (agent.plan_execute_agent is not None) == (strategy == "plan_execute")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,130 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.prompts import CACHE_MIN_PREFIX_TOKENS, StablePrompt, prompt_stats
+
+REQUESTS = [
+    ("AI in healthcare", ["What are the main applications?", "What are the risks?"]),
+    ("Solid state batteries", ["Who manufactures them?"]),
+]
+
+
+pytestmark = pytest.mark.usefixtures("offline_llm", "offline_tokenizer")
+
+
+def _shared_prefix(prompts) -> str:
+    return os.path.commonprefix(list(prompts))
+
+
+def _assert_stable(prompt: StablePrompt, rendered: list):
+    """Different requests agree on the whole static prefix, and only on it."""
+    shared = _shared_prefix(rendered)
+    assert shared.startswith(prompt.prefix)
+    for text in rendered:
+        assert text.startswith(prompt.prefix)
+    # No request data leaks into the prefix
+    for topic, _ in REQUESTS:
+        assert topic not in prompt.prefix
+
+
+def test_research_prompts_share_their_static_prefix():
+    from app.agents.fallback_agent import FALLBACK_PROMPT
+    from app.agents.research_agent import ResearchAgent
+
+    for advanced in (False, True):
+        agent = ResearchAgent(advanced_mode=advanced, strategy="react")
+        create = agent._create_advanced_prompt if advanced else agent._create_standard_prompt
+        rendered = [create(topic, questions) for topic, questions in REQUESTS]
+        _assert_stable(agent.prompt, rendered)
+        assert "web_search" in agent.prompt.prefix and "Solid state batteries" in rendered[1]
+
+    rendered = [FALLBACK_PROMPT.render(topic=t, questions="\n".join(q)) for t, q in REQUESTS]
+    _assert_stable(FALLBACK_PROMPT, rendered)
+
+
+
+def test_corpus_search_is_offered_only_when_the_corpus_can_fill(monkeypatch, tmp_path, no_tool_side_effects):
+    from app.agents.research_agent import ResearchAgent
+    from app.retrieval import hybrid
+
+    monkeypatch.setenv("CORPUS_DIR", str(tmp_path))
+    monkeypatch.setattr(hybrid, "_corpus_retriever", None)
+
+    def offered(advanced=False):
+        agent = ResearchAgent(advanced_mode=advanced, strategy="react")
+        names = [tool.name for tool in agent.tools]
+        assert ("corpus_search" in names) == ("corpus_search" in agent.prompt.prefix)
+        return "corpus_search" in names
+
+    # Nothing collected and nothing saved: the tool could only come back empty
+    assert not offered() and not offered(advanced=True)
+
+    monkeypatch.setenv("CORPUS_CAPTURE", "true")
+    assert offered() and offered(advanced=True)
+
+    monkeypatch.setenv("CORPUS_CAPTURE", "false")
+    (tmp_path / "docstore.jsonl").write_text("", encoding="utf-8")
+    assert offered()
+
+def test_report_prompts_share_their_static_prefix():
+    from app.chains.report_generator import SECTION_PROMPT, ReportGenerator
+
+    generator = ReportGenerator()
+    reports = [
+        generator._section_prompts(topic, {"research_output": f"Findings about {topic}."})
+        for topic, _ in REQUESTS
+    ]
+    _assert_stable(SECTION_PROMPT, [prompt for report in reports for prompt in report.values()])
+    # Within one report only the final task line differs, so the
+    # topic and findings are part of the prefix the section calls share
+    assert "Findings about AI in healthcare." in _shared_prefix(reports[0].values())
+
+    structured = [
+        generator._structured_prompt(topic, {"research_output": f"Findings about {topic}."})
+        for topic, _ in REQUESTS
+    ]
+    _assert_stable(generator.structured_prompt, structured)
+    assert "JSON" in generator.structured_prompt.prefix
+
+
+def test_prefix_length_is_recorded():
+    prompt = StablePrompt("test_prompt", prefix="Static instructions. " * 10, suffix="Topic: {topic}")
+    prompt.render(topic="a")
+    prompt.render(topic="b")
+
+    stats = prompt_stats()["test_prompt"]
+    assert stats["prefix_chars"] == len(prompt.prefix)
+    assert stats["prefix_tokens"] > 0
+    assert stats["renders"] == 2
+    assert 0.9 < stats["prefix_share"] < 1
+    assert not stats["prefix_cacheable"] and stats["cacheable_share"] == 0
+
+
+def test_cacheability_counts_the_shared_request_data():
+    prompt = StablePrompt(
+        "test_shared_prompt",
+        prefix="Static instructions.\n",
+        shared="FINDINGS:\n{findings}\n",
+        suffix="TASK: {task}"
+    )
+    long_findings = "lithium " * CACHE_MIN_PREFIX_TOKENS
+    calls = [prompt.render(findings=long_findings, task=task) for task in ("summary", "conclusions")]
+    prompt.render(findings="too short to cache", task="summary")
+
+    # Calls of one request differ only in the task line
+    assert os.path.commonprefix(calls) == prompt.prefix + f"FINDINGS:\n{long_findings}\nTASK: "
+    stats = prompt_stats()["test_shared_prompt"]
+    assert stats["renders"] == 3 and not stats["prefix_cacheable"]
+    assert stats["cacheable_share"] == round(2 / 3, 3)
+    assert stats["mean_shared_prefix_tokens"] > 2 * CACHE_MIN_PREFIX_TOKENS / 3
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
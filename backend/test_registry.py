@@ -0,0 +1,101 @@
+import asyncio
+import importlib
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.testclient import TestClient
+
+from app.executor import ResearchExecutor
+from app.jobs import InMemoryJobStore, JobManager
+from app.registry import AgentRegistry
+from app.transport import Transport
+
+pytestmark = pytest.mark.usefixtures("offline_llm", "offline_tokenizer")
+
+
+def test_agents_are_built_once_and_shared(monkeypatch):
+    monkeypatch.setenv("AGENT_STRATEGY", "react")
+    registry = AgentRegistry()
+
+    # Concurrent first requests still build a single agent
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        agents = list(pool.map(lambda _: registry.standard_agent(), range(8)))
+    assert all(agent is agents[0] for agent in agents)
+
+    assert registry.warm_up()
+    assert registry.standard_agent() is agents[0]
+    generator = registry.report_generator()
+    assert registry.report_generator() is generator
+    assert registry.multi_step_agent() is registry.multi_step_agent()
+
+    # Every model talks through the same pooled OpenAI client
+    agent_llm = agents[0].agent_executor.agent.llm_chain.llm
+    assert agent_llm.client is generator.llm.client
+
+    registry.reset()
+    assert registry.standard_agent() is not agents[0]
+
+
+def test_warm_up_is_skipped_without_an_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY")
+    registry = AgentRegistry()
+    assert not registry.warm_up()
+    assert registry._standard_agent is None and registry._report_generator is None
+
+
+
+def _async_http(llm):
+    """The httpx client under a chat model's AsyncOpenAI completions."""
+    return llm.async_client._client._client
+
+
+def test_models_are_rebuilt_on_a_live_client_each_lifespan(monkeypatch):
+    main = importlib.import_module("app.main")
+    executor = ResearchExecutor(max_workers=1)
+    monkeypatch.setattr(main, "research_executor", executor)
+    monkeypatch.setattr(main, "job_manager", JobManager(InMemoryJobStore(), executor))
+    monkeypatch.setattr(main, "stop_ingestion_service", lambda: None)
+    monkeypatch.setattr(main, "save_corpus", lambda: False)
+    registry = main.get_registry()
+    registry.reset()
+
+    clients = []
+    for _ in range(2):
+        with TestClient(main.app):
+            client = _async_http(registry.report_generator().llm)
+            assert not client.is_closed
+            clients.append(client)
+        # Closing the transport drops the models built on it
+        assert client.is_closed and registry._report_generator is None
+    assert clients[0] is not clients[1]
+
+
+def test_replaced_async_client_is_closed():
+    transport = Transport()
+    resets = []
+    transport.on_reset(lambda: resets.append(True))
+
+    async def use():
+        return transport.async_client()
+
+    first = asyncio.run(use())
+
+    async def next_loop():
+        second = transport.async_client()
+        await transport.aclose()
+        return second
+
+    second = asyncio.run(next_loop())
+    assert first.is_closed and second.is_closed and first is not second
+    # Once for the replaced client, once for aclose
+    assert resets == [True, True]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
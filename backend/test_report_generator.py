@@ -0,0 +1,103 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.chains.report_generator import SECTION_TASKS, ReportGenerator
+
+RESEARCH = {"research_output": "Solid state batteries use a solid electrolyte.", "sources_used": ["web_search"]}
+
+pytestmark = pytest.mark.usefixtures("offline_llm", "offline_tokenizer")
+
+
+class _FakeLLM:
+    """Answers section prompts after a per-task delay and the structured prompt with ``structured_reply``.
+
+    Tracks how many calls overlap.
+    """
+
+    def __init__(self, delays=None, structured_reply="{}"):
+        self.delays = delays or {}
+        self.structured_reply = structured_reply
+        self.prompts = []
+        self.active = self.peak = 0
+
+    def _task(self, prompt: str) -> str:
+        return next((name for name, task in SECTION_TASKS.items() if prompt.endswith(task)), "structured")
+
+    async def apredict(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        name = self._task(prompt)
+        await asyncio.sleep(self.delays.get(name, 0.01))
+        self.active -= 1
+        return self.structured_reply if name == "structured" else f"{name} text"
+
+    def predict(self, prompt, **kwargs):
+        return asyncio.run(self.apredict(prompt, **kwargs))
+
+
+def test_sections_run_concurrently_under_the_bound_and_keep_report_order():
+    generator = ReportGenerator(max_concurrency=2)
+    # The first sections are the slowest, so they finish last
+    generator.llm = _FakeLLM({name: 0.05 * (5 - i) for i, name in enumerate(SECTION_TASKS)})
+    emitted = []
+
+    sections = asyncio.run(generator.agenerate_sections(
+        "batteries", RESEARCH, on_section=lambda name, text: emitted.append(name)
+    ))
+
+    assert generator.llm.peak == 2
+    assert list(sections) == list(SECTION_TASKS)
+    assert sections["conclusions"] == "conclusions text"
+    # on_section fires as each call completes, not in report order
+    assert sorted(emitted) == sorted(SECTION_TASKS) and emitted != list(SECTION_TASKS)
+
+    report = generator.assemble("batteries", RESEARCH, sections)
+    assert report.index("executive_summary text") < report.index("recommendations text")
+
+
+def test_structured_mode_uses_one_call_when_the_reply_parses():
+    generator = ReportGenerator()
+    reply = {name: f"{name} from json" for name in SECTION_TASKS}
+    generator.llm = _FakeLLM(structured_reply=json.dumps(reply))
+    emitted = []
+
+    sections = asyncio.run(generator.agenerate_sections(
+        "batteries", RESEARCH, on_section=lambda name, text: emitted.append(name), mode="structured"
+    ))
+
+    assert len(generator.llm.prompts) == 1
+    assert sections == reply and emitted == list(SECTION_TASKS)
+
+
+@pytest.mark.parametrize("reply", ["not json at all", json.dumps({"executive_summary": "only one"})])
+def test_structured_mode_falls_back_to_section_calls(reply):
+    generator = ReportGenerator()
+    generator.llm = _FakeLLM(structured_reply=reply)
+    emitted = []
+
+    sections = asyncio.run(generator.agenerate_sections(
+        "batteries", RESEARCH, on_section=lambda name, text: emitted.append(name), mode="structured"
+    ))
+
+    # The failed structured call, then one call per section
+    assert len(generator.llm.prompts) == 1 + len(SECTION_TASKS)
+    assert sections == {name: f"{name} text" for name in SECTION_TASKS}
+    # Nothing from the unparsed reply reached the sink
+    assert sorted(emitted) == sorted(SECTION_TASKS)
+
+    generator.llm = _FakeLLM(structured_reply=reply)
+    report = generator.generate_report("batteries", RESEARCH, [], mode="structured")
+    assert "only one" not in report and "recommendations text" in report
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
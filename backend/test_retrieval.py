@@ -0,0 +1,192 @@
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.retrieval.embeddings import HashingEmbeddings
+from app.retrieval.hnsw import HNSWIndex
+from app.retrieval.hybrid import HybridRetriever, reciprocal_rank_fusion
+from app.retrieval.pq import PQIndex
+from app.retrieval.vector_store import FlatIndex, VectorStore
+
+DOCUMENTS = [
+    ("Transformers use self-attention to model long range dependencies in text", "nlp"),
+    ("Convolutional neural networks classify medical images such as X-rays", "vision"),
+    ("Reinforcement learning agents learn robot control policies from reward", "rl"),
+    ("Quantum computers use qubits and entanglement for faster algorithms", "quantum"),
+    ("Solar panels and wind turbines drive the growth of renewable energy", "energy"),
+]
+
+
+def build_store() -> VectorStore:
+    store = VectorStore(HashingEmbeddings(dim=128))
+    store.add_texts(
+        [text for text, _ in DOCUMENTS],
+        metadatas=[{"title": label} for _, label in DOCUMENTS],
+        ids=[label for _, label in DOCUMENTS]
+    )
+    return store
+
+
+def test_hashing_embeddings_are_deterministic():
+    embeddings = HashingEmbeddings(dim=64)
+    first = embeddings.embed_array(["attention is all you need"])
+    second = HashingEmbeddings(dim=64).embed_array(["attention is all you need"])
+    assert first.dtype == np.float32
+    assert np.allclose(first, second)
+    assert np.isclose(np.linalg.norm(first), 1.0)
+
+
+def test_similarity_search_finds_matching_document():
+    store = build_store()
+    hits = store.similarity_search("qubits and quantum entanglement", k=2)
+    assert hits[0]["id"] == "quantum"
+    assert hits[0]["metadata"]["title"] == "quantum"
+    assert hits[0]["score"] >= hits[1]["score"]
+
+
+def test_batched_search_returns_one_row_per_query():
+    index = FlatIndex(dim=8)
+    vectors = np.eye(8, dtype=np.float32)
+    index.add([f"v{i}" for i in range(8)], vectors)
+    hits = index.search(vectors[[2, 5]], k=3)
+    assert [row[0][0] for row in hits] == ["v2", "v5"]
+    assert all(len(row) == 3 for row in hits)
+
+
+def test_save_and_load_memory_maps_vectors():
+    store = build_store()
+    with tempfile.TemporaryDirectory() as tmp:
+        store.save(tmp)
+        loaded = VectorStore.load(tmp, HashingEmbeddings(dim=128))
+        assert isinstance(loaded.index.vectors, np.memmap)
+        assert loaded.similarity_search("robot control reward", k=1)[0]["id"] == "rl"
+
+        # Adding after load copies the read-only map into memory
+        loaded.add_texts(["Photosynthesis converts sunlight into chemical energy"], ids=["bio"])
+        assert len(loaded.index) == len(DOCUMENTS) + 1
+        assert loaded.similarity_search("photosynthesis sunlight", k=1)[0]["id"] == "bio"
+
+
+class _SlowFlatIndex(FlatIndex):
+    """Keeps each insert open for a while after the vectors land."""
+
+    def add(self, ids, vectors):
+        super().add(ids, vectors)
+        time.sleep(0.05)
+
+
+def test_searches_during_inserts_only_see_stored_chunks():
+    store = VectorStore(HashingEmbeddings(dim=128), index_factory=_SlowFlatIndex)
+    store.add_texts(["seed document about energy"], ids=["seed"])
+    query = store.embeddings.embed_query("energy storage")
+    errors = []
+
+    def search():
+        for _ in range(20):
+            try:
+                for hit in store.search_by_vectors(np.array([query]), k=10)[0]:
+                    assert hit["text"]
+            except Exception as e:
+                errors.append(e)
+
+    readers = [threading.Thread(target=search) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for n in range(5):
+        store.add_texts([f"energy storage note {n}"], ids=[f"note-{n}"])
+    for reader in readers:
+        reader.join()
+
+    assert errors == [] and len(store) == 6
+
+
+def test_hnsw_recall_matches_exact_search():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((600, 16)).astype(np.float32)
+    ids = [str(i) for i in range(len(vectors))]
+    exact, approx = FlatIndex(16), HNSWIndex(16, M=8, ef_construction=64, ef_search=32)
+    exact.add(ids, vectors)
+    # Incremental inserts in several batches
+    for start in range(0, len(vectors), 200):
+        approx.add(ids[start:start + 200], vectors[start:start + 200])
+
+    queries = rng.standard_normal((20, 16)).astype(np.float32)
+    truth, found = exact.search(queries, k=5), approx.search(queries, k=5)
+    hits = sum(len({i for i, _ in f} & {i for i, _ in t}) for f, t in zip(found, truth))
+    assert hits / (5 * len(queries)) >= 0.9
+
+
+def test_hnsw_store_round_trips_and_accepts_inserts():
+    store = VectorStore(HashingEmbeddings(dim=128), index_factory=HNSWIndex)
+    store.add_texts([text for text, _ in DOCUMENTS], ids=[label for _, label in DOCUMENTS])
+    with tempfile.TemporaryDirectory() as tmp:
+        store.save(tmp)
+        loaded = VectorStore.load(tmp, HashingEmbeddings(dim=128))
+        assert isinstance(loaded.index, HNSWIndex)
+        assert loaded.similarity_search("qubits and quantum entanglement", k=1)[0]["id"] == "quantum"
+
+        loaded.add_texts(["Photosynthesis converts sunlight into chemical energy"], ids=["bio"])
+        assert loaded.similarity_search("photosynthesis sunlight", k=1)[0]["id"] == "bio"
+
+
+def test_pq_index_compresses_and_reranks_against_full_vectors():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((600, 32)).astype(np.float32)
+    ids = [str(i) for i in range(len(vectors))]
+    exact, pq = FlatIndex(32), PQIndex(32, m=4, rerank=60, train_size=400)
+    exact.add(ids, vectors)
+    pq.add(ids[:300], vectors[:300])
+    assert not pq.quantizer.trained  # exact search until enough vectors arrive
+    pq.add(ids[300:], vectors[300:])
+    assert pq.codes.dtype == np.uint8 and pq.codes.shape == (600, 4)
+    assert pq.compression == 32
+
+    queries = vectors[:10] + 0.1 * rng.standard_normal((10, 32)).astype(np.float32)
+    truth, found = exact.search(queries, k=5), pq.search(queries, k=5)
+    hits = sum(len({i for i, _ in f} & {i for i, _ in t}) for f, t in zip(found, truth))
+    assert hits / 50 >= 0.9
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pq.save(tmp)
+        loaded = PQIndex.load(tmp)
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.search(queries, k=5) == found
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]], k=60)
+    assert [chunk_id for chunk_id, _ in fused][:2] == ["b", "a"]
+    assert {chunk_id for chunk_id, _ in fused} == {"a", "b", "c", "d"}
+
+
+def test_hybrid_retriever_fuses_sparse_and_dense_and_reloads():
+    retriever = HybridRetriever(VectorStore(HashingEmbeddings(dim=128)))
+    texts = [text for text, _ in DOCUMENTS]
+    ids = [label for _, label in DOCUMENTS]
+    assert retriever.add_texts(texts, ids=ids) == ids
+    # Re-adding the same ids is a no-op in both indexes
+    assert retriever.add_texts(texts[:2], ids=ids[:2]) == []
+    assert len(retriever.sparse) == len(DOCUMENTS)
+
+    for mode in ("sparse", "dense", "hybrid"):
+        assert retriever.search("qubits entanglement", k=2, mode=mode)[0]["id"] == "quantum"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        retriever.save(tmp)
+        loaded = HybridRetriever.load(tmp, HashingEmbeddings(dim=128))
+        assert len(loaded.sparse) == len(DOCUMENTS)
+        assert loaded.search("solar wind turbines", k=1, mode="sparse")[0]["id"] == "energy"
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,83 @@
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.agents.tools import WebSearchTool
+from app.cache import search_cache
+from app.cache.search_cache import normalize_query
+from app.cache.ttl_cache import SQLiteTTLCache, TieredCache, TTLCache
+
+
+def test_memory_cache_evicts_least_recently_used_and_expires():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+
+    cache.set("short", "lived", ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("short", "gone") == "gone"
+    stats = cache.stats()
+    assert stats["evictions"] == 2 and stats["expirations"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 2
+
+
+def test_sqlite_tier_bounds_rows_and_survives_reopen(tmp_path):
+    path = str(tmp_path / "search.db")
+    disk = SQLiteTTLCache(path, maxsize=2, ttl=60, table="search_cache")
+    disk.set("a", ["first"])
+    time.sleep(0.01)
+    disk.set("b", ["second"])
+    time.sleep(0.01)
+    assert disk.get("a") == ["first"]  # touches "a"
+    time.sleep(0.01)
+    disk.set("c", ["third"])
+    disk.set("stale", ["old"], ttl=-1)
+    assert disk.get("b") is None and disk.get("stale") is None
+    disk.close()
+
+    reopened = SQLiteTTLCache(path, maxsize=2, ttl=60, table="search_cache")
+    tiered = TieredCache(TTLCache(maxsize=8, ttl=60), reopened)
+    assert tiered.get("c") == ["third"]
+    # The disk hit was promoted, so the next lookup never reaches SQLite
+    assert tiered.get("c") == ["third"] and reopened.hits == 1
+    assert tiered.stats()["hits"] == 2
+
+
+def test_promoted_entry_keeps_its_disk_deadline(tmp_path):
+    disk = SQLiteTTLCache(str(tmp_path / "search.db"), ttl=60)
+    disk.set("key", ["value"], ttl=0.3)
+    time.sleep(0.2)
+
+    tiered = TieredCache(TTLCache(maxsize=8, ttl=60), disk)
+    assert tiered.get("key") == ["value"]  # promoted with about 0.1s left
+    assert tiered.memory.get("key") == ["value"]
+    time.sleep(0.2)
+    # Past the original deadline the memory copy is gone too
+    assert tiered.memory.get("key") is None and tiered.get("key") is None
+
+
+def test_web_search_reuses_cached_results_for_equivalent_queries(monkeypatch, fake_ddgs):
+    monkeypatch.delenv("SEARCH_CACHE_DB", raising=False)
+    monkeypatch.setattr(search_cache, "_search_cache", None)
+    ddgs = fake_ddgs(delay=0)
+    run = uuid.uuid4().hex[:8]
+
+    first = WebSearchTool().run(f"AI in Healthcare {run}")
+    second = WebSearchTool().run(f"healthcare  ai {run}?")
+    assert normalize_query(f"AI in Healthcare {run}") == normalize_query(f"healthcare  ai {run}?")
+    assert ddgs.calls == 1
+    assert f"https://example.org/AI in Healthcare {run}" in first and first.split("\n", 1)[1] == second.split("\n", 1)[1]
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,93 @@
+import asyncio
+import json
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app.agents.tools import WebSearchTool, search_queries
+from app.ingestion.dedup import canonical_url
+
+
+def _page(slug: str, words: str) -> dict:
+    return {"title": slug.title(), "href": f"https://example.org/{slug}", "body": words}
+
+
+def _results(query: str) -> list:
+    """Canned results per query; every query also finds the overview page under another URL form."""
+    if "broken" in query:
+        raise RuntimeError("rate limited")
+    slug = query.split()[-1]
+    return [
+        _page(slug, f"{slug} findings on battery chemistry cycle life and cost curves {slug}"),
+        {"title": "Overview", "href": "https://www.example.org/overview/?utm_source=ddg",
+         "body": "Overview of solid state batteries, their history and the open problems"},
+    ]
+
+
+def _parse(output: str) -> list:
+    return json.loads(output[output.index("["):])
+
+
+def test_canonical_url_and_query_variants():
+    assert canonical_url("https://www.Example.org/a/?utm_source=x&b=2&a=1#top") == \
+        canonical_url("http://example.org/a?a=1&b=2")
+    assert canonical_url("https://example.org/a?page=2") != canonical_url("https://example.org/a?page=3")
+
+    variants = search_queries("Solid state batteries", ["Who makes them?", "who makes them?", "Cost?"], limit=3)
+    assert variants == ["Solid state batteries", "Solid state batteries Who makes them?",
+                        "Solid state batteries Cost?"]
+
+
+def test_one_call_searches_all_variants_concurrently_and_merges(fake_ddgs):
+    ddgs = fake_ddgs(results=_results)
+    run = uuid.uuid4().hex[:8]
+    queries = [f"fanout {run} anodes", f"fanout {run} cathodes", f"fanout {run} broken"]
+
+    started = time.perf_counter()
+    output = WebSearchTool().run({"query": f"fanout {run} electrolytes", "queries": queries})
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.6  # four searches overlap instead of taking 0.8s
+    assert len(ddgs.queries) == 4
+    results = _parse(output)
+    # The page every query found ranks first and appears once
+    assert results[0]["title"] == "Overview"
+    assert [r["title"] for r in results].count("Overview") == 1
+    assert {"Electrolytes", "Anodes", "Cathodes"} <= {r["title"] for r in results}
+    assert "Failed queries:" in output and "rate limited" in output
+
+    # Results are size-bounded
+    assert len(_parse(WebSearchTool(max_merged_results=2).run(
+        {"query": f"fanout {run} electrolytes", "queries": queries}
+    ))) == 2
+
+    # A single query keeps the plain output
+    assert WebSearchTool().run(f"fanout {run} anodes").startswith(f"Web search results for 'fanout {run} anodes'")
+
+
+def test_async_fan_out_and_total_failure(fake_ddgs):
+    fake_ddgs(results=_results, asynchronous=True)
+    run = uuid.uuid4().hex[:8]
+
+    started = time.perf_counter()
+    output = asyncio.run(WebSearchTool().arun(
+        {"query": f"async fanout {run} anodes", "queries": [f"async fanout {run} cathodes"]}
+    ))
+    assert time.perf_counter() - started < 0.4
+    assert {"Overview", "Anodes", "Cathodes"} == {r["title"] for r in _parse(output)}
+
+    output = asyncio.run(WebSearchTool().arun(
+        {"query": f"async {run} broken", "queries": [f"async {run} also broken"]}
+    ))
+    assert output.startswith("Error performing web search: rate limited")
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,68 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from app import research_service
+from app.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_threads_share_one_call_and_its_error():
+    flights = SingleFlight()
+    runs = []
+
+    def search():
+        runs.append(threading.get_ident())
+        time.sleep(0.2)
+        return ["result"]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flights.do("web:ai healthcare", search), range(8)))
+    assert len(runs) == 1 and results == [["result"]] * 8
+    assert flights.stats() == {"calls": 8, "shared": 7, "in_flight": 0}
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("rate limited")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(flights.do, "arxiv:x", failing) for _ in range(2)]
+    assert all(isinstance(f.exception(), RuntimeError) for f in futures)
+
+
+def test_identical_requests_share_one_research_run(monkeypatch):
+    runs = []
+
+    async def fake_research(executor, topic, questions, detailed_report, advanced=False, report_mode="sections"):
+        runs.append(topic)
+        await asyncio.sleep(0.1)
+        return {"success": True, "research_output": f"About {topic}"}
+
+    monkeypatch.setattr(research_service, "conduct_research", fake_research)
+    monkeypatch.setattr(research_service, "research_flights", AsyncSingleFlight())
+
+    async def main():
+        waiter = asyncio.ensure_future(research_service.conduct_research_shared(None, "AI", ["Why?"]))
+        await asyncio.sleep(0)
+        waiter.cancel()  # a client that disconnects does not cancel the shared run
+        return await asyncio.gather(
+            research_service.conduct_research_shared(None, "AI", ["Why?"]),
+            research_service.conduct_research_shared(None, "  ai ", ["why?"]),
+            research_service.conduct_research_shared(None, "AI", ["Why?"], advanced=True),
+        )
+
+    results = asyncio.run(main())
+    assert runs == ["AI", "AI"]  # one standard run, one advanced run
+    assert results[0] is results[1]
+
+
+if __name__ == "__main__":
+    import pytest
+
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,95 @@
+import importlib
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add backend to Python path
+backend_dir = Path(__file__).parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi.testclient import TestClient
+from langchain.schema import AgentAction, AgentFinish
+
+from app import research_service
+from app.executor import ResearchExecutor
+
+
+def _fake_agent(topic, research_questions, advanced=False, callbacks=None):
+    # Runs on a pool thread, like the real agent
+    handler = callbacks[0]
+    handler.on_llm_new_token("Thinking")
+    handler.on_agent_action(AgentAction("web_search", topic, "I should search the web\nAction: web_search"))
+    handler.on_tool_end("three results", name="web_search")
+    handler.on_agent_finish(AgentFinish({"output": "final answer"}, ""))
+    return {"success": True, "research_output": "final answer", "sources_used": ["web_search"]}
+
+
+class _FakeReportGenerator:
+    async def agenerate_sections(self, topic, research_result, on_section=None, mode="sections"):
+        sections = {"summary": f"About {topic}", "conclusion": "Done"}
+        for name, text in sections.items():
+            on_section(name, text)
+        return sections
+
+    def assemble(self, topic, research_result, sections):
+        return "\n".join(sections.values())
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    main = importlib.import_module("app.main")
+    monkeypatch.setattr(main, "research_executor", ResearchExecutor(max_workers=2))
+    monkeypatch.setattr(research_service, "run_agent", _fake_agent)
+    monkeypatch.setattr(research_service, "get_answer_cache", lambda: None)
+    monkeypatch.setattr(research_service, "get_registry",
+                        lambda: SimpleNamespace(report_generator=_FakeReportGenerator))
+    return TestClient(main.app)
+
+
+def _events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_emits_steps_then_sections_then_result(client):
+    response = client.post("/research/stream", json={"topic": "batteries", "research_questions": ["Cost?"]})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+
+    assert [event for event, _ in events] == [
+        "stage", "stage", "token", "thought", "tool_call", "observation", "agent_finish",
+        "stage", "stage", "section", "section", "result"
+    ]
+    assert [data["stage"] for event, data in events if event == "stage"] == [
+        "queued", "researching", "research_complete", "generating_report"
+    ]
+    data = dict(events[2:7])
+    assert data["thought"] == {"text": "I should search the web"}
+    assert data["tool_call"] == {"tool": "web_search", "input": "batteries"}
+    assert data["observation"] == {"tool": "web_search", "output": "three results"}
+    assert events[9][1] == {"name": "summary", "text": "About batteries"}
+
+    result = events[-1][1]
+    assert result["success"] and result["report"] == "About batteries\nDone"
+    assert result["sources"] == ["web_search"]
+
+
+def test_stream_reports_a_failed_run_in_the_result_event(client, monkeypatch):
+    def crash(*args, **kwargs):
+        raise RuntimeError("agent crashed")
+
+    monkeypatch.setattr(research_service, "run_agent", crash)
+    events = _events(client.post("/research/stream", json={"topic": "x", "research_questions": []}).text)
+    assert [event for event, _ in events] == ["stage", "stage", "result"]
+    assert events[-1][1]["success"] is False and events[-1][1]["error"] == "agent crashed"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
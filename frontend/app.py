@@ -1,8 +1,7 @@
 import streamlit as st
 import requests
 import json
-from typing import List
-import time
+from typing import Iterator, List, Tuple
 
 # Page configuration
 st.set_page_config(
@@ -64,6 +63,34 @@ class ResearchAssistantFrontend:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    def stream_research(
+        self,
+        topic: str,
+        questions: List[str],
+        advanced: bool = False,
+        report_mode: str = "sections"
+    ) -> Iterator[Tuple[str, dict]]:
+        """Yield (event, data) pairs from the backend's Server-Sent Events stream."""
+        payload = {
+            "topic": topic,
+            "research_questions": questions,
+            "detailed_report": True,
+            "advanced": advanced,
+            "report_mode": report_mode
+        }
+        
+        try:
+            with requests.post(f"{self.api_url}/research/stream", json=payload, stream=True) as response:
+                event = "message"
+                for line in response.iter_lines(decode_unicode=True):
+                    if line.startswith("event:"):
+                        event = line[len("event:"):].strip()
+                    elif line.startswith("data:"):
+                        yield event, json.loads(line[len("data:"):].strip())
+                        event = "message"
+        except Exception as e:
+            yield "result", {"success": False, "error": str(e)}
+
 def main():
     st.markdown('<div class="main-header">🔍 Agentic Research Assistant</div>', unsafe_allow_html=True)
     
@@ -80,6 +107,12 @@ def main():
             help="Advanced mode uses multi-step research with deeper analysis"
         )
         
+        report_style = st.radio(
+            "Report Style",
+            ["Per-section", "Single call"],
+            help="Single call writes the whole report in one LLM request: faster and cheaper"
+        )
+        
         st.markdown("---")
         st.markdown("### Example Research Topics")
         st.info("""
@@ -140,18 +173,42 @@ def main():
             st.error("Please add at least one research question.")
             return
         
-        with st.spinner("🤖 Research in progress... This may take a few minutes."):
+        result = {"success": False, "error": "No result received from backend"}
+        with st.status("🤖 Research in progress... This may take a few minutes.", expanded=True) as status:
             progress_bar = st.progress(0)
+            live_output = st.empty()
+            tokens = ""
             
-            for i in range(100):
-                progress_bar.progress(i + 1)
-                time.sleep(0.02)  # Simulate progress
-            
-            # Conduct research
-            result = frontend.conduct_research(
+            for event, data in frontend.stream_research(
                 topic, 
                 valid_questions, 
-                advanced=(research_mode == "Advanced")
+                advanced=(research_mode == "Advanced"),
+                report_mode="structured" if report_style == "Single call" else "sections"
+            ):
+                if event == "stage":
+                    progress_bar.progress(data["progress"])
+                    status.update(label=f"🤖 {data['stage'].replace('_', ' ').capitalize()}...")
+                elif event == "token":
+                    tokens += data["text"]
+                    live_output.markdown(tokens[-1500:])
+                elif event == "thought":
+                    tokens = ""
+                    st.markdown(f"💭 {data['text']}")
+                elif event == "tool_call":
+                    st.markdown(f"🔧 **{data['tool']}** `{json.dumps(data['input'])}`")
+                elif event == "observation":
+                    st.caption(data.get("output", data.get("error", ""))[:500])
+                elif event == "section":
+                    st.markdown(f"📝 Finished section: **{data['name'].replace('_', ' ').title()}**")
+                elif event == "result":
+                    result = data
+            
+            live_output.empty()
+            progress_bar.progress(100)
+            status.update(
+                label="Research finished" if result.get("success") else "Research failed",
+                state="complete" if result.get("success") else "error",
+                expanded=False
             )
         
         # Display results